@@ -0,0 +1,100 @@
+"""Micro-benchmark: linear search over raw OWM blocks vs. ForecastSeries.
+
+Run from the repository root:
+
+    python benchmarks/bench_forecast_index.py
+"""
+from __future__ import annotations
+
+import os
+import random
+import sys
+import time
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from custom_components.fahrradwetter.forecast import BLOCK_SECONDS, ForecastSeries  # noqa: E402
+
+
+def linear_next_block(forecast_list, now_ts):
+    # Previous sensor.find_next_block: filter + sort on every call
+    blocks = [b for b in forecast_list if isinstance(b, dict) and "dt" in b]
+    blocks.sort(key=lambda x: x.get("dt", 0))
+    for b in blocks:
+        if float(b["dt"]) > now_ts:
+            return b
+    return None
+
+
+def linear_closest_block(forecast_list, target_ts):
+    # Previous sensor.find_closest_block: full scan on every call
+    best = None
+    best_dist = None
+    for b in forecast_list:
+        dist = abs(float(b["dt"]) - target_ts)
+        if best is None or dist < best_dist:
+            best = b
+            best_dist = dist
+    return best
+
+
+def make_forecast(n_blocks: int, start: int) -> list[dict]:
+    return [
+        {
+            "dt": start + i * BLOCK_SECONDS,
+            "main": {"temp": 10.0 + random.random()},
+            "wind": {"speed": random.random() * 8},
+            "clouds": {"all": 0},
+            "sys": {"pod": "d"},
+            "weather": [{"id": 800, "main": "Clear", "description": "Klarer Himmel", "icon": "01d"}],
+        }
+        for i in range(n_blocks)
+    ]
+
+
+def allocated_bytes(build) -> int:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    obj = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del obj
+    return after - before
+
+
+def main() -> None:
+    start = int(time.time())
+    print(
+        f"{'blocks':>7} {'lin_next_us':>12} {'idx_next_us':>12} {'lin_close_us':>13} "
+        f"{'idx_close_us':>13} {'build_us':>9} {'raw_kib':>8} {'series_kib':>10}"
+    )
+    for n_blocks in (40, 80, 160, 320, 640, 1280):
+        fl = make_forecast(n_blocks, start)
+        idx = ForecastSeries.from_owm(fl)
+        now_ts = start + BLOCK_SECONDS * n_blocks / 2 + 1
+        target = start + BLOCK_SECONDS * n_blocks * 0.75 + 1800
+        assert linear_next_block(fl, now_ts)["dt"] == idx.next_block(now_ts).dt
+        assert linear_closest_block(fl, target)["dt"] == idx.closest_block(target).dt
+
+        number = 2000
+        res = {
+            "lin_next": timeit.timeit(lambda: linear_next_block(fl, now_ts), number=number),
+            "idx_next": timeit.timeit(lambda: idx.next_block(now_ts), number=number),
+            "lin_close": timeit.timeit(lambda: linear_closest_block(fl, target), number=number),
+            "idx_close": timeit.timeit(lambda: idx.closest_block(target), number=number),
+            "build": timeit.timeit(lambda: ForecastSeries.from_owm(fl), number=200) / 200 * number,
+        }
+        us = {k: v / number * 1e6 for k, v in res.items()}
+        raw_kib = allocated_bytes(lambda: make_forecast(n_blocks, start)) / 1024
+        series_kib = allocated_bytes(lambda: ForecastSeries.from_owm(fl)) / 1024
+        print(
+            f"{n_blocks:>7} {us['lin_next']:>12.2f} {us['idx_next']:>12.2f} "
+            f"{us['lin_close']:>13.2f} {us['idx_close']:>13.2f} {us['build']:>9.2f} "
+            f"{raw_kib:>8.1f} {series_kib:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Benchmark: import cost of the integration on top of a loaded HA core.
+
+Runs a fresh interpreter with ``python -X importtime`` per sample. The HA
+modules every integration needs anyway (core, config entries, entity
+platform, update coordinator, aiohttp client) are imported first, so only
+what the integration adds is counted. Reports the median cumulative time per
+import group and the slowest modules, as one JSON object per line (or
+appended to --output) so the numbers can be tracked across releases.
+
+    python benchmarks/bench_import_time.py
+    python benchmarks/bench_import_time.py --runs 15 --output import_times.jsonl
+"""
+from __future__ import annotations
+
+import argparse
+import compileall
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+PACKAGE = "custom_components.fahrradwetter"
+
+PRELOAD = (
+    "homeassistant.core",
+    "homeassistant.config_entries",
+    "homeassistant.helpers.entity_platform",
+    "homeassistant.helpers.aiohttp_client",
+    "homeassistant.helpers.update_coordinator",
+)
+
+# What HA imports on startup (runtime) vs. only on demand
+GROUPS = {
+    "runtime": (PACKAGE, f"{PACKAGE}.sensor", f"{PACKAGE}.binary_sensor"),
+    "config_flow": (f"{PACKAGE}.config_flow",),
+    "diagnostics": (f"{PACKAGE}.diagnostics",),
+}
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def sample(group: str) -> tuple[int, dict[str, int]]:
+    """Cumulative µs of the group's imports and self µs per module."""
+    code = "; ".join(f"import {m}" for m in PRELOAD) + "; import sys; sys.stderr.write('--\\n'); "
+    code += "; ".join(f"import {m}" for m in GROUPS[group])
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    _preload, _sep, measured = proc.stderr.partition("--\n")
+    total = 0
+    modules: dict[str, int] = {}
+    for line in measured.splitlines():
+        m = _LINE.match(line)
+        if m is None:
+            continue
+        self_us, cumulative_us, indent, name = int(m[1]), int(m[2]), m[3], m[4]
+        modules[name] = self_us
+        if len(indent) == 1:  # top level of this group's import statements
+            total += cumulative_us
+    return total, modules
+
+
+def run(group: str, runs: int, top: int) -> dict:
+    totals: list[int] = []
+    per_module: dict[str, list[int]] = {}
+    for _ in range(runs):
+        total, modules = sample(group)
+        totals.append(total)
+        for name, self_us in modules.items():
+            per_module.setdefault(name, []).append(self_us)
+    slowest = sorted(
+        ((name, statistics.median(v)) for name, v in per_module.items()),
+        key=lambda item: item[1], reverse=True,
+    )[:top]
+    return {
+        "group": group,
+        "runs": runs,
+        "median_ms": round(statistics.median(totals) / 1000, 2),
+        "min_ms": round(min(totals) / 1000, 2),
+        "modules": len(per_module),
+        "slowest_ms": {name: round(us / 1000, 2) for name, us in slowest},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--top", type=int, default=5)
+    parser.add_argument("--groups", nargs="+", choices=list(GROUPS), default=list(GROUPS))
+    parser.add_argument("--output", help="append JSON lines to this file instead of stdout")
+    args = parser.parse_args()
+
+    # Measure warm imports (as after the first HA start), not source compiles
+    compileall.compile_dir(os.path.join(ROOT, "custom_components"), quiet=1)
+    for group in args.groups:
+        result = run(group, args.runs, args.top)
+        if args.output:
+            with open(args.output, "a", encoding="utf-8") as out:
+                out.write(json.dumps(result) + "\n")
+        else:
+            print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
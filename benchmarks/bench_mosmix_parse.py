@@ -0,0 +1,172 @@
+"""Benchmark: DWD MOSMIX parsing and nearest-station lookup.
+
+Parses a MOSMIX_S all-stations KMZ the way the provider does (streaming,
+keeping only the wanted stations) and reports time and peak Python memory
+for the first parse (no station index yet: collect every station, keep
+the nearest per target) and for later parses (known station ids). With
+--full-tree, a plain ElementTree parse of the whole document is measured
+for comparison. Also times the station index against a linear scan.
+
+Without --fixture, a synthetic document shaped like MOSMIX_S (stations,
+240 hourly steps, 40 elements) is written to benchmarks/fixtures once.
+A real file can be used instead:
+
+    curl -O https://opendata.dwd.de/weather/local_forecasts/mos/MOSMIX_S/all_stations/kml/MOSMIX_S_LATEST_240.kmz
+    python benchmarks/bench_mosmix_parse.py --fixture MOSMIX_S_LATEST_240.kmz
+    python benchmarks/bench_mosmix_parse.py --stations 1000 --full-tree
+"""
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, timedelta, timezone
+import os
+import random
+import sys
+import time
+import timeit
+import tracemalloc
+import xml.etree.ElementTree as ET
+import zipfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from custom_components.fahrradwetter.providers.dwd_mosmix import (  # noqa: E402
+    StationIndex,
+    distance_km,
+    open_kmz,
+    parse_kmz,
+)
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+KML_NS = "http://www.opengis.net/kml/2.2"
+DWD_NS = "https://opendata.dwd.de/weather/lib/pointforecast_dwd_extension_V1_0.xsd"
+# MOSMIX_S elements; the provider reads TTT, FF, RR1c and ww
+ELEMENTS = (
+    "TTT", "Td", "T5cm", "TX", "TN", "PPPP", "DD", "FF", "FX1", "FX3", "FX625", "FX640",
+    "FX655", "RR1c", "RR3c", "RR6c", "RRS1c", "RRS3c", "R101", "R102", "R103", "R105",
+    "R107", "R110", "R120", "R130", "R150", "ww", "ww3", "W1W2", "N", "Neff", "N05",
+    "Nl", "Nm", "Nh", "VV", "wwM", "SunD1", "Rad1h",
+)
+# Around Germany, where most MOSMIX stations are
+TARGETS = [(51.34, 12.37), (52.52, 13.40), (48.14, 11.58), (50.94, 6.96), (53.55, 9.99)]
+
+
+def write_fixture(path: str, stations: int, steps: int, seed: int = 1) -> None:
+    rng = random.Random(seed)
+    start = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    times = "".join(
+        f"<dwd:TimeStep>{(start + timedelta(hours=h)).strftime('%Y-%m-%dT%H:%M:%S.000Z')}</dwd:TimeStep>"
+        for h in range(1, steps + 1)
+    )
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as kmz, \
+            kmz.open("MOSMIX_S_LATEST_240.kml", "w") as out:
+        out.write((
+            f'<?xml version="1.0" encoding="ISO-8859-1" standalone="no"?>'
+            f'<kml:kml xmlns:dwd="{DWD_NS}" xmlns:kml="{KML_NS}"><kml:Document><kml:ExtendedData>'
+            f"<dwd:ProductDefinition><dwd:Issuer>Deutscher Wetterdienst</dwd:Issuer>"
+            f"<dwd:ProductID>MOSMIX</dwd:ProductID>"
+            f"<dwd:IssueTime>{start.strftime('%Y-%m-%dT%H:%M:%S.000Z')}</dwd:IssueTime>"
+            f"<dwd:ForecastTimeSteps>{times}</dwd:ForecastTimeSteps>"
+            f"</dwd:ProductDefinition></kml:ExtendedData>"
+        ).encode())
+        for i in range(stations):
+            lat, lon = rng.uniform(35.0, 70.0), rng.uniform(-10.0, 30.0)
+            forecasts = []
+            for name in ELEMENTS:
+                if name == "ww":
+                    values = " ".join(f"{rng.choice((0, 1, 2, 3, 61, 63, 80)):.2f}" for _ in range(steps))
+                else:
+                    base = rng.uniform(0, 300)
+                    values = " ".join(
+                        "-" if rng.random() < 0.02 else f"{base + rng.uniform(-5, 5):.2f}"
+                        for _ in range(steps)
+                    )
+                forecasts.append(
+                    f'<dwd:Forecast dwd:elementName="{name}"><dwd:value>{values}</dwd:value></dwd:Forecast>'
+                )
+            out.write((
+                f"<kml:Placemark><kml:name>{10000 + i}</kml:name>"
+                f"<kml:description>STATION {i}</kml:description>"
+                f"<kml:ExtendedData>{''.join(forecasts)}</kml:ExtendedData>"
+                f"<kml:Point><kml:coordinates>{lon:.2f},{lat:.2f},100.0</kml:coordinates></kml:Point>"
+                f"</kml:Placemark>"
+            ).encode())
+        out.write(b"</kml:Document></kml:kml>")
+
+
+def measure(fn) -> tuple[float, float, object]:
+    """Wall seconds (untraced run) and peak MiB (traced run)."""
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    del result
+    tracemalloc.start()
+    result = fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak / 2**20, result
+
+
+def full_tree(raw: bytes, station_id: str):
+    with open_kmz(raw) as source:
+        root = ET.parse(source).getroot()
+    for placemark in root.iter(f"{{{KML_NS}}}Placemark"):
+        if placemark.findtext(f"{{{KML_NS}}}name") == station_id:
+            return placemark
+    return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixture", help="MOSMIX KMZ to parse instead of the synthetic one")
+    parser.add_argument("--stations", type=int, default=5400)
+    parser.add_argument("--steps", type=int, default=240)
+    parser.add_argument("--full-tree", action="store_true",
+                        help="also parse the whole tree (needs several GiB for the full file)")
+    args = parser.parse_args()
+
+    path = args.fixture
+    if path is None:
+        path = os.path.join(FIXTURES, f"mosmix_s_{args.stations}x{args.steps}.kmz")
+        if not os.path.exists(path):
+            print(f"writing {path} ...", file=sys.stderr)
+            write_fixture(path, args.stations, args.steps)
+    with open(path, "rb") as fh:
+        raw = fh.read()
+    with open_kmz(raw) as source:
+        kml_bytes = sum(len(chunk) for chunk in iter(lambda: source.read(1 << 20), b""))
+    print(f"kmz {len(raw) / 2**20:.1f} MiB, kml {kml_bytes / 2**20:.1f} MiB")
+
+    # First parse: no index yet
+    seconds, peak, doc = measure(lambda: parse_kmz(raw, None, TARGETS[:1]))
+    print(f"{'first parse (collect stations)':<34} {seconds:>7.2f} s {peak:>8.1f} MiB peak")
+    index = StationIndex(doc.stations)
+    ids = [index.nearest(*point)[0].id for point in TARGETS]
+    del doc
+
+    for count in (1, len(TARGETS)):
+        wanted = set(ids[:count])
+        seconds, peak, doc = measure(lambda: parse_kmz(raw, wanted))
+        label = f"known ids ({count} station{'s' if count > 1 else ''})"
+        print(f"{label:<34} {seconds:>7.2f} s {peak:>8.1f} MiB peak  "
+              f"({len(next(iter(doc.series.values())))} steps kept)")
+        del doc
+
+    if args.full_tree:
+        seconds, peak, _ = measure(lambda: full_tree(raw, ids[0]))
+        print(f"{'full ElementTree parse':<34} {seconds:>7.2f} s {peak:>8.1f} MiB peak")
+
+    stations = index.stations
+    number = 2000
+    point = TARGETS[0]
+    indexed_us = timeit.timeit(lambda: index.nearest(*point), number=number) / number * 1e6
+    linear_us = timeit.timeit(
+        lambda: min(stations, key=lambda s: distance_km(*point, s.lat, s.lon)), number=20
+    ) / 20 * 1e6
+    build_ms = timeit.timeit(lambda: StationIndex(stations), number=20) / 20 * 1e3
+    print(f"station index: {len(stations)} stations, build {build_ms:.1f} ms, "
+          f"nearest {indexed_us:.1f} us (linear scan {linear_us:.0f} us)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Benchmark: full JSON decode vs. orjson + field projection of OWM payloads.
+
+Uses the sample responses in benchmarks/fixtures (OWM 2.5 and One Call 3.0,
+the latter with every section, i.e. without "exclude"). Reports
+payload size, decode CPU time and the memory retained after decoding.
+
+    python benchmarks/bench_owm_decode.py
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from homeassistant.util.json import json_loads  # noqa: E402
+
+from custom_components.fahrradwetter.forecast import (  # noqa: E402
+    ForecastSeries,
+    project_current,
+    project_onecall_current,
+)
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def retained_bytes(decode, raw: bytes) -> int:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    obj = decode(raw)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del obj
+    return after - before
+
+
+def main() -> None:
+    cases = {
+        "current": project_current,
+        "forecast": ForecastSeries.from_owm_payload,
+        "onecall": lambda p: (project_onecall_current(p), ForecastSeries.from_onecall_payload(p)),
+    }
+    print(f"{'payload':>9} {'bytes':>7} {'full_us':>9} {'proj_us':>9} {'full_kib':>9} {'proj_kib':>9}")
+    for name, project in cases.items():
+        with open(os.path.join(FIXTURES, f"owm_{name}.json"), "rb") as fh:
+            raw = fh.read()
+
+        # aiohttp's resp.json() default: stdlib json on the decoded text
+        def full(data: bytes):
+            return json.loads(data.decode("utf-8"))
+
+        def projected(data: bytes, project=project):
+            return project(json_loads(data))
+
+        number = 2000
+        full_us = timeit.timeit(lambda: full(raw), number=number) / number * 1e6
+        proj_us = timeit.timeit(lambda: projected(raw), number=number) / number * 1e6
+        print(
+            f"{name:>9} {len(raw):>7} {full_us:>9.1f} {proj_us:>9.1f} "
+            f"{retained_bytes(full, raw) / 1024:>9.1f} {retained_bytes(projected, raw) / 1024:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""Scaling benchmark for the coordinator and entities against a fake OWM.
+
+For every combination of config entries and ride times it measures refresh
+latency, per-entity property cost, memory per config entry and event-loop
+lag, and prints one JSON object per line (or appends them to --output), so
+runs of different versions can be diffed.
+
+    python benchmarks/bench_scaling.py --entries 1,10,50,200 --times 2,10,50 \
+        --latency 0.05 --output bench_output.txt
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from homeassistant.config_entries import ConfigEntry  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.fahrradwetter import binary_sensor, sensor  # noqa: E402
+from custom_components.fahrradwetter.const import (  # noqa: E402
+    CONF_API_KEY,
+    CONF_CALLS_PER_DAY,
+    CONF_CALLS_PER_MINUTE,
+    CONF_LAT,
+    CONF_LON,
+    CONF_MODE,
+    CONF_PROVIDER,
+    CONF_TIMES,
+    DOMAIN,
+    MODE_OWM,
+    PROVIDER_OWM_25,
+    PROVIDER_OWM_ONECALL,
+)
+from custom_components.fahrradwetter.coordinator import FahrradwetterCoordinator  # noqa: E402
+from custom_components.fahrradwetter.providers.owm import OwmProvider  # noqa: E402
+from custom_components.fahrradwetter.providers.owm_onecall import OwmOneCallProvider  # noqa: E402
+
+from fake_owm import FakeOwmConfig, FakeOwmServer  # noqa: E402
+
+MANIFEST = os.path.join(
+    os.path.dirname(__file__), "..", "custom_components", "fahrradwetter", "manifest.json"
+)
+
+
+def ride_times(count: int) -> list[str]:
+    """`count` distinct HH:MM times spread over 05:00-21:00."""
+    span = 16 * 60
+    return [
+        f"{(5 * 60 + i * span // count) // 60:02d}:{(5 * 60 + i * span // count) % 60:02d}"
+        for i in range(count)
+    ]
+
+
+def make_entry(index: int, times: list[str], provider: str) -> ConfigEntry:
+    return ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain=DOMAIN,
+        title=f"Bench {index}",
+        data={
+            CONF_MODE: MODE_OWM,
+            CONF_PROVIDER: provider,
+            CONF_API_KEY: "bench",
+            CONF_LAT: 52.52 + index * 0.01,
+            CONF_LON: 13.40,
+        },
+        options={
+            CONF_TIMES: times,
+            CONF_CALLS_PER_MINUTE: 10**6,
+            CONF_CALLS_PER_DAY: 10**9,
+        },
+        source="user",
+    )
+
+
+async def setup_entries(hass: HomeAssistant, n_entries: int, times: list[str], provider: str):
+    coordinators: list[FahrradwetterCoordinator] = []
+    entities: list[Any] = []
+    for i in range(n_entries):
+        entry = make_entry(i, times, provider)
+        coordinator = FahrradwetterCoordinator(hass, entry)
+        hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+        await sensor.async_setup_entry(hass, entry, entities.extend)
+        await binary_sensor.async_setup_entry(hass, entry, entities.extend)
+        coordinators.append(coordinator)
+    return coordinators, entities
+
+
+async def timed_refresh(coordinator: FahrradwetterCoordinator) -> float:
+    start = time.perf_counter()
+    await coordinator.async_refresh()
+    return time.perf_counter() - start
+
+
+async def lag_monitor(stop: asyncio.Event, samples: list[float], interval: float = 0.005) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, loop.time() - start - interval))
+
+
+def entity_property_cost(entities: list[Any], rounds: int = 5) -> float:
+    """Mean cost in us of reading an entity's state properties once."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for ent in entities:
+            # Same order as HA's state write: state attributes only if available
+            if not ent.available:
+                continue
+            if isinstance(ent, binary_sensor.FahrradwetterOkBase):
+                ent.is_on  # noqa: B018
+            else:
+                ent.native_value  # noqa: B018
+                ent.extra_state_attributes  # noqa: B018
+    return (time.perf_counter() - start) / (rounds * len(entities)) * 1e6
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))]
+
+
+async def run_case(server: FakeOwmServer, n_entries: int, n_times: int, provider: str) -> dict[str, Any]:
+    times = ride_times(n_times)
+    requests_before = dict(server.stats.requests)
+    errors_before = server.stats.errors
+    bytes_before = server.stats.bytes_sent
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        try:
+            # Latency + event-loop lag pass
+            coordinators, entities = await setup_entries(hass, n_entries, times, provider)
+            stop = asyncio.Event()
+            lag: list[float] = []
+            monitor = asyncio.create_task(lag_monitor(stop, lag))
+            start = time.perf_counter()
+            latencies = await asyncio.gather(*(timed_refresh(c) for c in coordinators))
+            total = time.perf_counter() - start
+            stop.set()
+            await monitor
+            prop_us = entity_property_cost(entities)
+            ok = sum(1 for c in coordinators if c.last_update_success)
+            for c in coordinators:
+                await c.async_shutdown()
+            hass.data.pop(DOMAIN, None)
+
+            # Memory pass (tracemalloc would distort the timings above)
+            tracemalloc.start()
+            before = tracemalloc.get_traced_memory()[0]
+            coordinators, entities = await setup_entries(hass, n_entries, times, provider)
+            await asyncio.gather(*(c.async_refresh() for c in coordinators))
+            mem_per_entry = (tracemalloc.get_traced_memory()[0] - before) / n_entries
+            tracemalloc.stop()
+            for c in coordinators:
+                await c.async_shutdown()
+            hass.data.pop(DOMAIN, None)
+        finally:
+            await hass.async_stop(force=True)
+
+    latencies_ms = [v * 1000 for v in latencies]
+    lag_ms = [v * 1000 for v in lag]
+    return {
+        "entries": n_entries,
+        "times": n_times,
+        "entities": len(entities),
+        "refresh_ok": ok,
+        "refresh_total_ms": round(total * 1000, 2),
+        "refresh_p50_ms": round(statistics.median(latencies_ms), 2),
+        "refresh_p95_ms": round(percentile(latencies_ms, 0.95), 2),
+        "entity_property_us": round(prop_us, 3),
+        "memory_per_entry_kib": round(mem_per_entry / 1024, 1),
+        "loop_lag_max_ms": round(max(lag_ms, default=0.0), 2),
+        "loop_lag_p95_ms": round(percentile(lag_ms, 0.95), 2),
+        "http_requests": {
+            k: v - requests_before.get(k, 0) for k, v in server.stats.requests.items()
+        },
+        "http_errors": server.stats.errors - errors_before,
+        "http_bytes": server.stats.bytes_sent - bytes_before,
+    }
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    server = FakeOwmServer(FakeOwmConfig(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        forecast_blocks=args.blocks,
+    ))
+    await server.start()
+    OwmProvider.current_url = f"{server.base_url}/weather"
+    OwmProvider.forecast_url = f"{server.base_url}/forecast"
+    OwmOneCallProvider.url = server.onecall_url
+
+    with open(MANIFEST, encoding="utf-8") as fh:
+        version = json.load(fh).get("version")
+    meta = {
+        "bench": "scaling",
+        "version": version,
+        "python": platform.python_version(),
+        "timestamp": int(time.time()),
+        "provider": args.provider,
+        "latency_s": args.latency,
+        "error_rate": args.error_rate,
+        "rate_limit_rate": args.rate_limit_rate,
+        "forecast_blocks": args.blocks,
+    }
+    out = open(args.output, "a", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for n_entries in args.entries:
+            for n_times in args.times:
+                result = {**meta, **await run_case(server, n_entries, n_times, args.provider)}
+                out.write(json.dumps(result) + "\n")
+                out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        await server.stop()
+
+
+def _int_list(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=_int_list, default=[1, 10, 50, 200])
+    parser.add_argument("--times", type=_int_list, default=[2, 10, 50])
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--blocks", type=int, default=40)
+    parser.add_argument("--provider", choices=[PROVIDER_OWM_25, PROVIDER_OWM_ONECALL], default=PROVIDER_OWM_25)
+    parser.add_argument("--output", help="append JSON lines to this file instead of stdout")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.CRITICAL)
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Local stand-in for the OWM 2.5 /weather and /forecast endpoints.
+
+Serves the sample payloads from benchmarks/fixtures with configurable
+latency, error rate and forecast length. Used by bench_scaling.py, but can
+also be run on its own:
+
+    python benchmarks/fake_owm.py --port 8099 --latency 0.1 --error-rate 0.05
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import copy
+import json
+import os
+import random
+import time
+from dataclasses import dataclass, field
+
+from aiohttp import web
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+BLOCK_SECONDS = 3 * 3600
+
+
+@dataclass
+class FakeOwmConfig:
+    latency: float = 0.0
+    # fraction of requests answered with HTTP 500 / 429
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    forecast_blocks: int = 40
+
+
+@dataclass
+class FakeOwmStats:
+    requests: dict[str, int] = field(default_factory=lambda: {"weather": 0, "forecast": 0, "onecall": 0})
+    errors: int = 0
+    bytes_sent: int = 0
+
+
+def _load(name: str) -> dict:
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def build_forecast(blocks: int, start: int | None = None) -> bytes:
+    """Forecast payload with `blocks` entries, starting at the current block."""
+    template = _load("owm_forecast.json")
+    sample = template["list"]
+    start = start or int(time.time()) // BLOCK_SECONDS * BLOCK_SECONDS
+    lst = []
+    for i in range(blocks):
+        block = copy.deepcopy(sample[i % len(sample)])
+        block["dt"] = start + i * BLOCK_SECONDS
+        lst.append(block)
+    template["list"] = lst
+    template["cnt"] = blocks
+    return json.dumps(template, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def build_onecall(start: int | None = None) -> dict:
+    """One Call 3.0 payload (current, minutely, 48 h hourly, daily) from now on."""
+    template = _load("owm_onecall.json")
+    start = start or int(time.time()) // 3600 * 3600
+    template["current"]["dt"] = start
+    for i, minute in enumerate(template["minutely"]):
+        minute["dt"] = start + i * 60
+    for i, hour in enumerate(template["hourly"]):
+        hour["dt"] = start + i * 3600
+    for i, day in enumerate(template["daily"]):
+        day["dt"] = start + i * 86400
+    return template
+
+
+class FakeOwmServer:
+    def __init__(self, config: FakeOwmConfig | None = None) -> None:
+        self.config = config or FakeOwmConfig()
+        self.stats = FakeOwmStats()
+        self._current = json.dumps(_load("owm_current.json"), ensure_ascii=False).encode()
+        self._forecast = build_forecast(self.config.forecast_blocks)
+        self._onecall = build_onecall()
+        self._runner: web.AppRunner | None = None
+        self.port: int | None = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/data/2.5"
+
+    @property
+    def onecall_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/data/3.0/onecall"
+
+    async def _respond(self, kind: str, body: bytes) -> web.Response:
+        self.stats.requests[kind] += 1
+        if self.config.latency:
+            await asyncio.sleep(self.config.latency)
+        roll = random.random()
+        if roll < self.config.rate_limit_rate:
+            self.stats.errors += 1
+            return web.Response(status=429, headers={"Retry-After": "60"})
+        if roll < self.config.rate_limit_rate + self.config.error_rate:
+            self.stats.errors += 1
+            return web.Response(status=500)
+        self.stats.bytes_sent += len(body)
+        return web.Response(body=body, content_type="application/json")
+
+    async def _weather(self, request: web.Request) -> web.Response:
+        return await self._respond("weather", self._current)
+
+    async def _forecast_handler(self, request: web.Request) -> web.Response:
+        return await self._respond("forecast", self._forecast)
+
+    async def _onecall_handler(self, request: web.Request) -> web.Response:
+        # Honour "exclude" like OWM does, it decides the payload size
+        excluded = set(request.query.get("exclude", "").split(","))
+        body = {k: v for k, v in self._onecall.items() if k not in excluded}
+        return await self._respond("onecall", json.dumps(body, ensure_ascii=False, separators=(",", ":")).encode())
+
+    async def start(self, port: int = 0) -> None:
+        app = web.Application()
+        app.router.add_get("/data/2.5/weather", self._weather)
+        app.router.add_get("/data/2.5/forecast", self._forecast_handler)
+        app.router.add_get("/data/3.0/onecall", self._onecall_handler)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    server = FakeOwmServer(FakeOwmConfig(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        forecast_blocks=args.blocks,
+    ))
+    await server.start(args.port)
+    print(f"Fake OWM listening on {server.base_url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--blocks", type=int, default=40)
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
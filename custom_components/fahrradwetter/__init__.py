@@ -1,15 +1,77 @@
 from __future__ import annotations
 
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv, entity_registry as er
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN
+from .const import BIAS_STORAGE_VERSION, DOMAIN, STORAGE_VERSION
+from .coordinator import FahrradwetterCoordinator
+from .services import async_setup_services
 
-PLATFORMS: list[str] = ["sensor"]
+# The config flow is only imported by HA when a flow is opened; the runtime
+# path is this module, the coordinator and the two entity platforms.
+PLATFORMS: list[Platform] = [Platform.BINARY_SENSOR, Platform.SENSOR]
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    async_setup_services(hass)
+    return True
+
+def _remove_legacy_ok_entities(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Drop OK entities that older versions registered under the sensor platform.
+
+    They are binary sensors now and get re-created under binary_sensor.
+    """
+    registry = er.async_get(hass)
+    for reg_entry in er.async_entries_for_config_entry(registry, entry.entry_id):
+        if reg_entry.domain == Platform.SENSOR and reg_entry.unique_id.startswith(
+            (f"{entry.entry_id}_ok_now", f"{entry.entry_id}_ok_tomorrow_")
+        ):
+            registry.async_remove(reg_entry.entity_id)
+
+def _remove_unpinned_schedule_entities(hass: HomeAssistant, entry: ConfigEntry,
+                                       coordinator: FahrradwetterCoordinator) -> None:
+    """Drop binary sensors of schedule slots that are no longer pinned."""
+    prefix = f"{entry.entry_id}_schedule_"
+    keep = {f"{prefix}{slot.key}" for slot in coordinator.schedule if slot.pinned}
+    registry = er.async_get(hass)
+    for reg_entry in er.async_entries_for_config_entry(registry, entry.entry_id):
+        if (reg_entry.domain == Platform.BINARY_SENSOR and reg_entry.unique_id.startswith(prefix)
+                and reg_entry.unique_id not in keep):
+            registry.async_remove(reg_entry.entity_id)
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    coordinator = FahrradwetterCoordinator(hass, entry)
+    await coordinator.async_load_bias()
+    if await coordinator.async_restore_cache():
+        # Entities come up from the cached snapshot, OWM is revalidated later
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} revalidate {entry.entry_id}"
+        )
+    else:
+        await coordinator.async_config_entry_first_refresh()
+
+    coordinator.async_track_local_entities()
+
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+    _remove_legacy_ok_entities(hass, entry)
+    _remove_unpinned_schedule_entities(hass, entry, coordinator)
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     return True
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok:
+        coordinator: FahrradwetterCoordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        # Stops the refresh timer and drops pending requests; the pooled
+        # HTTP session itself is shared and stays owned by HA.
+        await coordinator.async_shutdown()
+    return unload_ok
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}").async_remove()
+    await Store(hass, BIAS_STORAGE_VERSION, f"{DOMAIN}.bias.{entry.entry_id}").async_remove()
@@ -0,0 +1,158 @@
+"""Forecast bias learned from local sensors (hybrid mode).
+
+Per variable and local hour of day, the last BIAS_WINDOW_DAYS pairs of
+(forecast, observed) are kept in a ring buffer; mean and variance of the
+residual (observed - forecast) are maintained with Welford's algorithm,
+including removal of the evicted pair, so every sample is O(1). The mean
+residual of an hour is added to forecast blocks at that hour once the
+bucket has BIAS_MIN_SAMPLES pairs.
+"""
+from __future__ import annotations
+
+from array import array
+from collections import deque
+import math
+from typing import Any, Callable, NamedTuple
+
+from .const import BIAS_MIN_SAMPLES, BIAS_WINDOW_DAYS
+from .forecast import ForecastSeries
+
+# Variables learned; wind in m/s like the forecast columns. Rain is left
+# out: local rain sensors report totals or rates in too many flavours to
+# pair with a per-block forecast amount.
+VARIABLES = ("temp", "wind_ms")
+
+
+class Pair(NamedTuple):
+    day: int  # local date as ordinal: one sample per bucket and day
+    forecast: float
+    observed: float
+
+
+class RunningStats:
+    """Welford mean/variance that also supports removing a value."""
+
+    __slots__ = ("count", "mean", "_m2")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, x: float) -> None:
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (x - self.mean)
+
+    def remove(self, x: float) -> None:
+        if self.count <= 1:
+            self.count, self.mean, self._m2 = 0, 0.0, 0.0
+            return
+        delta = x - self.mean
+        self.count -= 1
+        self.mean -= delta / self.count
+        self._m2 = max(0.0, self._m2 - delta * (x - self.mean))
+
+    @property
+    def stdev(self) -> float | None:
+        return math.sqrt(self._m2 / (self.count - 1)) if self.count > 1 else None
+
+
+class BiasBucket:
+    """Ring buffer of pairs for one variable and hour, with residual stats."""
+
+    __slots__ = ("pairs", "stats")
+
+    def __init__(self, size: int = BIAS_WINDOW_DAYS) -> None:
+        self.pairs: deque[Pair] = deque(maxlen=size)
+        self.stats = RunningStats()
+
+    def add(self, pair: Pair) -> bool:
+        """Add a pair; False if this bucket already has one for that day."""
+        if self.pairs and self.pairs[-1].day >= pair.day:
+            return False
+        if len(self.pairs) == self.pairs.maxlen:
+            old = self.pairs[0]
+            self.stats.remove(old.observed - old.forecast)
+        self.pairs.append(pair)
+        self.stats.add(pair.observed - pair.forecast)
+        return True
+
+
+class BiasModel:
+    """Buckets for every learned variable and hour of the day."""
+
+    def __init__(self, size: int = BIAS_WINDOW_DAYS, min_samples: int = BIAS_MIN_SAMPLES) -> None:
+        self.min_samples = min_samples
+        self.buckets = {var: [BiasBucket(size) for _ in range(24)] for var in VARIABLES}
+        # Bumped on every accepted sample; corrected series are cached against it
+        self.version = 0
+
+    def observe(self, var: str, hour: int, day: int, forecast: float | None,
+                observed: float | None) -> bool:
+        if forecast is None or observed is None or math.isnan(forecast) or math.isnan(observed):
+            return False
+        if not self.buckets[var][hour].add(Pair(day, forecast, observed)):
+            return False
+        self.version += 1
+        return True
+
+    def correction(self, var: str, hour: int) -> float | None:
+        """Mean residual of the hour, None until enough pairs were seen."""
+        stats = self.buckets[var][hour].stats
+        return stats.mean if stats.count >= self.min_samples else None
+
+    def apply(self, series: ForecastSeries, hour_of: Callable[[int], int]) -> ForecastSeries:
+        """Copy of series with the learned correction added per block hour."""
+        fixes = {var: [self.correction(var, h) or 0.0 for h in range(24)] for var in VARIABLES}
+        if not any(any(f) for f in fixes.values()):
+            return series
+        hours = [hour_of(ts) for ts in series.timestamps]
+        corrected = ForecastSeries(series.step)
+        corrected.timestamps = series.timestamps
+        corrected.temp = array("d", (t + fixes["temp"][h] for t, h in zip(series.temp, hours)))
+        corrected.wind_ms = array(
+            "d", (max(0.0, w + fixes["wind_ms"][h]) for w, h in zip(series.wind_ms, hours))
+        )
+        corrected.rain = series.rain
+        corrected.desc_idx = series.desc_idx
+        corrected.descriptions = series.descriptions
+        return corrected
+
+    def summary(self) -> dict[str, Any]:
+        """Per variable and hour: pairs, mean and spread of the residual."""
+        return {
+            var: {
+                hour: {
+                    "pairs": b.stats.count,
+                    "mean": round(b.stats.mean, 2),
+                    "stdev": round(b.stats.stdev, 2) if b.stats.stdev is not None else None,
+                }
+                for hour, b in enumerate(buckets) if b.stats.count
+            }
+            for var, buckets in self.buckets.items()
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        """JSON-serialisable form for HA storage (the pairs; stats are derived)."""
+        return {
+            var: {
+                str(hour): [list(p) for p in b.pairs]
+                for hour, b in enumerate(buckets) if b.pairs
+            }
+            for var, buckets in self.buckets.items()
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any], size: int = BIAS_WINDOW_DAYS,
+                  min_samples: int = BIAS_MIN_SAMPLES) -> BiasModel:
+        model = cls(size, min_samples)
+        for var, hours in data.items():
+            if var not in model.buckets:
+                continue
+            for hour, pairs in hours.items():
+                bucket = model.buckets[var][int(hour) % 24]
+                for day, forecast, observed in pairs:
+                    bucket.add(Pair(int(day), float(forecast), float(observed)))
+        return model
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from homeassistant.components.binary_sensor import BinarySensorEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN, SLOT_NOW
+from .coordinator import FahrradwetterCoordinator
+from .evaluation import schedule_slot, tomorrow_slot
+
+if TYPE_CHECKING:
+    from .schedule import ScheduleSlot
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
+    coordinator: FahrradwetterCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    entities: list = [FahrradwetterOkNow(coordinator, entry)]
+    for t in coordinator.times:
+        entities.append(FahrradwetterOkTomorrowAt(coordinator, entry, t))
+    # Schedule slots only get an entity of their own when pinned
+    for slot in coordinator.schedule:
+        if slot.pinned:
+            entities.append(FahrradwetterOkSchedule(coordinator, entry, slot))
+
+    async_add_entities(entities)
+
+
+class FahrradwetterOkBase(CoordinatorEntity[FahrradwetterCoordinator], BinarySensorEntity):
+    """Reads the ok flag of one evaluated slot from the coordinator snapshot."""
+
+    _attr_should_poll = False
+    # Payload whose age decides availability
+    _data_kind = "forecast"
+
+    def __init__(self, coordinator, entry: ConfigEntry, slot: str, unique_suffix: str, name_suffix: str):
+        super().__init__(coordinator, context=slot)
+        self.entry = entry
+        self.slot_key = slot
+        self._attr_unique_id = f"{entry.entry_id}_{unique_suffix}"
+        self._attr_name = f"{entry.title} {name_suffix}"
+
+    @property
+    def available(self) -> bool:
+        return self.coordinator.data_fresh(self._data_kind)
+
+    @property
+    def is_on(self):
+        return self.coordinator.data.slot(self.slot_key).ok
+
+
+class FahrradwetterOkNow(FahrradwetterOkBase):
+    _data_kind = "current"
+
+    def __init__(self, coordinator, entry):
+        super().__init__(coordinator, entry, SLOT_NOW, "ok_now", "OK Jetzt")
+
+
+class FahrradwetterOkTomorrowAt(FahrradwetterOkBase):
+    def __init__(self, coordinator, entry, time_str: str):
+        self.time_str = time_str
+        key = time_str.replace(":", "")
+        super().__init__(coordinator, entry, tomorrow_slot(time_str), f"ok_tomorrow_{key}", f"OK Morgen {time_str}")
+
+
+class FahrradwetterOkSchedule(FahrradwetterOkBase):
+    def __init__(self, coordinator, entry, slot: ScheduleSlot):
+        self.schedule_slot = slot
+        super().__init__(coordinator, entry, schedule_slot(slot.key), f"schedule_{slot.key}", f"OK {slot.label}")
@@ -0,0 +1,80 @@
+"""Circuit breaker around the weather provider of one entry."""
+from __future__ import annotations
+
+from typing import Any
+
+from .const import BREAKER_COOLDOWN_SECONDS, BREAKER_FAILURE_THRESHOLD, BREAKER_MAX_COOLDOWN_SECONDS
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stops calling a provider that keeps failing.
+
+    Closed: every due leg is fetched. After BREAKER_FAILURE_THRESHOLD
+    refreshes in a row in which every leg failed, the breaker opens and
+    refreshes serve cached data without any request. Once the cooldown has
+    passed, one probe leg is let through (half-open): success closes the
+    breaker, failure opens it again with twice the cooldown.
+    """
+
+    def __init__(self, threshold: int = BREAKER_FAILURE_THRESHOLD,
+                 cooldown: float = BREAKER_COOLDOWN_SECONDS,
+                 max_cooldown: float = BREAKER_MAX_COOLDOWN_SECONDS) -> None:
+        self.threshold = threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.state = CLOSED
+        self.failures = 0
+        self.cooldown = cooldown
+        self._retry_at = 0.0
+        self.opened = 0
+
+    def allowed_calls(self, now: float) -> int | None:
+        """Legs this refresh may fetch: None = all, 1 = probe, 0 = none."""
+        if self.state == CLOSED:
+            return None
+        if self.state == HALF_OPEN or now >= self._retry_at:
+            # Refreshes never overlap: a half-open breaker here means the
+            # last probe ended without a result (cancelled), so probe again
+            self.state = HALF_OPEN
+            return 1
+        return 0
+
+    def release_probe(self) -> None:
+        """The granted probe was not sent (quota) or cancelled: probe next refresh."""
+        if self.state == HALF_OPEN:
+            self.state = OPEN
+
+    def record_success(self) -> None:
+        self.state = CLOSED
+        self.failures = 0
+        self.cooldown = self.base_cooldown
+
+    def record_failure(self, now: float) -> None:
+        if self.state == HALF_OPEN:
+            self.cooldown = min(self.max_cooldown, self.cooldown * 2)
+            self._open(now)
+            return
+        self.failures += 1
+        if self.state == CLOSED and self.failures >= self.threshold:
+            self._open(now)
+
+    def _open(self, now: float) -> None:
+        self.state = OPEN
+        self.opened += 1
+        self._retry_at = now + self.cooldown
+
+    def retry_in(self, now: float) -> float:
+        return max(0.0, self._retry_at - now) if self.state == OPEN else 0.0
+
+    def as_dict(self, now: float) -> dict[str, Any]:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "cooldown_s": self.cooldown,
+            "retry_in_s": round(self.retry_in(now), 1),
+            "opened": self.opened,
+        }
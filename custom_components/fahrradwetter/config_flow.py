@@ -9,6 +9,9 @@ import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.helpers import selector
 
+from .route import parse_waypoints
+from .schedule import parse_schedule
+
 _LOGGER = logging.getLogger(__name__)
 
 # -----------------------------------------------------------------------------
@@ -35,9 +38,22 @@ try:
         CONF_TOMORROW_TIME_2,
         CONF_UPDATE_INTERVAL,
         CONF_WIND_UNIT,
+        CONF_MAX_STALENESS,
+        CONF_CALLS_PER_MINUTE,
+        CONF_CALLS_PER_DAY,
+        CONF_WAYPOINTS,
+        CONF_SCHEDULE,
+        CONF_PROVIDER,
+        PROVIDER_OWM_25,
+        PROVIDER_OWM_ONECALL,
+        PROVIDER_DWD_MOSMIX,
+        DEFAULT_PROVIDER,
         WIND_UNIT_KMH,
         WIND_UNIT_MS,
         DEFAULT_UPDATE_INTERVAL_MIN,
+        DEFAULT_MAX_STALENESS_H,
+        DEFAULT_CALLS_PER_MINUTE,
+        DEFAULT_CALLS_PER_DAY,
     )
 except Exception as err:  # pragma: no cover
     _LOGGER.error("Failed to import const.py, using fallbacks: %s", err)
@@ -61,9 +77,22 @@ except Exception as err:  # pragma: no cover
     CONF_TOMORROW_TIME_2 = "tomorrow_time_2"
     CONF_UPDATE_INTERVAL = "update_interval"
     CONF_WIND_UNIT = "wind_unit"
+    CONF_MAX_STALENESS = "max_staleness"
+    CONF_CALLS_PER_MINUTE = "calls_per_minute"
+    CONF_CALLS_PER_DAY = "calls_per_day"
+    CONF_WAYPOINTS = "waypoints"
+    CONF_SCHEDULE = "schedule"
+    CONF_PROVIDER = "provider"
+    PROVIDER_OWM_25 = "owm_25"
+    PROVIDER_OWM_ONECALL = "owm_onecall"
+    PROVIDER_DWD_MOSMIX = "dwd_mosmix"
+    DEFAULT_PROVIDER = PROVIDER_OWM_25
     WIND_UNIT_KMH = "kmh"
     WIND_UNIT_MS = "ms"
     DEFAULT_UPDATE_INTERVAL_MIN = 30
+    DEFAULT_MAX_STALENESS_H = 6
+    DEFAULT_CALLS_PER_MINUTE = 60
+    DEFAULT_CALLS_PER_DAY = 1000
 
 
 def _sensor_entity_selector() -> selector.EntitySelector:
@@ -76,6 +105,12 @@ def _defaults(d: dict) -> dict:
         CONF_TOMORROW_TIME_2: d.get(CONF_TOMORROW_TIME_2, time(16, 0, 0)),
         CONF_UPDATE_INTERVAL: d.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL_MIN),
         CONF_WIND_UNIT: d.get(CONF_WIND_UNIT, WIND_UNIT_KMH),
+        CONF_MAX_STALENESS: d.get(CONF_MAX_STALENESS, DEFAULT_MAX_STALENESS_H),
+        CONF_CALLS_PER_MINUTE: d.get(CONF_CALLS_PER_MINUTE, DEFAULT_CALLS_PER_MINUTE),
+        CONF_CALLS_PER_DAY: d.get(CONF_CALLS_PER_DAY, DEFAULT_CALLS_PER_DAY),
+        CONF_WAYPOINTS: d.get(CONF_WAYPOINTS, ""),
+        CONF_SCHEDULE: d.get(CONF_SCHEDULE, ""),
+        CONF_PROVIDER: d.get(CONF_PROVIDER, DEFAULT_PROVIDER),
     }
 
 
@@ -85,6 +120,19 @@ def _api_key_selector():
     )
 
 
+def _provider_selector():
+    return selector.SelectSelector(
+        selector.SelectSelectorConfig(
+            options=[
+                {"value": PROVIDER_OWM_25, "label": "OpenWeatherMap 2.5 (Forecast in 3h-Blöcken)"},
+                {"value": PROVIDER_OWM_ONECALL, "label": "OpenWeatherMap One Call 3.0 (stündlich, 1 Abruf)"},
+                {"value": PROVIDER_DWD_MOSMIX, "label": "DWD MOSMIX (stündlich, ohne API-Key)"},
+            ],
+            mode=selector.SelectSelectorMode.DROPDOWN,
+        )
+    )
+
+
 def _lat_selector():
     return selector.NumberSelector(
         selector.NumberSelectorConfig(
@@ -119,6 +167,59 @@ def _wind_unit_selector(default_value: str):
     )
 
 
+def _max_staleness_selector(default_value: int):
+    return selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=1,
+            max=48,
+            step=1,
+            mode=selector.NumberSelectorMode.SLIDER,
+            unit_of_measurement="h",
+        )
+    )
+
+
+def _calls_selector(max_value: int):
+    return selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=1,
+            max=max_value,
+            step=1,
+            mode=selector.NumberSelectorMode.BOX,
+        )
+    )
+
+
+def _waypoints_selector():
+    # One "lat,lon" per line, in route order
+    return selector.TextSelector(selector.TextSelectorConfig(multiline=True))
+
+
+def _validate_api_key(user_input: dict, errors: dict) -> None:
+    # DWD's open data needs no key
+    if user_input.get(CONF_PROVIDER) != PROVIDER_DWD_MOSMIX and not user_input.get(CONF_API_KEY):
+        errors[CONF_API_KEY] = "required"
+
+
+def _validate_waypoints(user_input: dict, errors: dict) -> None:
+    try:
+        parse_waypoints(user_input.get(CONF_WAYPOINTS))
+    except ValueError:
+        errors[CONF_WAYPOINTS] = "invalid_waypoints"
+
+
+def _schedule_selector():
+    # One rule per line: "Mo-Fr 06:30 16:45", "Sa 10:00 min_temp=10 pin"
+    return selector.TextSelector(selector.TextSelectorConfig(multiline=True))
+
+
+def _validate_schedule(user_input: dict, errors: dict) -> None:
+    try:
+        parse_schedule(user_input.get(CONF_SCHEDULE))
+    except ValueError:
+        errors[CONF_SCHEDULE] = "invalid_schedule"
+
+
 def _update_interval_selector(default_value: int):
     return selector.NumberSelector(
         selector.NumberSelectorConfig(
@@ -210,12 +311,13 @@ class FahrradwetterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         home_lat, home_lon = self._home_lat_lon_defaults()
 
         if user_input is not None:
-            if not user_input.get(CONF_API_KEY):
-                errors[CONF_API_KEY] = "required"
+            _validate_api_key(user_input, errors)
             if user_input.get(CONF_LAT) in (None, ""):
                 errors[CONF_LAT] = "required"
             if user_input.get(CONF_LON) in (None, ""):
                 errors[CONF_LON] = "required"
+            _validate_waypoints(user_input, errors)
+            _validate_schedule(user_input, errors)
 
             if not errors:
                 self._data.update(user_input)
@@ -223,7 +325,8 @@ class FahrradwetterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         schema = vol.Schema(
             {
-                vol.Required(CONF_API_KEY): _api_key_selector(),
+                vol.Required(CONF_PROVIDER, default=defaults[CONF_PROVIDER]): _provider_selector(),
+                vol.Optional(CONF_API_KEY): _api_key_selector(),
                 vol.Required(CONF_LAT, default=home_lat): _lat_selector(),
                 vol.Required(CONF_LON, default=home_lon): _lon_selector(),
 
@@ -231,6 +334,11 @@ class FahrradwetterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 vol.Optional(CONF_TOMORROW_TIME_2, default=defaults[CONF_TOMORROW_TIME_2]): selector.TimeSelector(),
                 vol.Optional(CONF_UPDATE_INTERVAL, default=defaults[CONF_UPDATE_INTERVAL]): _update_interval_selector(defaults[CONF_UPDATE_INTERVAL]),
                 vol.Optional(CONF_WIND_UNIT, default=defaults[CONF_WIND_UNIT]): _wind_unit_selector(defaults[CONF_WIND_UNIT]),
+                vol.Optional(CONF_MAX_STALENESS, default=defaults[CONF_MAX_STALENESS]): _max_staleness_selector(defaults[CONF_MAX_STALENESS]),
+                vol.Optional(CONF_CALLS_PER_MINUTE, default=defaults[CONF_CALLS_PER_MINUTE]): _calls_selector(3000),
+                vol.Optional(CONF_CALLS_PER_DAY, default=defaults[CONF_CALLS_PER_DAY]): _calls_selector(1000000),
+                vol.Optional(CONF_WAYPOINTS, default=defaults[CONF_WAYPOINTS]): _waypoints_selector(),
+                vol.Optional(CONF_SCHEDULE, default=defaults[CONF_SCHEDULE]): _schedule_selector(),
             }
         )
         return self.async_show_form(step_id="owm", data_schema=schema, errors=errors)
@@ -242,12 +350,13 @@ class FahrradwetterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         home_lat, home_lon = self._home_lat_lon_defaults()
 
         if user_input is not None:
-            if not user_input.get(CONF_API_KEY):
-                errors[CONF_API_KEY] = "required"
+            _validate_api_key(user_input, errors)
             if user_input.get(CONF_LAT) in (None, ""):
                 errors[CONF_LAT] = "required"
             if user_input.get(CONF_LON) in (None, ""):
                 errors[CONF_LON] = "required"
+            _validate_waypoints(user_input, errors)
+            _validate_schedule(user_input, errors)
             if not user_input.get(CONF_LOCAL_TEMP_ENTITY):
                 errors[CONF_LOCAL_TEMP_ENTITY] = "required"
 
@@ -257,7 +366,8 @@ class FahrradwetterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         schema = vol.Schema(
             {
-                vol.Required(CONF_API_KEY): _api_key_selector(),
+                vol.Required(CONF_PROVIDER, default=defaults[CONF_PROVIDER]): _provider_selector(),
+                vol.Optional(CONF_API_KEY): _api_key_selector(),
                 vol.Required(CONF_LAT, default=home_lat): _lat_selector(),
                 vol.Required(CONF_LON, default=home_lon): _lon_selector(),
 
@@ -269,6 +379,11 @@ class FahrradwetterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 vol.Optional(CONF_TOMORROW_TIME_2, default=defaults[CONF_TOMORROW_TIME_2]): selector.TimeSelector(),
                 vol.Optional(CONF_UPDATE_INTERVAL, default=defaults[CONF_UPDATE_INTERVAL]): _update_interval_selector(defaults[CONF_UPDATE_INTERVAL]),
                 vol.Optional(CONF_WIND_UNIT, default=defaults[CONF_WIND_UNIT]): _wind_unit_selector(defaults[CONF_WIND_UNIT]),
+                vol.Optional(CONF_MAX_STALENESS, default=defaults[CONF_MAX_STALENESS]): _max_staleness_selector(defaults[CONF_MAX_STALENESS]),
+                vol.Optional(CONF_CALLS_PER_MINUTE, default=defaults[CONF_CALLS_PER_MINUTE]): _calls_selector(3000),
+                vol.Optional(CONF_CALLS_PER_DAY, default=defaults[CONF_CALLS_PER_DAY]): _calls_selector(1000000),
+                vol.Optional(CONF_WAYPOINTS, default=defaults[CONF_WAYPOINTS]): _waypoints_selector(),
+                vol.Optional(CONF_SCHEDULE, default=defaults[CONF_SCHEDULE]): _schedule_selector(),
             }
         )
         return self.async_show_form(step_id="hybrid", data_schema=schema, errors=errors)
@@ -351,12 +466,13 @@ class FahrradwetterOptionsFlowHandler(config_entries.OptionsFlow):
         defaults = _defaults(self._opts)
 
         if user_input is not None:
-            if not user_input.get(CONF_API_KEY):
-                errors[CONF_API_KEY] = "required"
+            _validate_api_key(user_input, errors)
             if user_input.get(CONF_LAT) in (None, ""):
                 errors[CONF_LAT] = "required"
             if user_input.get(CONF_LON) in (None, ""):
                 errors[CONF_LON] = "required"
+            _validate_waypoints(user_input, errors)
+            _validate_schedule(user_input, errors)
             if not errors:
                 self._opts.update(user_input)
                 self._opts[CONF_MODE] = MODE_OWM
@@ -364,7 +480,8 @@ class FahrradwetterOptionsFlowHandler(config_entries.OptionsFlow):
 
         schema = vol.Schema(
             {
-                vol.Required(CONF_API_KEY, default=self._current(CONF_API_KEY, "")): _api_key_selector(),
+                vol.Required(CONF_PROVIDER, default=self._current(CONF_PROVIDER, DEFAULT_PROVIDER)): _provider_selector(),
+                vol.Optional(CONF_API_KEY, default=self._current(CONF_API_KEY, "")): _api_key_selector(),
                 vol.Required(CONF_LAT, default=self._current(CONF_LAT, 0.0)): _lat_selector(),
                 vol.Required(CONF_LON, default=self._current(CONF_LON, 0.0)): _lon_selector(),
 
@@ -372,6 +489,11 @@ class FahrradwetterOptionsFlowHandler(config_entries.OptionsFlow):
                 vol.Optional(CONF_TOMORROW_TIME_2, default=defaults[CONF_TOMORROW_TIME_2]): selector.TimeSelector(),
                 vol.Optional(CONF_UPDATE_INTERVAL, default=defaults[CONF_UPDATE_INTERVAL]): _update_interval_selector(defaults[CONF_UPDATE_INTERVAL]),
                 vol.Optional(CONF_WIND_UNIT, default=defaults[CONF_WIND_UNIT]): _wind_unit_selector(defaults[CONF_WIND_UNIT]),
+                vol.Optional(CONF_MAX_STALENESS, default=defaults[CONF_MAX_STALENESS]): _max_staleness_selector(defaults[CONF_MAX_STALENESS]),
+                vol.Optional(CONF_CALLS_PER_MINUTE, default=defaults[CONF_CALLS_PER_MINUTE]): _calls_selector(3000),
+                vol.Optional(CONF_CALLS_PER_DAY, default=defaults[CONF_CALLS_PER_DAY]): _calls_selector(1000000),
+                vol.Optional(CONF_WAYPOINTS, default=defaults[CONF_WAYPOINTS]): _waypoints_selector(),
+                vol.Optional(CONF_SCHEDULE, default=defaults[CONF_SCHEDULE]): _schedule_selector(),
             }
         )
         return self.async_show_form(step_id="owm", data_schema=schema, errors=errors)
@@ -381,12 +503,13 @@ class FahrradwetterOptionsFlowHandler(config_entries.OptionsFlow):
         defaults = _defaults(self._opts)
 
         if user_input is not None:
-            if not user_input.get(CONF_API_KEY):
-                errors[CONF_API_KEY] = "required"
+            _validate_api_key(user_input, errors)
             if user_input.get(CONF_LAT) in (None, ""):
                 errors[CONF_LAT] = "required"
             if user_input.get(CONF_LON) in (None, ""):
                 errors[CONF_LON] = "required"
+            _validate_waypoints(user_input, errors)
+            _validate_schedule(user_input, errors)
             if not user_input.get(CONF_LOCAL_TEMP_ENTITY):
                 errors[CONF_LOCAL_TEMP_ENTITY] = "required"
             if not errors:
@@ -396,7 +519,8 @@ class FahrradwetterOptionsFlowHandler(config_entries.OptionsFlow):
 
         schema = vol.Schema(
             {
-                vol.Required(CONF_API_KEY, default=self._current(CONF_API_KEY, "")): _api_key_selector(),
+                vol.Required(CONF_PROVIDER, default=self._current(CONF_PROVIDER, DEFAULT_PROVIDER)): _provider_selector(),
+                vol.Optional(CONF_API_KEY, default=self._current(CONF_API_KEY, "")): _api_key_selector(),
                 vol.Required(CONF_LAT, default=self._current(CONF_LAT, 0.0)): _lat_selector(),
                 vol.Required(CONF_LON, default=self._current(CONF_LON, 0.0)): _lon_selector(),
 
@@ -408,6 +532,11 @@ class FahrradwetterOptionsFlowHandler(config_entries.OptionsFlow):
                 vol.Optional(CONF_TOMORROW_TIME_2, default=defaults[CONF_TOMORROW_TIME_2]): selector.TimeSelector(),
                 vol.Optional(CONF_UPDATE_INTERVAL, default=defaults[CONF_UPDATE_INTERVAL]): _update_interval_selector(defaults[CONF_UPDATE_INTERVAL]),
                 vol.Optional(CONF_WIND_UNIT, default=defaults[CONF_WIND_UNIT]): _wind_unit_selector(defaults[CONF_WIND_UNIT]),
+                vol.Optional(CONF_MAX_STALENESS, default=defaults[CONF_MAX_STALENESS]): _max_staleness_selector(defaults[CONF_MAX_STALENESS]),
+                vol.Optional(CONF_CALLS_PER_MINUTE, default=defaults[CONF_CALLS_PER_MINUTE]): _calls_selector(3000),
+                vol.Optional(CONF_CALLS_PER_DAY, default=defaults[CONF_CALLS_PER_DAY]): _calls_selector(1000000),
+                vol.Optional(CONF_WAYPOINTS, default=defaults[CONF_WAYPOINTS]): _waypoints_selector(),
+                vol.Optional(CONF_SCHEDULE, default=defaults[CONF_SCHEDULE]): _schedule_selector(),
             }
         )
         return self.async_show_form(step_id="hybrid", data_schema=schema, errors=errors)
@@ -1,7 +1,14 @@
 """Constants for Fahrradwetter integration."""
+from datetime import timedelta
 
 DOMAIN = "fahrradwetter"
 
+# Mode handling
+CONF_MODE = "mode"
+MODE_HYBRID = "hybrid"
+MODE_OWM = "owm"
+MODE_LOCAL = "local"
+
 # OWM / Location
 CONF_API_KEY = "api_key"
 CONF_LAT = "lat"
@@ -18,8 +25,86 @@ CONF_MIN_TEMP = "min_temp"
 CONF_MAX_WIND_KMH = "max_wind_kmh"
 CONF_MAX_RAIN = "max_rain"
 
+# Settings
+CONF_TOMORROW_TIME_1 = "tomorrow_time_1"
+CONF_TOMORROW_TIME_2 = "tomorrow_time_2"
+CONF_UPDATE_INTERVAL = "update_interval"
+CONF_WIND_UNIT = "wind_unit"
+CONF_MAX_STALENESS = "max_staleness"
+CONF_CALLS_PER_MINUTE = "calls_per_minute"
+CONF_CALLS_PER_DAY = "calls_per_day"
+CONF_WAYPOINTS = "waypoints"
+CONF_PROVIDER = "provider"
+CONF_SCHEDULE = "schedule"
+WIND_UNIT_KMH = "kmh"
+WIND_UNIT_MS = "ms"
+
+# Weather data providers (OWM and hybrid mode)
+PROVIDER_OWM_25 = "owm_25"
+PROVIDER_OWM_ONECALL = "owm_onecall"
+PROVIDER_DWD_MOSMIX = "dwd_mosmix"
+
 # Defaults
 DEFAULT_TIMES = ["06:30", "16:00"]
 DEFAULT_MIN_TEMP = 5.0
 DEFAULT_MAX_WIND_KMH = 25.0
-DEFAULT_MAX_RAIN = 0.5
\ No newline at end of file
+DEFAULT_MAX_RAIN = 0.5
+DEFAULT_UPDATE_INTERVAL_MIN = 30
+DEFAULT_MAX_STALENESS_H = 6
+DEFAULT_CALLS_PER_MINUTE = 60
+DEFAULT_CALLS_PER_DAY = 1000
+DEFAULT_PROVIDER = PROVIDER_OWM_25
+
+# hass.data key for the per-API-key quota managers
+DATA_QUOTAS = f"{DOMAIN}_quotas"
+# hass.data key for the provider data shared between entries, and how long
+# a location nobody uses any more is kept
+DATA_HUB = f"{DOMAIN}_hub"
+HUB_IDLE_TTL_SECONDS = 3600
+
+# Persistent cache (HA storage)
+STORAGE_VERSION = 3
+
+# Evaluation slots
+SLOT_NOW = "now"
+SLOT_NEXT_BLOCK = "next_block"
+SLOT_RIDE_WINDOW = "ride_window"
+SLOT_SCHEDULE = "schedule"
+RIDE_WINDOW_TOP_N = 5
+
+# How often OWM recalculates its data; polling faster only repeats it
+OWM_CURRENT_MIN_AGE = timedelta(minutes=10)
+OWM_FORECAST_MIN_AGE = timedelta(hours=1)
+# DWD MOSMIX_S is issued hourly
+DWD_MOSMIX_MIN_AGE = timedelta(hours=1)
+
+# HTTP
+OWM_REQUEST_TIMEOUT = 20
+OWM_REFRESH_TIMEOUT = 25
+# MOSMIX ships all stations in one document: longer download, parse in executor
+DWD_REQUEST_TIMEOUT = 120
+DWD_REFRESH_TIMEOUT = 180
+# Circuit breaker: open after this many refreshes in a row where every leg
+# failed, probe again after the cooldown (doubling up to the maximum)
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_COOLDOWN_SECONDS = 300
+BREAKER_MAX_COOLDOWN_SECONDS = 3600
+
+# Local sensors: coalesce bursts of state changes
+LOCAL_DEBOUNCE_SECONDS = 10
+# Route waypoints: forecast requests in flight at once per entry
+ROUTE_MAX_CONCURRENCY = 4
+
+# Forecast bias correction (hybrid mode): days kept per hour of day, and
+# pairs needed before an hour's correction is applied
+BIAS_WINDOW_DAYS = 30
+BIAS_MIN_SAMPLES = 5
+BIAS_STORAGE_VERSION = 1
+
+# Service fahrradwetter.evaluate: answered from the coordinator snapshot
+SERVICE_EVALUATE = "evaluate"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_QUERIES = "queries"
+ATTR_START = "start"
+ATTR_END = "end"
+EVALUATE_MAX_QUERIES = 200
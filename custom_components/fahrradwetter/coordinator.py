@@ -1,23 +1,62 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import asyncio
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+from functools import partial
+import logging
+import time
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Mapping
+
 import aiohttp
 
-from homeassistant.core import HomeAssistant
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util import dt as dt_util
 
 from .const import (
+    DOMAIN, STORAGE_VERSION,
     CONF_API_KEY, CONF_LAT, CONF_LON,
-    CONF_MODE, MODE_OWM_ONLY, MODE_LOCAL_ONLY, MODE_HYBRID,
+    CONF_MODE, MODE_OWM, MODE_LOCAL, MODE_HYBRID,
     CONF_LOCAL_TEMP_ENTITY, CONF_LOCAL_WIND_ENTITY, CONF_LOCAL_RAIN_ENTITY,
-    CONF_LOCAL_WIND_UNIT, WIND_UNIT_MS, WIND_UNIT_KMH,
-    CONF_TIME_MORNING, CONF_TIME_AFTERNOON,
+    CONF_WIND_UNIT, WIND_UNIT_MS,
+    CONF_TOMORROW_TIME_1, CONF_TOMORROW_TIME_2,
+    CONF_TIMES, CONF_MIN_TEMP, CONF_MAX_WIND_KMH, CONF_MAX_RAIN,
+    DEFAULT_TIMES, DEFAULT_MIN_TEMP, DEFAULT_MAX_WIND_KMH, DEFAULT_MAX_RAIN,
+    SLOT_NOW, SLOT_NEXT_BLOCK, SLOT_RIDE_WINDOW, RIDE_WINDOW_TOP_N,
+    CONF_MAX_STALENESS, DEFAULT_MAX_STALENESS_H,
+    CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL_MIN,
+    CONF_CALLS_PER_MINUTE, CONF_CALLS_PER_DAY,
+    DEFAULT_CALLS_PER_MINUTE, DEFAULT_CALLS_PER_DAY,
+    CONF_WAYPOINTS, ROUTE_MAX_CONCURRENCY, BIAS_STORAGE_VERSION,
+    CONF_SCHEDULE, SLOT_SCHEDULE,
+    CONF_PROVIDER, DEFAULT_PROVIDER,
+    LOCAL_DEBOUNCE_SECONDS,
+)
+from .breaker import CircuitBreaker
+from .evaluation import (
+    EMPTY_SLOT, SlotState, Thresholds, evaluate_block, evaluate_now, evaluate_windows,
+    find_ride_windows, route_values, tomorrow_slot,
 )
+from .forecast import ForecastSeries, Point
+from .metrics import FahrradwetterMetrics
+from .providers import WeatherProvider, create_provider
+from .quota import ApiQuota, async_get_quota
+from .scheduler import adaptive_interval
 
-OWM_CURRENT_URL = "https://api.openweathermap.org/data/2.5/weather"
-OWM_FORECAST_URL = "https://api.openweathermap.org/data/2.5/forecast"
+if TYPE_CHECKING:
+    from .bias import BiasModel
+    from .hub import ForecastHub, HubKey
+    from .schedule import ScheduleSlot
+
+_LOGGER = logging.getLogger(__name__)
 
 def _is_bad_state(val: str | None) -> bool:
     return val is None or val in ("unknown", "unavailable", "none", "")
@@ -30,29 +69,59 @@ def _to_float(state: str | None, default=0.0) -> float:
     except Exception:
         return default
 
+def _local_hour(ts: int) -> int:
+    return dt_util.as_local(dt_util.utc_from_timestamp(ts)).hour
+
 def _wind_to_kmh(value: float, unit: str) -> float:
     # if local in m/s -> km/h
     if unit == WIND_UNIT_MS:
         return value * 3.6
     return value
 
-def _pick_nearest_forecast_block(forecast_list: list[dict], target_dt: datetime) -> dict | None:
-    if not forecast_list:
+def _retry_after_seconds(value: str | None) -> float | None:
+    # Retry-After is either delta-seconds or an HTTP date
+    if not value:
         return None
-    target_ts = int(target_dt.timestamp())
-    best = None
-    best_diff = None
-    for item in forecast_list:
-        dt_val = item.get("dt")
-        if dt_val is None:
-            continue
-        diff = abs(int(dt_val) - target_ts)
-        if best is None or diff < best_diff:
-            best = item
-            best_diff = diff
-    return best
-
-@dataclass
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - dt_util.utcnow()).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+def _normalize_time(value: Any) -> str | None:
+    # "06:30" (options) or "06:30:00" (TimeSelector) -> "06:30"
+    if not isinstance(value, str):
+        return None
+    try:
+        hh, mm = [int(x) for x in value.split(":")[:2]]
+    except ValueError:
+        return None
+    if not (0 <= hh < 24 and 0 <= mm < 60):
+        return None
+    return f"{hh:02d}:{mm:02d}"
+
+def configured_times(entry_data: Mapping[str, Any]) -> list[str]:
+    raw = entry_data.get(CONF_TIMES)
+    if not raw:
+        raw = [entry_data.get(k) for k in (CONF_TOMORROW_TIME_1, CONF_TOMORROW_TIME_2)]
+    times: list[str] = []
+    for t in raw:
+        norm = _normalize_time(t)
+        if norm and norm not in times:
+            times.append(norm)
+    return times or list(DEFAULT_TIMES)
+
+class RateLimited(UpdateFailed):
+    """The provider answered 429 Too Many Requests."""
+
+    def __init__(self, what: str, retry_after: float | None) -> None:
+        super().__init__(f"{what} HTTP 429")
+        self.retry_after = retry_after
+
+@dataclass(frozen=True)
 class FahrradwetterData:
     now_temp: float | None
     now_wind_kmh: float | None
@@ -60,66 +129,492 @@ class FahrradwetterData:
     now_source_temp: str
     now_source_wind: str
     now_source_rain: str
+    now_desc: str | None = None
 
-    next_block: dict | None
-    tomorrow_morning: dict | None
-    tomorrow_afternoon: dict | None
+    fetched_at: datetime | None = None
+    # Worst case along the route (the entry location's series without waypoints)
+    forecast: ForecastSeries = field(default_factory=ForecastSeries)
+    # Per-point series, entry location first; empty without waypoints
+    route: tuple[ForecastSeries, ...] = ()
+    # Evaluated entity states, keyed by slot ("now", "next_block", "tomorrow_HHMM")
+    slots: Mapping[str, SlotState] = field(default_factory=dict)
+
+    def slot(self, key: str) -> SlotState:
+        return self.slots.get(key, EMPTY_SLOT)
 
 class FahrradwetterCoordinator(DataUpdateCoordinator[FahrradwetterData]):
-    def __init__(self, hass: HomeAssistant, entry_data: dict):
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry):
+        entry_data = {**entry.data, **entry.options}
+        self._base_interval = timedelta(
+            minutes=float(entry_data.get(CONF_UPDATE_INTERVAL) or DEFAULT_UPDATE_INTERVAL_MIN)
+        )
         super().__init__(
             hass,
-            logger=None,
+            logger=_LOGGER,
             name="Fahrradwetter",
-            update_interval=timedelta(minutes=30),
+            update_interval=self._base_interval,
         )
         self.entry_data = entry_data
+        self.entry_id = entry.entry_id
+        self.times = configured_times(self.entry_data)
+        self.thresholds = Thresholds(
+            min_temp=float(self.entry_data.get(CONF_MIN_TEMP, DEFAULT_MIN_TEMP)),
+            max_wind=float(self.entry_data.get(CONF_MAX_WIND_KMH, DEFAULT_MAX_WIND_KMH)),
+            max_rain=float(self.entry_data.get(CONF_MAX_RAIN, DEFAULT_MAX_RAIN)),
+        )
+        # HA's shared session: pooled keep-alive connector with DNS cache,
+        # gzip handled by aiohttp. Owned and closed by HA, never by us.
+        self._session = async_get_clientsession(hass)
+        # Last good data per kind, reused when only one leg fails
+        self._current: dict[str, Any] | None = None
+        self._forecast: ForecastSeries | None = None
+        self.metrics = FahrradwetterMetrics()
+        self._fetched_at: dict[str, float] = {}
+        self._max_staleness = timedelta(
+            hours=float(self.entry_data.get(CONF_MAX_STALENESS, DEFAULT_MAX_STALENESS_H))
+        )
+        self._store: Store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}")
+        self.quota: ApiQuota | None = None
+        if entry_data.get(CONF_API_KEY) and entry_data.get(CONF_MODE, MODE_HYBRID) != MODE_LOCAL:
+            self.quota = async_get_quota(hass, entry_data[CONF_API_KEY])
+            self.quota.register(
+                entry.entry_id,
+                int(entry_data.get(CONF_CALLS_PER_MINUTE) or DEFAULT_CALLS_PER_MINUTE),
+                int(entry_data.get(CONF_CALLS_PER_DAY) or DEFAULT_CALLS_PER_DAY),
+            )
+        # Route waypoints, one extra forecast leg per grid cell ("route:lat,lon")
+        self.route: list[Point] = []
+        if entry_data.get(CONF_MODE, MODE_HYBRID) != MODE_LOCAL and entry_data.get(CONF_WAYPOINTS):
+            # Only entries with waypoints need the route helpers
+            from .route import parse_waypoints, route_points
+
+            try:
+                waypoints = parse_waypoints(entry_data[CONF_WAYPOINTS])
+            except ValueError as err:
+                _LOGGER.warning("Ignoring route waypoints: %s", err)
+                waypoints = []
+            self.route = route_points(entry_data[CONF_LAT], entry_data[CONF_LON], waypoints)
+        self.provider: WeatherProvider | None = None
+        if entry_data.get(CONF_MODE, MODE_HYBRID) != MODE_LOCAL:
+            self.provider = create_provider(hass, entry_data, self._request, self.metrics, self.route)
+            self.metrics.add_endpoints((*self.provider.legs, "route"))
+            self._timeout = aiohttp.ClientTimeout(total=self.provider.request_timeout)
+            self.breaker = CircuitBreaker()
+        self._route_legs: dict[str, Point] = {f"route:{lat},{lon}": (lat, lon) for lat, lon in self.route}
+        # Provider data shared with other entries fetching the same location
+        self.hub: ForecastHub | None = None
+        self._hub_keys: dict[str, HubKey] = {}
+        if self.provider is not None:
+            from .hub import async_get_hub, hub_key
+
+            provider_id = entry_data.get(CONF_PROVIDER) or DEFAULT_PROVIDER
+            api_key = entry_data.get(CONF_API_KEY) or ""
+            self._hub_keys = {
+                name: hub_key(provider_id, api_key, name, entry_data[CONF_LAT], entry_data[CONF_LON])
+                for name in self.provider.legs
+            }
+            for name, (lat, lon) in self._route_legs.items():
+                self._hub_keys[name] = hub_key(provider_id, api_key, "route", lat, lon)
+            self.hub = async_get_hub(hass)
+            self.hub.acquire(self.entry_id, list(self._hub_keys.values()))
+        self._route_forecasts: dict[str, ForecastSeries] = {}
+        self._route_limit = asyncio.Semaphore(ROUTE_MAX_CONCURRENCY)
+        self._merged: tuple[tuple[ForecastSeries, ...], ForecastSeries] | None = None
+        # Weekly ride schedule, evaluated into one slot (plus pinned ones)
+        self.schedule: list[ScheduleSlot] = []
+        if entry_data.get(CONF_MODE, MODE_HYBRID) != MODE_LOCAL and entry_data.get(CONF_SCHEDULE):
+            from .schedule import parse_schedule
+
+            try:
+                self.schedule = parse_schedule(entry_data[CONF_SCHEDULE])
+            except ValueError as err:
+                _LOGGER.warning("Ignoring ride schedule: %s", err)
+        # Forecast bias learned from the local sensors (hybrid mode only)
+        self.bias: BiasModel | None = None
+        self._bias_store: Store | None = None
+        self._corrected: tuple[ForecastSeries, int, ForecastSeries] | None = None
+        if entry_data.get(CONF_MODE, MODE_HYBRID) == MODE_HYBRID:
+            # Only hybrid entries load the bias module
+            from . import bias as bias_mod
+
+            self.bias = bias_mod.BiasModel()
+            self._bias_store = Store(hass, BIAS_STORAGE_VERSION, f"{DOMAIN}.bias.{entry.entry_id}")
+        self._unsub_local: CALLBACK_TYPE | None = None
+        # Slots whose state changed with the pending data; None = notify all
+        self._changed_slots: frozenset[str] | None = None
+        self._notified_fresh: frozenset[str] | None = None
+        self._local_debouncer = Debouncer(
+            hass, _LOGGER, cooldown=LOCAL_DEBOUNCE_SECONDS, immediate=False,
+            function=self._async_refresh_local,
+        )
+
+    @callback
+    def async_track_local_entities(self) -> None:
+        """Re-evaluate "now" whenever a local sensor changes.
+
+        Local readings no longer wait for the OWM poll, and reading them
+        costs no API call. OWM keeps its own refresh schedule.
+        """
+        if self.entry_data.get(CONF_MODE, MODE_HYBRID) == MODE_OWM:
+            return
+        entity_ids = [
+            ent for ent in (
+                self.entry_data.get(CONF_LOCAL_TEMP_ENTITY),
+                self.entry_data.get(CONF_LOCAL_WIND_ENTITY),
+                self.entry_data.get(CONF_LOCAL_RAIN_ENTITY),
+            ) if ent
+        ]
+        if not entity_ids:
+            return
+        self._unsub_local = async_track_state_change_event(
+            self.hass, entity_ids, self._async_local_state_changed
+        )
 
-    async def _fetch_owm_current(self, session: aiohttp.ClientSession) -> dict:
-        params = {
-            "lat": self.entry_data[CONF_LAT],
-            "lon": self.entry_data[CONF_LON],
-            "appid": self.entry_data[CONF_API_KEY],
-            "units": "metric",
-            "lang": "de",
+    @callback
+    def _async_local_state_changed(self, event: Event) -> None:
+        self._local_debouncer.async_schedule_call()
+
+    @callback
+    def _async_refresh_local(self) -> None:
+        if self.data is None:
+            return
+        now_fields, now_slot = self._evaluate_now()
+        data = replace(self.data, **now_fields, slots={**self.data.slots, SLOT_NOW: now_slot})
+        self._track_changes(data)
+        self.data = data
+        self.async_update_listeners()
+
+    def _track_changes(self, new: FahrradwetterData) -> None:
+        """Remember which slots differ from the data currently published."""
+        old = self.data
+        if old is None:
+            self._changed_slots = None
+            return
+        changed = {k for k, slot in new.slots.items() if old.slots.get(k) != slot}
+        changed.update(old.slots.keys() - new.slots.keys())
+        self._changed_slots = frozenset(changed)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify only entities whose slot changed.
+
+        Entities register with their slot as listener context. Listeners
+        without a context, and everyone on an availability change, are
+        always notified. A failed refresh changes no slot, so entities
+        serving data that is still fresh enough are not written again.
+        """
+        changed = self._changed_slots
+        self._changed_slots = frozenset()
+        fresh = self._fresh_kinds()
+        if changed is None or self._notified_fresh != fresh:
+            self._notified_fresh = fresh
+            super().async_update_listeners()
+            return
+        for update_callback, context in list(self._listeners.values()):
+            if context is None or context in changed:
+                update_callback()
+
+    async def async_shutdown(self) -> None:
+        if self._unsub_local is not None:
+            self._unsub_local()
+            self._unsub_local = None
+        self._local_debouncer.async_shutdown()
+        if self.quota is not None:
+            self.quota.unregister(self.entry_id)
+        if self.hub is not None:
+            self.hub.release(self.entry_id, list(self._hub_keys.values()), dt_util.utcnow().timestamp())
+        await super().async_shutdown()
+
+    async def async_restore_cache(self) -> bool:
+        """Serve the last good payload from disk, if it is not too old.
+
+        Returns True when data was restored; the caller then revalidates in
+        the background instead of blocking setup on OWM.
+        """
+        if self.entry_data.get(CONF_MODE, MODE_HYBRID) == MODE_LOCAL:
+            return False
+        try:
+            cached = await self._store.async_load()
+        except Exception as err:  # corrupt file or unknown schema version
+            _LOGGER.warning("Ignoring Fahrradwetter cache: %s", err)
+            return False
+        if not cached:
+            return False
+
+        try:
+            self._current = cached.get("current")
+            if cached.get("forecast"):
+                self._forecast = ForecastSeries.from_dict(
+                    cached["forecast"], dt_util.utcnow().timestamp()
+                )
+            self._fetched_at = dict(cached.get("fetched_at") or {})
+            for name, series in (cached.get("route") or {}).items():
+                if name in self._route_legs:
+                    self._route_forecasts[name] = ForecastSeries.from_dict(
+                        series, dt_util.utcnow().timestamp()
+                    )
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.warning("Ignoring Fahrradwetter cache: %s", err)
+            self._current = self._forecast = None
+            self._route_forecasts = {}
+            return False
+        self._drop_stale()
+        if self._current is None and self._forecast is None:
+            return False
+
+        self.data = self._build_data()
+        self.last_update_success = True
+        return True
+
+    async def async_load_bias(self) -> None:
+        """Restore the learned forecast bias from storage."""
+        if self._bias_store is None:
+            return
+        try:
+            stored = await self._bias_store.async_load()
+            if stored:
+                self.bias = type(self.bias).from_dict(stored)
+        except Exception as err:  # corrupt file: start learning from scratch
+            _LOGGER.warning("Ignoring stored Fahrradwetter bias: %s", err)
+
+    @property
+    def hub_keys(self) -> Mapping[str, HubKey]:
+        """Hub key per leg (route legs included); empty without a provider."""
+        return MappingProxyType(self._hub_keys)
+
+    def data_age(self, leg: str) -> timedelta | None:
+        """Age of the payload currently served for "current" or "forecast"."""
+        fetched = self._fetched_at.get(leg)
+        if fetched is None:
+            return None
+        return dt_util.utcnow() - dt_util.utc_from_timestamp(fetched)
+
+    def data_fresh(self, kind: str) -> bool:
+        """Whether entities built on "current" or "forecast" data are available.
+
+        Availability follows the age of the last good payload against the
+        configured maximum staleness, not the outcome of the last refresh:
+        a short outage keeps serving cached data.
+        """
+        if self.data is None:
+            return False
+        if self.provider is None:
+            return True
+        if kind == "current" and self.entry_data.get(CONF_MODE, MODE_HYBRID) == MODE_HYBRID \
+                and self.entry_data.get(CONF_LOCAL_TEMP_ENTITY):
+            # "Now" is read from the local sensors
+            return True
+        age = self.data_age(kind)
+        return age is not None and age <= self._max_staleness
+
+    def _fresh_kinds(self) -> frozenset[str]:
+        return frozenset(kind for kind in ("current", "forecast") if self.data_fresh(kind))
+
+    def _drop_stale(self) -> None:
+        """Forget payloads older than the configured maximum staleness."""
+        cutoff = (dt_util.utcnow() - self._max_staleness).timestamp()
+        if self._fetched_at.get("current", 0) < cutoff:
+            self._current = None
+        if self._fetched_at.get("forecast", 0) < cutoff:
+            self._forecast = None
+        for name in list(self._route_forecasts):
+            if self._fetched_at.get(name, 0) < cutoff:
+                del self._route_forecasts[name]
+
+    def _cache_payload(self) -> dict:
+        return {
+            "current": self._current,
+            "forecast": self._forecast.as_dict() if self._forecast is not None else None,
+            "route": {name: series.as_dict() for name, series in self._route_forecasts.items()},
+            "fetched_at": self._fetched_at,
         }
-        async with session.get(OWM_CURRENT_URL, params=params, timeout=20) as resp:
+
+    async def _request(self, url: str, params: Mapping[str, Any], endpoint: str) -> bytes:
+        """GET for the provider: shared session, timing, 429 and status handling."""
+        what = f"{self.provider.name} {endpoint}"
+        start = time.perf_counter()
+        async with self._session.get(url, params=params, timeout=self._timeout) as resp:
+            if resp.status == 429:
+                raise RateLimited(what, _retry_after_seconds(resp.headers.get("Retry-After")))
             if resp.status != 200:
-                raise UpdateFailed(f"OWM current HTTP {resp.status}")
-            return await resp.json()
-
-    async def _fetch_owm_forecast(self, session: aiohttp.ClientSession) -> dict:
-        params = {
-            "lat": self.entry_data[CONF_LAT],
-            "lon": self.entry_data[CONF_LON],
-            "appid": self.entry_data[CONF_API_KEY],
-            "units": "metric",
-            "lang": "de",
+                raise UpdateFailed(f"{what} HTTP {resp.status}")
+            raw = await resp.read()
+        self.metrics.record_fetch(endpoint, time.perf_counter() - start, len(raw))
+        return raw
+
+    async def _fetch_route_forecast(self, point: Point) -> ForecastSeries:
+        # Waypoints share session and quota; the semaphore keeps a long
+        # route from opening all its requests at once
+        async with self._route_limit:
+            return await self.provider.async_fetch_forecast(point, "route")
+
+    async def _fetch_provider(self) -> None:
+        """Fetch all due legs concurrently under one refresh deadline.
+
+        A failed or overrunning leg keeps its last good data, so a fresh
+        forecast is not thrown away because current weather failed (and
+        vice versa). Only if every leg fails is the refresh marked as failed.
+        Legs another entry at the same location fetched recently, or is
+        fetching right now, are taken from the hub without a request.
+        """
+        provider = self.provider
+        now_ts = dt_util.utcnow().timestamp()
+        # leg -> (data kinds it refreshes, min age, coroutine factory)
+        fetchers = {
+            name: (leg.provides, leg.min_age, partial(provider.async_fetch, name))
+            for name, leg in provider.legs.items()
         }
-        async with session.get(OWM_FORECAST_URL, params=params, timeout=20) as resp:
-            if resp.status != 200:
-                raise UpdateFailed(f"OWM forecast HTTP {resp.status}")
-            return await resp.json()
+        for name, point in self._route_legs.items():
+            fetchers[name] = ((name,), provider.forecast_min_age, partial(self._fetch_route_forecast, point))
+        # Skip legs whose data the provider cannot have recalculated since the last fetch
+        due = [
+            name for name, (kinds, min_age, _fetch) in fetchers.items()
+            if now_ts - min(self._fetched_at.get(k, 0) for k in kinds) >= min_age.total_seconds()
+        ]
+        # Legs skipped by breaker or quota are neither hits nor misses
+        self.metrics.cache_hits += len(fetchers) - len(due)
+        hub = self.hub
+        shared: dict[str, tuple[Any, float]] = {}
+        joined: dict[str, asyncio.Future] = {}
+        for name in due:
+            key = self._hub_keys[name]
+            if (hit := hub.fresh(key, fetchers[name][1].total_seconds(), now_ts)) is not None:
+                shared[name] = hit
+            elif (in_flight := hub.in_flight(key)) is not None:
+                joined[name] = in_flight
+        due = [name for name in due if name not in shared and name not in joined]
+        breaker = self.breaker
+        allowed_calls = breaker.allowed_calls(now_ts) if due else None
+        if allowed_calls is not None:
+            # Circuit open: no requests until the cooldown is over, then one probe
+            _LOGGER.debug(
+                "%s circuit %s: skipping %s (retry in %.0fs)", provider.name, breaker.state,
+                due[allowed_calls:], breaker.retry_in(now_ts),
+            )
+            due = due[:allowed_calls]
+        quota = self.quota
+        if quota is not None and due:
+            # Over budget or backing off: serve the cached payloads instead
+            allowed = [name for name in due if quota.try_acquire(now_ts)]
+            if len(allowed) < len(due):
+                _LOGGER.debug(
+                    "%s quota: skipping %s (backoff %.0fs, %d calls today)", provider.name,
+                    [n for n in due if n not in allowed],
+                    quota.backoff_remaining(now_ts), quota.calls_today(now_ts),
+                )
+            due = allowed
+        # Shielded: giving up on a leg must not cancel it for other entries
+        legs = {
+            name: asyncio.ensure_future(asyncio.shield(
+                hub.fetch(self._hub_keys[name], fetchers[name][2], now_ts)
+            ))
+            for name in due
+        }
+        legs.update({name: asyncio.ensure_future(asyncio.shield(fut)) for name, fut in joined.items()})
+        self.metrics.cache_misses += len(due)
+        self.metrics.shared_hits += len(shared) + len(joined)
+        for name, (result, fetched_at) in shared.items():
+            self._apply_leg(name, result, fetched_at, fetchers[name][0])
+        if not legs:
+            if allowed_calls:
+                breaker.release_probe()
+            if self._current is None and self._forecast is None:
+                raise UpdateFailed(f"{provider.name} quota exhausted, backing off or circuit open, no cached data")
+            if shared:
+                self._store.async_delay_save(self._cache_payload, 10)
+            return
+        try:
+            _done, pending = await asyncio.wait(legs.values(), timeout=provider.refresh_timeout)
+        except asyncio.CancelledError:
+            for task in legs.values():
+                task.cancel()
+            if allowed_calls:
+                # The probe ends without a result: probe again next refresh
+                breaker.release_probe()
+            raise
+        for task in pending:
+            task.cancel()
+
+        errors: dict[str, str] = {}
+        # Outcome of the requests this entry sent itself (not joined ones),
+        # reported to the quota once per refresh: per leg, N failing
+        # waypoints would multiply the backoff N times in one outage
+        sent_ok = sent_failed = False
+        rate_limited: list[float | None] = []
+        for name, task in legs.items():
+            endpoint = "route" if name in self._route_legs else name
+            own = name not in joined
+            if task in pending:
+                errors[name] = "timeout"
+                self.metrics.record_error(endpoint)
+                sent_failed |= own
+                continue
+            err = task.exception()
+            if err is not None:
+                errors[name] = str(err) or type(err).__name__
+                self.metrics.record_error(endpoint)
+                if own and isinstance(err, RateLimited):
+                    rate_limited.append(err.retry_after)
+                sent_failed |= own
+                continue
+            sent_ok |= own
+            self._apply_leg(name, task.result(), now_ts, fetchers[name][0])
+        if quota is not None:
+            if rate_limited:
+                known = [r for r in rate_limited if r is not None]
+                quota.record_rate_limited(now_ts, max(known) if known else None)
+            elif sent_ok:
+                quota.record_success()
+            elif sent_failed:
+                quota.record_failure(now_ts)
+
+        self._drop_stale()
+        if len(errors) == len(legs):
+            breaker.record_failure(now_ts)
+            if not shared:
+                raise UpdateFailed(f"{provider.name} refresh failed: {errors}")
+        else:
+            breaker.record_success()
+        if errors:
+            _LOGGER.warning("%s partial refresh, keeping previous data for %s", provider.name, errors)
+        self._store.async_delay_save(self._cache_payload, 10)
+
+    def _apply_leg(self, name: str, result: Any, fetched_at: float, kinds: tuple[str, ...]) -> None:
+        if name in self._route_legs:
+            self._route_forecasts[name] = result
+        else:
+            if result.current is not None:
+                self._current = result.current
+            if result.forecast is not None:
+                self._forecast = result.forecast
+        for kind in kinds:
+            self._fetched_at[kind] = fetched_at
+
+    def _state_of(self, entity_id: str | None) -> str | None:
+        if not entity_id:
+            return None
+        state = self.hass.states.get(entity_id)
+        return state.state if state is not None else None
 
     def _read_local(self) -> tuple[float | None, float | None, float | None, str, str, str]:
         temp_ent = self.entry_data.get(CONF_LOCAL_TEMP_ENTITY)
         wind_ent = self.entry_data.get(CONF_LOCAL_WIND_ENTITY)
         rain_ent = self.entry_data.get(CONF_LOCAL_RAIN_ENTITY)
-        wind_unit = self.entry_data.get(CONF_LOCAL_WIND_UNIT, WIND_UNIT_MS)
+        wind_unit = self.entry_data.get(CONF_WIND_UNIT, WIND_UNIT_MS)
 
         # Temp
-        temp_state = self.hass.states.get(temp_ent).state if temp_ent else None
+        temp_state = self._state_of(temp_ent)
         temp_ok = not _is_bad_state(temp_state)
         temp = _to_float(temp_state, 0.0) if temp_ok else None
 
         # Wind
-        wind_state = self.hass.states.get(wind_ent).state if wind_ent else None
+        wind_state = self._state_of(wind_ent)
         wind_ok = not _is_bad_state(wind_state)
         wind_raw = _to_float(wind_state, 0.0) if wind_ok else None
         wind_kmh = _wind_to_kmh(wind_raw, wind_unit) if wind_raw is not None else None
 
         # Rain
-        rain_state = self.hass.states.get(rain_ent).state if rain_ent else None
+        rain_state = self._state_of(rain_ent)
         rain_ok = not _is_bad_state(rain_state)
         rain = _to_float(rain_state, 0.0) if rain_ok else None
 
@@ -131,41 +626,72 @@ class FahrradwetterCoordinator(DataUpdateCoordinator[FahrradwetterData]):
         )
 
     async def _async_update_data(self) -> FahrradwetterData:
+        if self.entry_data.get(CONF_MODE, MODE_HYBRID) in (MODE_OWM, MODE_HYBRID):
+            await self._fetch_provider()
+            local_now = dt_util.now()
+            self.update_interval = adaptive_interval(
+                local_now, self.times, self._base_interval,
+                [slot.next_at(local_now) for slot in self.schedule],
+            )
+            self._learn_bias(local_now)
+        return self._build_data()
+
+    def _learn_bias(self, local_now: datetime) -> None:
+        """Pair the (uncorrected) forecast for now with the local readings."""
+        if self.bias is None or self._forecast is None:
+            return
+        vals = self._forecast.timeline().at(local_now.timestamp())
+        if vals is None:
+            return
+        temp, wind_kmh, *_rest = self._read_local()
+        hour, day = local_now.hour, local_now.date().toordinal()
+        learned = self.bias.observe("temp", hour, day, vals.temp, temp)
+        if self.bias.observe("wind_ms", hour, day, vals.wind_ms,
+                             wind_kmh / 3.6 if wind_kmh is not None else None):
+            learned = True
+        if learned:
+            self._bias_store.async_delay_save(self.bias.as_dict, 60)
+
+    def _bias_corrected(self, series: ForecastSeries) -> ForecastSeries:
+        """Series with the learned bias, rebuilt when the series or the model changed."""
+        if self.bias is None:
+            return series
+        if self._corrected is not None:
+            source, version, corrected = self._corrected
+            if source is series and version == self.bias.version:
+                return corrected
+        corrected = self.bias.apply(series, _local_hour)
+        self._corrected = (series, self.bias.version, corrected)
+        return corrected
+
+    def _evaluate_now(self) -> tuple[dict[str, Any], SlotState]:
+        """Current values (local and/or OWM current) and the evaluated "now" slot."""
         mode = self.entry_data.get(CONF_MODE, MODE_HYBRID)
 
         local_temp, local_wind, local_rain, src_t, src_w, src_r = self._read_local()
 
-        owm_current = None
-        owm_forecast = None
-
-        if mode in (MODE_OWM_ONLY, MODE_HYBRID):
-            async with aiohttp.ClientSession() as session:
-                owm_current = await self._fetch_owm_current(session)
-                owm_forecast = await self._fetch_owm_forecast(session)
+        owm_current = self._current if mode in (MODE_OWM, MODE_HYBRID) else None
 
         # OWM current parsing (wind is m/s â convert to km/h)
         owm_temp = None
         owm_wind_kmh = None
         owm_rain = None
+        owm_desc = None
         if owm_current:
-            owm_temp = float(owm_current.get("main", {}).get("temp", 0.0))
-            owm_wind_ms = float(owm_current.get("wind", {}).get("speed", 0.0))
-            owm_wind_kmh = owm_wind_ms * 3.6
-            # OWM current rain can be {"1h": x} or absent
-            rain_obj = owm_current.get("rain") or {}
-            if isinstance(rain_obj, dict):
-                owm_rain = float(rain_obj.get("1h", 0.0))
-            else:
-                owm_rain = 0.0
+            owm_temp = owm_current.get("temp")
+            owm_wind_ms = owm_current.get("wind_ms")
+            owm_wind_kmh = owm_wind_ms * 3.6 if owm_wind_ms is not None else None
+            owm_rain = owm_current.get("rain_1h", 0.0)
+            owm_desc = owm_current.get("desc")
 
         # Choose current values
-        if mode == MODE_OWM_ONLY:
+        if mode == MODE_OWM:
             now_temp = owm_temp
             now_wind = owm_wind_kmh
             now_rain = owm_rain
             src_t, src_w, src_r = "owm", "owm", "owm"
 
-        elif mode == MODE_LOCAL_ONLY:
+        elif mode == MODE_LOCAL:
             now_temp = local_temp
             now_wind = local_wind
             now_rain = local_rain
@@ -180,40 +706,99 @@ class FahrradwetterCoordinator(DataUpdateCoordinator[FahrradwetterData]):
             src_w = "local" if local_wind is not None else "owm"
             src_r = "local" if local_rain is not None else "owm"
 
-        # Forecast blocks (OWM only)
-        next_block = None
-        tomorrow_morning = None
-        tomorrow_afternoon = None
-
-        if mode != MODE_LOCAL_ONLY and owm_forecast:
-            lst = owm_forecast.get("list") or []
-            if isinstance(lst, list):
-                # next block = first item after now
-                now_ts = int(dt_util.utcnow().timestamp())
-                after = [it for it in lst if isinstance(it, dict) and it.get("dt", 0) > now_ts]
-                next_block = after[0] if after else None
-
-                # tomorrow times
-                t_m = self.entry_data.get(CONF_TIME_MORNING, "06:30")
-                t_a = self.entry_data.get(CONF_TIME_AFTERNOON, "16:00")
-
-                def _tomorrow_at(hhmm: str) -> datetime:
-                    hh, mm = [int(x) for x in hhmm.split(":")]
-                    local_now = dt_util.now()
-                    t = (local_now + timedelta(days=1)).replace(hour=hh, minute=mm, second=0, microsecond=0)
-                    return dt_util.as_utc(t)
-
-                tomorrow_morning = _pick_nearest_forecast_block(lst, _tomorrow_at(t_m))
-                tomorrow_afternoon = _pick_nearest_forecast_block(lst, _tomorrow_at(t_a))
-
-        return FahrradwetterData(
-            now_temp=now_temp,
-            now_wind_kmh=now_wind,
-            now_rain=now_rain,
-            now_source_temp=src_t,
-            now_source_wind=src_w,
-            now_source_rain=src_r,
-            next_block=next_block,
-            tomorrow_morning=tomorrow_morning,
-            tomorrow_afternoon=tomorrow_afternoon,
+        now_desc = owm_desc if mode != MODE_LOCAL else None
+        now_slot = evaluate_now(
+            now_temp, now_wind, now_rain, now_desc, self.thresholds,
+            source={"temp": src_t, "wind": src_w, "rain": src_r},
+        )
+        now_fields = {
+            "now_temp": now_temp,
+            "now_wind_kmh": now_wind,
+            "now_rain": now_rain,
+            "now_source_temp": src_t,
+            "now_source_wind": src_w,
+            "now_source_rain": src_r,
+            "now_desc": now_desc,
+        }
+        return now_fields, now_slot
+
+    def _worst_case(self, route: tuple[ForecastSeries, ...]) -> ForecastSeries:
+        """Worst-case series, rebuilt only when one of the point series changed."""
+        if self._merged is not None:
+            sources, merged = self._merged
+            if len(sources) == len(route) and all(a is b for a, b in zip(sources, route)):
+                return merged
+        from .route import worst_case_series
+
+        merged = worst_case_series(list(route))
+        self._merged = (route, merged)
+        return merged
+
+    def _route_attrs(self, route: tuple[ForecastSeries, ...], lookup) -> dict[str, Any]:
+        if not route:
+            return {}
+        return {"route": route_values([lookup(series) for series in route], self.thresholds)}
+
+    def _build_data(self) -> FahrradwetterData:
+        start = time.perf_counter()
+        mode = self.entry_data.get(CONF_MODE, MODE_HYBRID)
+        local_now = dt_util.now()
+
+        # Forecast series (OWM only), without blocks that have passed since
+        forecast = ForecastSeries()
+        route: tuple[ForecastSeries, ...] = ()
+        if mode in (MODE_OWM, MODE_HYBRID) and self._forecast is not None:
+            now_ts = local_now.timestamp()
+            self._forecast = self._forecast.trimmed(now_ts)
+            # Only the entry location has local sensors to learn a bias from
+            forecast = self._bias_corrected(self._forecast)
+            if self._route_forecasts:
+                for name, series in self._route_forecasts.items():
+                    self._route_forecasts[name] = series.trimmed(now_ts)
+                route = (forecast, *self._route_forecasts.values())
+                forecast = self._worst_case(route)
+
+        fetched_at = (
+            dt_util.utc_from_timestamp(self._fetched_at["forecast"])
+            if "forecast" in self._fetched_at else None
+        )
+
+        # Evaluate every slot once; entities only read the result
+        th = self.thresholds
+        now_fields, now_slot = self._evaluate_now()
+        slots: dict[str, SlotState] = {SLOT_NOW: now_slot}
+        slots[SLOT_NEXT_BLOCK] = evaluate_block(
+            forecast.next_block(local_now.timestamp()), th,
+            **self._route_attrs(route, lambda s: s.next_block(local_now.timestamp())),
+        )
+        # Ride windows and ride times read the interpolated timeline instead
+        # of snapping to a 3h block; it is built once per series and shared
+        # via the snapshot
+        timeline = forecast.timeline()
+        slots[SLOT_RIDE_WINDOW] = evaluate_windows(
+            find_ride_windows(timeline, th, local_now.timestamp()), RIDE_WINDOW_TOP_N
+        )
+        tomorrow = local_now + timedelta(days=1)
+        for t in self.times:
+            hh, mm = [int(x) for x in t.split(":")]
+            target = tomorrow.replace(hour=hh, minute=mm, second=0, microsecond=0)
+            slots[tomorrow_slot(t)] = evaluate_block(
+                timeline.at(target.timestamp()), th, target=target.isoformat(),
+                **self._route_attrs(route, lambda s: s.timeline().at(target.timestamp())),
+            )
+        if self.schedule:
+            from .schedule import evaluate_schedule
+
+            slots[SLOT_SCHEDULE], pinned = evaluate_schedule(self.schedule, timeline, th, local_now)
+            slots.update(pinned)
+
+        data = FahrradwetterData(
+            **now_fields,
+            fetched_at=fetched_at,
+            forecast=forecast,
+            route=route,
+            slots=slots,
         )
+        self._track_changes(data)
+        self.metrics.evaluation_ms = (time.perf_counter() - start) * 1000
+        return data
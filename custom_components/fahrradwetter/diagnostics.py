@@ -0,0 +1,67 @@
+"""Diagnostics support for Fahrradwetter."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import CONF_API_KEY, CONF_LAT, CONF_LON, CONF_WAYPOINTS, DOMAIN
+from .coordinator import FahrradwetterCoordinator
+
+TO_REDACT = {CONF_API_KEY, CONF_LAT, CONF_LON, CONF_WAYPOINTS}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    coordinator: FahrradwetterCoordinator = hass.data[DOMAIN][entry.entry_id]
+    data = coordinator.data
+    quota = coordinator.quota
+
+    def _age_s(leg: str) -> float | None:
+        age = coordinator.data_age(leg)
+        return round(age.total_seconds(), 1) if age is not None else None
+
+    return {
+        "entry": {
+            "title": entry.title,
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": async_redact_data(dict(entry.options), TO_REDACT),
+        },
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "provider": coordinator.provider.name if coordinator.provider else None,
+            "update_interval_s": (
+                coordinator.update_interval.total_seconds() if coordinator.update_interval else None
+            ),
+            "times": coordinator.times,
+            # Volatile metadata, not part of the entity attributes
+            "fetched_at": data.fetched_at.isoformat() if data and data.fetched_at else None,
+            "data_age_s": {"current": _age_s("current"), "forecast": _age_s("forecast")},
+            "data_fresh": {"current": coordinator.data_fresh("current"),
+                           "forecast": coordinator.data_fresh("forecast")},
+            "forecast_blocks": len(data.forecast) if data else 0,
+            "route_points": len(coordinator.route),
+        },
+        "metrics": coordinator.metrics.as_dict(),
+        "quota": {
+            "calls_today": quota.calls_today(dt_util.utcnow().timestamp()),
+            "per_minute": quota.per_minute,
+            "per_day": quota.per_day,
+            "backoff_remaining_s": round(quota.backoff_remaining(dt_util.utcnow().timestamp()), 1),
+        } if quota is not None else None,
+        # Only counts: hub keys carry the API key and location
+        "hub": {
+            "legs": len(coordinator.hub_keys),
+            "shared_with_other_entries": sum(
+                1 for key in coordinator.hub_keys.values() if coordinator.hub.users(key) > 1
+            ),
+            "locations_total": len(coordinator.hub),
+        } if coordinator.hub is not None else None,
+        "circuit_breaker": (
+            coordinator.breaker.as_dict(dt_util.utcnow().timestamp()) if coordinator.provider else None
+        ),
+        "bias": coordinator.bias.summary() if coordinator.bias is not None else None,
+        "slots": {k: dict(v.attributes) for k, v in data.slots.items()} if data else {},
+    }
@@ -0,0 +1,211 @@
+"""Entity state evaluation for Fahrradwetter."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from types import MappingProxyType
+from typing import Any, Mapping
+
+from .forecast import BlockValues, ForecastTimeline
+
+_NOT_OK: Mapping[str, Any] = MappingProxyType({"ok": False})
+
+
+def ms_to_kmh(ms: float | None) -> float | None:
+    if ms is None:
+        return None
+    try:
+        return float(ms) * 3.6
+    except Exception:
+        return None
+
+def ok_eval(temp: float | None, wind_kmh: float | None, rain: float | None,
+            min_temp: float, max_wind: float, max_rain: float) -> bool:
+    if temp is None or wind_kmh is None or rain is None:
+        return False
+    return (temp > min_temp) and (wind_kmh < max_wind) and (rain <= max_rain)
+
+def tomorrow_slot(time_str: str) -> str:
+    return f"tomorrow_{time_str.replace(':', '')}"
+
+def schedule_slot(key: str) -> str:
+    """Coordinator slot of a pinned schedule entry."""
+    return f"schedule_{key}"
+
+
+@dataclass(frozen=True, slots=True)
+class Thresholds:
+    min_temp: float
+    max_wind: float
+    max_rain: float
+
+    def ok(self, temp: float | None, wind_kmh: float | None, rain: float | None) -> bool:
+        return ok_eval(temp, wind_kmh, rain, self.min_temp, self.max_wind, self.max_rain)
+
+
+@dataclass(frozen=True, slots=True)
+class SlotState:
+    """Evaluated state of one slot (now, next block, a ride time)."""
+
+    value: float | datetime | None
+    ok: bool
+    attributes: Mapping[str, Any]
+
+
+EMPTY_SLOT = SlotState(None, False, _NOT_OK)
+
+
+def evaluate_block(vals: BlockValues | None, thresholds: Thresholds,
+                   **extra: Any) -> SlotState:
+    if vals is None:
+        return EMPTY_SLOT
+    wind_kmh = ms_to_kmh(vals.wind_ms)
+    ok = thresholds.ok(vals.temp, wind_kmh, vals.rain)
+    return SlotState(vals.temp, ok, MappingProxyType({
+        **extra,
+        "dt": vals.dt,
+        "wind": vals.wind_ms,
+        "wind_kmh": wind_kmh,
+        "rain": vals.rain,
+        "wetter": vals.desc,
+        "ok": ok,
+    }))
+
+def route_values(points: list[BlockValues | None], thresholds: Thresholds) -> list[dict[str, Any]]:
+    """Per-point values along the route; point 0 is the entry location."""
+    values = []
+    for i, vals in enumerate(points):
+        if vals is None:
+            values.append({"point": i, "ok": None})
+            continue
+        wind_kmh = ms_to_kmh(vals.wind_ms)
+        values.append({
+            "point": i,
+            "temp": vals.temp,
+            "wind_kmh": wind_kmh,
+            "rain": vals.rain,
+            "ok": thresholds.ok(vals.temp, wind_kmh, vals.rain),
+        })
+    return values
+
+def evaluate_range(timeline: ForecastTimeline, thresholds: Thresholds,
+                   start_ts: float, end_ts: float) -> dict[str, Any]:
+    """Thresholds over every timeline step in [start_ts, end_ts).
+
+    Step i stands for [t_i, t_i + step), like in find_ride_windows. ok is
+    True only if the whole range lies within the forecast horizon and every
+    step passes; None if no step of the range is covered. A point query
+    (end_ts == start_ts) reads the step containing start_ts.
+    """
+    step = timeline.step
+    first = max(0, int((start_ts - timeline.start) // step))
+    last = min(len(timeline), -int(-(end_ts - timeline.start) // step)) - 1
+    covered = timeline.start <= start_ts and end_ts <= timeline.start + len(timeline) * step
+    if end_ts <= start_ts or first > last:
+        # Point query, or a range outside the horizon
+        i = timeline.index(start_ts) if end_ts <= start_ts else None
+        if i is None:
+            return {"ok": None, "covered": False, "steps": 0}
+        first = last = i
+        covered = True
+    ok = True
+    first_fail: int | None = None
+    min_temp = max_wind = max_rain = None
+    for i in range(first, last + 1):
+        vals = timeline.values(i)
+        wind_kmh = ms_to_kmh(vals.wind_ms)
+        if not thresholds.ok(vals.temp, wind_kmh, vals.rain):
+            ok = False
+            if first_fail is None:
+                first_fail = vals.dt
+        if vals.temp is not None:
+            min_temp = vals.temp if min_temp is None else min(min_temp, vals.temp)
+        if wind_kmh is not None:
+            max_wind = wind_kmh if max_wind is None else max(max_wind, wind_kmh)
+        max_rain = vals.rain if max_rain is None else max(max_rain, vals.rain)
+    return {
+        "ok": ok and covered,
+        "covered": covered,
+        "steps": last - first + 1,
+        "min_temp": round(min_temp, 1) if min_temp is not None else None,
+        "max_wind_kmh": round(max_wind, 1) if max_wind is not None else None,
+        "max_rain": max_rain,
+        "first_fail": _iso(first_fail) if first_fail is not None else None,
+    }
+
+def evaluate_now(temp: float | None, wind_kmh: float | None, rain: float | None,
+                 desc: str | None, thresholds: Thresholds,
+                 source: Mapping[str, str]) -> SlotState:
+    rain = rain or 0.0
+    ok = thresholds.ok(temp, wind_kmh, rain)
+    return SlotState(temp, ok, MappingProxyType({
+        "source": source,
+        "wind": wind_kmh / 3.6 if wind_kmh is not None else None,
+        "wind_kmh": wind_kmh,
+        "rain": rain,
+        "wetter": desc,
+        "ok": ok,
+    }))
+
+
+@dataclass(frozen=True, slots=True)
+class RideWindow:
+    """Contiguous run of forecast blocks that pass the thresholds."""
+
+    start: int
+    end: int
+
+    @property
+    def duration_h(self) -> float:
+        return (self.end - self.start) / 3600
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "start": _iso(self.start),
+            "end": _iso(self.end),
+            "duration_h": self.duration_h,
+        }
+
+
+def _iso(ts: int) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat()
+
+def find_ride_windows(timeline: ForecastTimeline, thresholds: Thresholds, now_ts: float) -> list[RideWindow]:
+    """All OK windows over the forecast horizon, in one pass over the timeline.
+
+    Step i stands for [t_i, t_i + step), the convention evaluate_range
+    uses, so a window is OK there as well as for the ride-time slots.
+    Steps that already ended are ignored.
+    """
+    windows: list[RideWindow] = []
+    start = None
+    first = max(0, int((now_ts - timeline.start) // timeline.step))
+    for i in range(first, len(timeline)):
+        vals = timeline.values(i)
+        if thresholds.ok(vals.temp, ms_to_kmh(vals.wind_ms), vals.rain):
+            if start is None:
+                start = vals.dt
+        elif start is not None:
+            windows.append(RideWindow(start, vals.dt))
+            start = None
+    if start is not None:
+        windows.append(RideWindow(start, timeline.start + len(timeline) * timeline.step))
+    return windows
+
+def evaluate_windows(windows: list[RideWindow], top_n: int) -> SlotState:
+    """Next window as state; the longest top_n windows as attributes."""
+    if not windows:
+        return SlotState(None, False, MappingProxyType({"ok": False, "windows": []}))
+    nxt = windows[0]
+    top = sorted(windows, key=lambda w: (-(w.end - w.start), w.start))[:top_n]
+    return SlotState(
+        datetime.fromtimestamp(nxt.start, timezone.utc),
+        True,
+        MappingProxyType({
+            "end": _iso(nxt.end),
+            "duration_h": nxt.duration_h,
+            "count": len(windows),
+            "windows": [w.as_dict() for w in top],
+            "ok": True,
+        }),
+    )
@@ -0,0 +1,362 @@
+"""Forecast storage and lookup helpers for Fahrradwetter."""
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+import math
+import sys
+from typing import Any, NamedTuple
+
+# OWM 2.5 forecast resolution (the default block length of a series)
+BLOCK_SECONDS = 3 * 3600
+# OWM One Call hourly forecast
+HOURLY_SECONDS = 3600
+# Resolution of the interpolated timeline used for arbitrary target times
+TIMELINE_STEP_SECONDS = 15 * 60
+# Forecast rain is kept in mm per 3 h for every provider: max_rain has
+# always been compared against OWM 2.5's 3h amounts, so hourly amounts are
+# scaled to the same rate instead of making the threshold 3x more lenient
+RAIN_REFERENCE_SECONDS = BLOCK_SECONDS
+# Two decimals are ~1 km, finer than OWM's own grid: points closer than
+# that would return the same forecast and only cost another call.
+GRID_DECIMALS = 2
+
+Point = tuple[float, float]
+
+_NAN = float("nan")
+
+
+def grid_key(lat: float, lon: float) -> Point:
+    """Grid cell of a location; one forecast covers the whole cell."""
+    return (round(float(lat), GRID_DECIMALS), round(float(lon), GRID_DECIMALS))
+
+def rain_to_reference(amount: float, step: int) -> float:
+    """Rain amount of a step-long block as mm per RAIN_REFERENCE_SECONDS."""
+    return amount * RAIN_REFERENCE_SECONDS / step
+
+def _float_or_nan(v: Any) -> float:
+    try:
+        if v is None:
+            return _NAN
+        return float(v)
+    except (TypeError, ValueError):
+        return _NAN
+
+def _none_if_nan(v: float) -> float | None:
+    return None if math.isnan(v) else v
+
+
+def _first_description(weather: Any) -> str | None:
+    if isinstance(weather, list) and weather and isinstance(weather[0], dict):
+        desc = weather[0].get("description")
+        if isinstance(desc, str):
+            return sys.intern(desc)
+    return None
+
+def project_current(payload: Any) -> dict[str, Any]:
+    """Reduce an OWM current-weather response to the fields we read.
+
+    Everything else (coord, sys, clouds, ...) is dropped right after decode.
+    """
+    if not isinstance(payload, dict):
+        return {}
+    rain = payload.get("rain")
+    return {
+        "dt": payload.get("dt"),
+        "temp": _none_if_nan(_float_or_nan((payload.get("main") or {}).get("temp"))),
+        "wind_ms": _none_if_nan(_float_or_nan((payload.get("wind") or {}).get("speed"))),
+        "rain_1h": (
+            _none_if_nan(_float_or_nan(rain.get("1h"))) or 0.0
+            if isinstance(rain, dict) else 0.0
+        ),
+        "desc": _first_description(payload.get("weather")),
+    }
+
+
+def project_onecall_current(payload: Any) -> dict[str, Any]:
+    """Same fields as project_current(), from a One Call response."""
+    current = payload.get("current") if isinstance(payload, dict) else None
+    if not isinstance(current, dict):
+        return {}
+    rain = current.get("rain")
+    return {
+        "dt": current.get("dt"),
+        "temp": _none_if_nan(_float_or_nan(current.get("temp"))),
+        "wind_ms": _none_if_nan(_float_or_nan(current.get("wind_speed"))),
+        "rain_1h": (
+            _none_if_nan(_float_or_nan(rain.get("1h"))) or 0.0
+            if isinstance(rain, dict) else 0.0
+        ),
+        "desc": _first_description(current.get("weather")),
+    }
+
+
+class BlockValues(NamedTuple):
+    dt: int
+    temp: float | None
+    wind_ms: float | None
+    # Amount over the block (3h for OWM 2.5, 1h for hourly data)
+    rain: float
+    desc: str | None
+
+
+class ForecastSeries:
+    """Parsed forecast as parallel, time-sorted columns.
+
+    Built once per forecast fetch from the provider payload; the raw JSON is
+    not kept. Entities share one series through the coordinator data, so
+    next/closest block lookups are O(log n) bisects instead of a scan per
+    property call. ``step`` is the block length in seconds; rain is the
+    amount over the block ending at its timestamp.
+    """
+
+    __slots__ = ("step", "timestamps", "temp", "wind_ms", "rain", "desc_idx", "descriptions", "_timeline")
+
+    def __init__(self, step: int = BLOCK_SECONDS) -> None:
+        self.step = step
+        self.timestamps = array("q")
+        self.temp = array("d")
+        self.wind_ms = array("d")
+        self.rain = array("d")
+        self.desc_idx = array("h")
+        self.descriptions: tuple[str, ...] = ()
+        self._timeline: ForecastTimeline | None = None
+
+    @classmethod
+    def from_owm_payload(cls, payload: Any, now_ts: float | None = None) -> ForecastSeries:
+        lst = payload.get("list") if isinstance(payload, dict) else None
+        return cls.from_owm(lst if isinstance(lst, list) else [], now_ts)
+
+    @classmethod
+    def from_owm(cls, forecast_list: list[dict[str, Any]] | None,
+                 now_ts: float | None = None) -> ForecastSeries:
+        """Parse the OWM forecast "list", dropping blocks already in the past."""
+        rows: list[tuple[int, float, float, float, str | None]] = []
+        for b in forecast_list or []:
+            if not isinstance(b, dict):
+                continue
+            try:
+                dt = int(b["dt"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if now_ts is not None and dt <= now_ts - BLOCK_SECONDS:
+                continue
+            r = b.get("rain") or {}
+            rain = _float_or_nan(r.get("3h")) if isinstance(r, dict) else _NAN
+            rows.append((
+                dt,
+                _float_or_nan((b.get("main") or {}).get("temp")),
+                _float_or_nan((b.get("wind") or {}).get("speed")),
+                0.0 if math.isnan(rain) else rain,
+                _first_description(b.get("weather")),
+            ))
+        rows.sort(key=lambda row: row[0])
+        return cls.from_rows(rows)
+
+    @classmethod
+    def from_onecall_payload(cls, payload: Any, now_ts: float | None = None) -> ForecastSeries:
+        """Parse the "hourly" list of an OWM One Call response."""
+        hourly = payload.get("hourly") if isinstance(payload, dict) else None
+        rows: list[tuple[int, float, float, float, str | None]] = []
+        for h in hourly if isinstance(hourly, list) else []:
+            if not isinstance(h, dict):
+                continue
+            try:
+                dt = int(h["dt"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if now_ts is not None and dt <= now_ts - HOURLY_SECONDS:
+                continue
+            r = h.get("rain") or {}
+            rain = _float_or_nan(r.get("1h")) if isinstance(r, dict) else _NAN
+            rows.append((
+                dt,
+                _float_or_nan(h.get("temp")),
+                _float_or_nan(h.get("wind_speed")),
+                0.0 if math.isnan(rain) else rain_to_reference(rain, HOURLY_SECONDS),
+                _first_description(h.get("weather")),
+            ))
+        rows.sort(key=lambda row: row[0])
+        return cls.from_rows(rows, HOURLY_SECONDS)
+
+    @classmethod
+    def from_rows(cls, rows: list[tuple[int, float, float, float, str | None]],
+                  step: int = BLOCK_SECONDS) -> ForecastSeries:
+        """Series from time-sorted (dt, temp, wind_ms, rain, desc) rows."""
+        series = cls(step)
+        descriptions: dict[str, int] = {}
+        for dt, temp, wind_ms, rain, desc in rows:
+            series.timestamps.append(dt)
+            series.temp.append(temp)
+            series.wind_ms.append(wind_ms)
+            series.rain.append(rain)
+            if desc is None:
+                series.desc_idx.append(-1)
+            else:
+                series.desc_idx.append(descriptions.setdefault(desc, len(descriptions)))
+        series.descriptions = tuple(descriptions)
+        return series
+
+    def as_dict(self) -> dict[str, Any]:
+        """JSON-serialisable form for HA storage."""
+        return {
+            "step": self.step,
+            "dt": list(self.timestamps),
+            "temp": [_none_if_nan(v) for v in self.temp],
+            "wind_ms": [_none_if_nan(v) for v in self.wind_ms],
+            "rain": list(self.rain),
+            "desc_idx": list(self.desc_idx),
+            "descriptions": list(self.descriptions),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any], now_ts: float | None = None) -> ForecastSeries:
+        descriptions = data.get("descriptions") or []
+        step = int(data.get("step") or BLOCK_SECONDS)
+        rows = [
+            (int(dt), _float_or_nan(temp), _float_or_nan(wind), float(rain or 0.0),
+             descriptions[idx] if 0 <= idx < len(descriptions) else None)
+            for dt, temp, wind, rain, idx in zip(
+                data["dt"], data["temp"], data["wind_ms"], data["rain"], data["desc_idx"]
+            )
+            if now_ts is None or int(dt) > now_ts - step
+        ]
+        return cls.from_rows(rows, step)
+
+    def trimmed(self, now_ts: float) -> ForecastSeries:
+        """Series without blocks in the past (self if nothing to drop)."""
+        i = bisect_right(self.timestamps, now_ts - self.step)
+        if i == 0:
+            return self
+        series = ForecastSeries(self.step)
+        series.timestamps = self.timestamps[i:]
+        series.temp = self.temp[i:]
+        series.wind_ms = self.wind_ms[i:]
+        series.rain = self.rain[i:]
+        series.desc_idx = self.desc_idx[i:]
+        series.descriptions = self.descriptions
+        return series
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def timeline(self) -> ForecastTimeline:
+        """Interpolated timeline of this series, built on first use."""
+        if self._timeline is None:
+            self._timeline = ForecastTimeline.from_series(self)
+        return self._timeline
+
+    def values(self, i: int) -> BlockValues:
+        idx = self.desc_idx[i]
+        return BlockValues(
+            self.timestamps[i],
+            _none_if_nan(self.temp[i]),
+            _none_if_nan(self.wind_ms[i]),
+            self.rain[i],
+            self.descriptions[idx] if idx >= 0 else None,
+        )
+
+    def next_index(self, now_ts: float) -> int | None:
+        """Index of the first block strictly after now_ts."""
+        i = bisect_right(self.timestamps, now_ts)
+        return i if i < len(self.timestamps) else None
+
+    def closest_index(self, target_ts: float) -> int | None:
+        """Index of the block nearest to target_ts; on a tie the earlier wins."""
+        ts = self.timestamps
+        if not ts:
+            return None
+        i = bisect_left(ts, target_ts)
+        if i == 0:
+            return 0
+        if i >= len(ts):
+            return len(ts) - 1
+        if target_ts - ts[i - 1] <= ts[i] - target_ts:
+            return i - 1
+        return i
+
+    def next_block(self, now_ts: float) -> BlockValues | None:
+        i = self.next_index(now_ts)
+        return self.values(i) if i is not None else None
+
+    def closest_block(self, target_ts: float) -> BlockValues | None:
+        i = self.closest_index(target_ts)
+        return self.values(i) if i is not None else None
+
+
+class ForecastTimeline:
+    """Forecast resampled to a fixed step for lookups at any target time.
+
+    Temperature and wind are interpolated linearly between blocks. Rain is
+    the amount of the block up to its timestamp, so every step in that
+    window carries the block's amount: the rate is spread evenly and the
+    value stays comparable with the per-block rain threshold. The
+    description is taken from the nearest block.
+
+    Step i stands for [t_i, t_i + step) and the timeline ends at the last
+    block. Lookups are index arithmetic on the step, no search involved.
+    """
+
+    __slots__ = ("start", "step", "temp", "wind_ms", "rain", "desc_idx", "descriptions")
+
+    def __init__(self, start: int = 0, step: int = TIMELINE_STEP_SECONDS) -> None:
+        self.start = start
+        self.step = step
+        self.temp = array("d")
+        self.wind_ms = array("d")
+        self.rain = array("d")
+        self.desc_idx = array("h")
+        self.descriptions: tuple[str, ...] = ()
+
+    @classmethod
+    def from_series(cls, series: ForecastSeries, step: int = TIMELINE_STEP_SECONDS) -> ForecastTimeline:
+        ts = series.timestamps
+        tl = cls(ts[0] if ts else 0, step)
+        tl.descriptions = series.descriptions
+        if not ts:
+            return tl
+        for i in range(len(ts) - 1):
+            t0, t1 = ts[i], ts[i + 1]
+            span = t1 - t0
+            if span <= 0:
+                continue
+            temp0, temp1 = series.temp[i], series.temp[i + 1]
+            wind0, wind1 = series.wind_ms[i], series.wind_ms[i + 1]
+            t = tl.start + -(-(t0 - tl.start) // step) * step
+            while t < t1:
+                frac = (t - t0) / span
+                tl.temp.append(temp0 + (temp1 - temp0) * frac)
+                tl.wind_ms.append(wind0 + (wind1 - wind0) * frac)
+                # Step [t, t + step) lies in block t1's window (t1 - 3h, t1]
+                tl.rain.append(series.rain[i + 1] if t >= t1 - series.step else 0.0)
+                tl.desc_idx.append(series.desc_idx[i] if frac <= 0.5 else series.desc_idx[i + 1])
+                t += step
+        # No step starts at the last block: its rain would be the next
+        # block's, which is beyond the forecast
+        return tl
+
+    def __len__(self) -> int:
+        return len(self.temp)
+
+    def index(self, target_ts: float) -> int | None:
+        """Step containing target_ts, None outside the forecast horizon."""
+        if target_ts < self.start:
+            return None
+        i = int((target_ts - self.start) // self.step)
+        return i if i < len(self.temp) else None
+
+    def values(self, i: int) -> BlockValues:
+        idx = self.desc_idx[i]
+        # Interpolated values carry no more precision than OWM reports
+        temp, wind_ms = self.temp[i], self.wind_ms[i]
+        return BlockValues(
+            self.start + i * self.step,
+            None if math.isnan(temp) else round(temp, 2),
+            None if math.isnan(wind_ms) else round(wind_ms, 2),
+            self.rain[i],
+            self.descriptions[idx] if idx >= 0 else None,
+        )
+
+    def at(self, target_ts: float) -> BlockValues | None:
+        i = self.index(target_ts)
+        return self.values(i) if i is not None else None
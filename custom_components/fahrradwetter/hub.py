@@ -0,0 +1,114 @@
+"""Provider data shared by all entries fetching the same location."""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+from homeassistant.core import HomeAssistant
+
+from .const import DATA_HUB, HUB_IDLE_TTL_SECONDS
+from .forecast import Point, grid_key
+
+# Provider, API key, leg ("route" for waypoints) and grid cell
+HubKey = tuple[str, str, str, Point]
+
+
+def hub_key(provider: str, api_key: str, leg: str, lat: float, lon: float) -> HubKey:
+    return (provider, api_key, leg, grid_key(lat, lon))
+
+
+@dataclass(slots=True)
+class _Shared:
+    result: Any = None
+    fetched_at: float = 0.0
+    in_flight: asyncio.Future | None = None
+    # Entries using this key; counted by entry id so a setup retry that
+    # builds a new coordinator does not leak a reference
+    users: set[str] = field(default_factory=set)
+    idle_since: float | None = None
+
+
+class ForecastHub:
+    """Last result and in-flight request per location, for all entries.
+
+    Two entries at the same place (e.g. riders with different thresholds)
+    fetch once: a result younger than the leg's minimum age is handed to
+    every entry, and concurrent refreshes of the same key await the same
+    request. Keys nobody uses any more are dropped after
+    HUB_IDLE_TTL_SECONDS, so an entry reload still finds its data.
+    """
+
+    def __init__(self, ttl: float = HUB_IDLE_TTL_SECONDS) -> None:
+        self.ttl = ttl
+        self._items: dict[HubKey, _Shared] = {}
+
+    def acquire(self, entry_id: str, keys: list[HubKey]) -> None:
+        for key in keys:
+            item = self._items.setdefault(key, _Shared())
+            item.users.add(entry_id)
+            item.idle_since = None
+
+    def release(self, entry_id: str, keys: list[HubKey], now: float) -> None:
+        for key in keys:
+            item = self._items.get(key)
+            if item is None:
+                continue
+            item.users.discard(entry_id)
+            if not item.users:
+                item.idle_since = now
+        self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        for key, item in list(self._items.items()):
+            if (item.idle_since is not None and item.in_flight is None
+                    and now - item.idle_since >= self.ttl):
+                del self._items[key]
+
+    def fresh(self, key: HubKey, max_age: float, now: float) -> tuple[Any, float] | None:
+        """Result and fetch time if another entry fetched it within max_age."""
+        item = self._items.get(key)
+        if item is None or item.result is None or now - item.fetched_at >= max_age:
+            return None
+        return item.result, item.fetched_at
+
+    def in_flight(self, key: HubKey) -> asyncio.Future | None:
+        item = self._items.get(key)
+        return item.in_flight if item is not None else None
+
+    def fetch(self, key: HubKey, fetch: Callable[[], Awaitable[Any]], now: float) -> asyncio.Future:
+        """Start fetching key, or join the request already in flight.
+
+        Callers should await the returned future through asyncio.shield:
+        one entry giving up must not cancel the request for the others.
+        """
+        item = self._items.setdefault(key, _Shared())
+        if item.in_flight is not None:
+            return item.in_flight
+        task = asyncio.ensure_future(fetch())
+
+        def _done(task: asyncio.Future) -> None:
+            item.in_flight = None
+            if not task.cancelled() and task.exception() is None:
+                item.result = task.result()
+                item.fetched_at = now
+
+        task.add_done_callback(_done)
+        item.in_flight = task
+        self._evict(now)
+        return task
+
+    def users(self, key: HubKey) -> int:
+        item = self._items.get(key)
+        return len(item.users) if item is not None else 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+def async_get_hub(hass: HomeAssistant) -> ForecastHub:
+    # Lives as long as HA, like the quota managers
+    hub: ForecastHub | None = hass.data.get(DATA_HUB)
+    if hub is None:
+        hub = hass.data[DATA_HUB] = ForecastHub()
+    return hub
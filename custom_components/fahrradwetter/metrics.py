@@ -0,0 +1,47 @@
+"""Runtime metrics of a Fahrradwetter coordinator (diagnostics only)."""
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+
+@dataclass(slots=True)
+class EndpointMetrics:
+    latency_ms: float | None = None
+    decode_ms: float | None = None
+    bytes_last: int = 0
+    bytes_total: int = 0
+    requests: int = 0
+    errors: int = 0
+
+
+@dataclass(slots=True)
+class FahrradwetterMetrics:
+    # One entry per provider leg plus "route"; see add_endpoints()
+    endpoints: dict[str, EndpointMetrics] = field(default_factory=dict)
+    evaluation_ms: float | None = None
+    # A leg not due yet (provider min age), served from the cached payload
+    cache_hits: int = 0
+    cache_misses: int = 0
+    # A leg another entry at the same location fetched (or was fetching)
+    shared_hits: int = 0
+
+    def add_endpoints(self, names) -> None:
+        for name in names:
+            self.endpoints.setdefault(name, EndpointMetrics())
+
+    def record_fetch(self, endpoint: str, seconds: float, size: int) -> None:
+        m = self.endpoints[endpoint]
+        m.latency_ms = seconds * 1000
+        m.bytes_last = size
+        m.bytes_total += size
+        m.requests += 1
+
+    def record_decode(self, endpoint: str, seconds: float) -> None:
+        self.endpoints[endpoint].decode_ms = seconds * 1000
+
+    def record_error(self, endpoint: str) -> None:
+        self.endpoints[endpoint].errors += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
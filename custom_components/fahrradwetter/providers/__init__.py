@@ -0,0 +1,103 @@
+"""Weather data providers for Fahrradwetter.
+
+A provider turns API responses into the two kinds of data the coordinator
+evaluates: "current" (see forecast.project_current) and "forecast" (a
+ForecastSeries). Scheduling, quota, caching and evaluation stay in the
+coordinator; backends are imported only when an entry uses them.
+"""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from datetime import timedelta
+import time
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Mapping, NamedTuple, Sequence
+
+from ..const import (
+    CONF_PROVIDER, DEFAULT_PROVIDER, PROVIDER_DWD_MOSMIX, PROVIDER_OWM_ONECALL,
+    OWM_REFRESH_TIMEOUT, OWM_REQUEST_TIMEOUT,
+)
+from ..forecast import BLOCK_SECONDS
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from ..forecast import ForecastSeries
+    from ..metrics import FahrradwetterMetrics
+    from ..route import Point
+
+# (url, params, endpoint) -> raw response body; supplied by the coordinator
+Request = Callable[[str, Mapping[str, Any], str], Awaitable[bytes]]
+
+
+class Leg(NamedTuple):
+    """One request per refresh: the data kinds it returns and how often it
+    can change on the provider side."""
+
+    provides: tuple[str, ...]
+    min_age: timedelta
+
+
+class ProviderResult(NamedTuple):
+    current: dict[str, Any] | None = None
+    forecast: ForecastSeries | None = None
+
+
+class WeatherProvider(ABC):
+    """Base class of the provider backends."""
+
+    name: str = ""
+    # Leg name -> Leg; the leg name is also the metrics endpoint
+    legs: Mapping[str, Leg] = {}
+    # How often a forecast-only fetch (route waypoints) can change
+    forecast_min_age: timedelta = timedelta(hours=1)
+    # Block length of the forecast series
+    forecast_step: int = BLOCK_SECONDS
+    # Seconds per request and for all legs of one refresh
+    request_timeout: float = OWM_REQUEST_TIMEOUT
+    refresh_timeout: float = OWM_REFRESH_TIMEOUT
+
+    def __init__(self, hass: HomeAssistant, entry_data: Mapping[str, Any], request: Request,
+                 metrics: FahrradwetterMetrics, route: Sequence[Point] = ()) -> None:
+        self.hass = hass
+        self.entry_data = entry_data
+        # Route waypoints the coordinator will ask async_fetch_forecast() for
+        self.route = tuple(route)
+        self._request = request
+        self._metrics = metrics
+
+    @abstractmethod
+    async def async_fetch(self, leg: str) -> ProviderResult:
+        """Fetch one leg for the entry location."""
+
+    @abstractmethod
+    async def async_fetch_forecast(self, point: Point, endpoint: str) -> ForecastSeries:
+        """Forecast only, for a route waypoint."""
+
+    def _decode(self, endpoint: str, parse: Callable[[bytes], Any], raw: bytes) -> Any:
+        start = time.perf_counter()
+        result = parse(raw)
+        self._metrics.record_decode(endpoint, time.perf_counter() - start)
+        return result
+
+    async def _async_decode(self, endpoint: str, parse: Callable[..., Any], *args: Any) -> Any:
+        """Like _decode, for parsers too slow to run in the event loop."""
+        start = time.perf_counter()
+        result = await self.hass.async_add_executor_job(parse, *args)
+        self._metrics.record_decode(endpoint, time.perf_counter() - start)
+        return result
+
+
+def create_provider(hass: HomeAssistant, entry_data: Mapping[str, Any], request: Request,
+                    metrics: FahrradwetterMetrics, route: Sequence[Point] = ()) -> WeatherProvider:
+    name = entry_data.get(CONF_PROVIDER) or DEFAULT_PROVIDER
+    if name == PROVIDER_OWM_ONECALL:
+        from .owm_onecall import OwmOneCallProvider
+
+        return OwmOneCallProvider(hass, entry_data, request, metrics, route)
+    if name == PROVIDER_DWD_MOSMIX:
+        from .dwd_mosmix import DwdMosmixProvider
+
+        return DwdMosmixProvider(hass, entry_data, request, metrics, route)
+    from .owm import OwmProvider
+
+    return OwmProvider(hass, entry_data, request, metrics, route)
@@ -0,0 +1,391 @@
+"""DWD MOSMIX: hourly point forecasts for ~5400 stations, free and keyless.
+
+MOSMIX_S is published once per hour as a single KMZ (zipped KML) with every
+station. The document is streamed with iterparse; only the placemarks of
+the stations nearest to the entry location and the route waypoints are
+kept, everything else is cleared as soon as it has been read. Parsing runs
+in the executor.
+
+The station list is taken from the first document and stored, so later
+parses already know which station ids to keep.
+"""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+from io import BytesIO
+import logging
+import math
+from typing import IO, Any, Iterable, NamedTuple, Sequence
+import xml.etree.ElementTree as ET
+import zipfile
+
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from ..const import (
+    CONF_LAT, CONF_LON, DOMAIN,
+    DWD_MOSMIX_MIN_AGE, DWD_REFRESH_TIMEOUT, DWD_REQUEST_TIMEOUT,
+)
+from ..forecast import HOURLY_SECONDS, RAIN_REFERENCE_SECONDS, ForecastSeries, rain_to_reference
+from . import Leg, ProviderResult, WeatherProvider
+
+_LOGGER = logging.getLogger(__name__)
+
+MOSMIX_S_URL = (
+    "https://opendata.dwd.de/weather/local_forecasts/mos/"
+    "MOSMIX_S/all_stations/kml/MOSMIX_S_LATEST_240.kmz"
+)
+STATIONS_STORAGE_VERSION = 1
+
+_KML = "{http://www.opengis.net/kml/2.2}"
+_DWD = "{https://opendata.dwd.de/weather/lib/pointforecast_dwd_extension_V1_0.xsd}"
+_DOCUMENT = f"{_KML}Document"
+_PLACEMARK = f"{_KML}Placemark"
+_TIME_STEP = f"{_DWD}TimeStep"
+_ISSUE_TIME = f"{_DWD}IssueTime"
+_FORECAST = f"{_DWD}Forecast"
+_ELEMENT_NAME = f"{_DWD}elementName"
+_VALUE = f"{_DWD}value"
+_COORDINATES = f"{_KML}Point/{_KML}coordinates"
+
+# Temperature 2m (K), wind speed (m/s), precipitation over the last hour
+# (kg/m² = mm), significant weather (WMO ww code)
+ELEMENTS = frozenset(("TTT", "FF", "RR1c", "ww"))
+
+# ww codes MOSMIX forecasts, in the register of OWM's lang=de descriptions
+_WW_DESCRIPTIONS = {
+    0: "klarer Himmel", 1: "leicht bewölkt", 2: "bewölkt", 3: "bedeckt",
+    45: "Nebel", 49: "gefrierender Nebel",
+    51: "leichter Sprühregen", 53: "Sprühregen", 55: "starker Sprühregen",
+    56: "gefrierender Sprühregen", 57: "gefrierender Sprühregen",
+    61: "leichter Regen", 63: "mäßiger Regen", 65: "starker Regen",
+    66: "gefrierender Regen", 67: "gefrierender Regen",
+    68: "Schneeregen", 69: "Schneeregen",
+    71: "leichter Schneefall", 73: "mäßiger Schneefall", 75: "starker Schneefall",
+    80: "leichte Regenschauer", 81: "Regenschauer", 82: "starke Regenschauer",
+    83: "Schneeregenschauer", 84: "Schneeregenschauer",
+    85: "Schneeschauer", 86: "Schneeschauer",
+    95: "Gewitter",
+}
+
+_EARTH_RADIUS_KM = 6371.0
+# Rings of 1° cells searched before falling back to a full scan
+_MAX_RINGS = 10
+
+Point = tuple[float, float]
+
+
+class Station(NamedTuple):
+    id: str
+    name: str
+    lat: float
+    lon: float
+
+
+def distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance (haversine)."""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    a = (math.sin((p2 - p1) / 2) ** 2
+         + math.cos(p1) * math.cos(p2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2)
+    return 2 * _EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class StationIndex:
+    """Stations bucketed into 1° cells for nearest-station lookups.
+
+    nearest() searches the query cell and then rings of cells around it,
+    and stops once no station in the next ring can be closer than the
+    best one found, so a lookup touches a handful of cells instead of
+    every station. Points far from any station fall back to a scan.
+    """
+
+    def __init__(self, stations: Iterable[Station]) -> None:
+        self.stations = list(stations)
+        self._cells: dict[tuple[int, int], list[Station]] = {}
+        for station in self.stations:
+            self._cells.setdefault(_cell(station.lat, station.lon), []).append(station)
+
+    def __len__(self) -> int:
+        return len(self.stations)
+
+    def nearest(self, lat: float, lon: float) -> tuple[Station, float] | None:
+        if not self.stations:
+            return None
+        c_lat, c_lon = _cell(lat, lon)
+        best: Station | None = None
+        best_km = math.inf
+        for ring in range(_MAX_RINGS):
+            for cell in _ring(c_lat, c_lon, ring):
+                for station in self._cells.get(cell, ()):
+                    km = distance_km(lat, lon, station.lat, station.lon)
+                    if km < best_km:
+                        best, best_km = station, km
+            # Anything further out is at least `ring` degrees away in
+            # latitude or in longitude; the latter is shortest at the
+            # pole-most latitude those cells reach.
+            if best is not None and best_km <= _min_km(ring, min(90.0, abs(lat) + ring + 2)):
+                return best, best_km
+        # Far from every station (or near a pole, where the bound is useless): scan all
+        best = min(self.stations, key=lambda s: distance_km(lat, lon, s.lat, s.lon))
+        return best, distance_km(lat, lon, best.lat, best.lon)
+
+    def as_list(self) -> list[list[Any]]:
+        """JSON-serialisable form for HA storage."""
+        return [list(station) for station in self.stations]
+
+    @classmethod
+    def from_list(cls, data: list[list[Any]]) -> StationIndex:
+        return cls(Station(str(s[0]), str(s[1]), float(s[2]), float(s[3])) for s in data)
+
+
+def _min_km(degrees: float, pole_lat: float) -> float:
+    """Lower bound of the distance between points that far apart in
+    longitude, both within pole_lat of the equator (latitude apart is
+    always further)."""
+    half = math.radians(min(degrees, 180.0)) / 2
+    return 2 * _EARTH_RADIUS_KM * math.asin(math.cos(math.radians(pole_lat)) * math.sin(half))
+
+def _cell(lat: float, lon: float) -> tuple[int, int]:
+    return (math.floor(lat), _wrap_lon(math.floor(lon)))
+
+def _wrap_lon(c_lon: int) -> int:
+    # Longitude cells wrap at ±180°: cell 180 is cell -180
+    return (c_lon + 180) % 360 - 180
+
+def _ring(c_lat: int, c_lon: int, ring: int) -> Iterable[tuple[int, int]]:
+    if ring == 0:
+        yield (c_lat, c_lon)
+        return
+    for d_lon in range(-ring, ring + 1):
+        yield (c_lat - ring, _wrap_lon(c_lon + d_lon))
+        yield (c_lat + ring, _wrap_lon(c_lon + d_lon))
+    for d_lat in range(-ring + 1, ring):
+        yield (c_lat + d_lat, _wrap_lon(c_lon - ring))
+        yield (c_lat + d_lat, _wrap_lon(c_lon + ring))
+
+
+class MosmixDocument(NamedTuple):
+    issued: str | None
+    # Station id -> forecast, only for the stations that were kept
+    series: dict[str, ForecastSeries]
+    # Every station in the document; only collected when no ids were given
+    stations: list[Station] | None
+
+
+def open_kmz(raw: bytes) -> IO[bytes]:
+    """The KML inside a KMZ, decompressed while it is read."""
+    archive = zipfile.ZipFile(BytesIO(raw))
+    name = next((n for n in archive.namelist() if n.endswith(".kml")), None)
+    if name is None:
+        raise ValueError("no KML file in KMZ")
+    return archive.open(name)
+
+
+def parse_mosmix(source: IO[bytes], station_ids: set[str] | None,
+                 targets: Sequence[Point] = (), now_ts: float | None = None) -> MosmixDocument:
+    """Stream a MOSMIX KML document, keeping only the wanted stations.
+
+    With station_ids, only those placemarks are decoded. Without, every
+    station's position is collected and, per target, the nearest station
+    seen so far is kept (the first parse, before an index exists).
+    """
+    timestamps: list[int] = []
+    issued: str | None = None
+    kept: dict[str, dict[str, str]] = {}
+    stations: list[Station] | None = [] if station_ids is None else None
+    # Per target: (distance, station id) of the nearest station so far
+    nearest: list[tuple[float, str]] = [(math.inf, "")] * len(targets)
+    document = None
+
+    for event, elem in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            if document is None and elem.tag == _DOCUMENT:
+                document = elem
+            continue
+        tag = elem.tag
+        if tag == _TIME_STEP:
+            timestamps.append(_parse_time(elem.text))
+        elif tag == _ISSUE_TIME:
+            issued = (elem.text or "").strip() or None
+        elif tag == _PLACEMARK:
+            station_id = (elem.findtext(f"{_KML}name") or "").strip()
+            if stations is None:
+                if station_id in station_ids:
+                    kept[station_id] = _forecast_texts(elem)
+            else:
+                station = _station(elem, station_id)
+                if station is not None:
+                    stations.append(station)
+                    closer = False
+                    for i, (lat, lon) in enumerate(targets):
+                        km = distance_km(lat, lon, station.lat, station.lon)
+                        if km < nearest[i][0]:
+                            old = nearest[i][1]
+                            nearest[i] = (km, station_id)
+                            closer = True
+                            if old and all(old != n[1] for n in nearest):
+                                del kept[old]
+                    if closer:
+                        kept[station_id] = _forecast_texts(elem)
+            # Drop the placemark (and any before it) from the tree
+            if document is not None:
+                document.clear()
+            else:
+                elem.clear()
+
+    return MosmixDocument(
+        issued,
+        {sid: _series(timestamps, texts, now_ts) for sid, texts in kept.items()},
+        stations,
+    )
+
+def parse_kmz(raw: bytes, station_ids: set[str] | None, targets: Sequence[Point] = (),
+              now_ts: float | None = None) -> MosmixDocument:
+    with open_kmz(raw) as source:
+        return parse_mosmix(source, station_ids, targets, now_ts)
+
+
+def _parse_time(text: str | None) -> int:
+    return int(datetime.fromisoformat((text or "").strip()).timestamp())
+
+def _station(elem: ET.Element, station_id: str) -> Station | None:
+    try:
+        lon, lat = (elem.findtext(_COORDINATES) or "").split(",")[:2]
+        return Station(station_id, (elem.findtext(f"{_KML}description") or "").strip(),
+                       float(lat), float(lon))
+    except ValueError:
+        return None
+
+def _forecast_texts(elem: ET.Element) -> dict[str, str]:
+    """Raw value lists of the elements we read; decoded only for kept stations."""
+    texts = {}
+    for forecast in elem.iter(_FORECAST):
+        name = forecast.get(_ELEMENT_NAME)
+        if name in ELEMENTS:
+            texts[name] = forecast.findtext(_VALUE) or ""
+    return texts
+
+def _values(text: str | None, count: int) -> list[float]:
+    values = [math.nan if v == "-" else float(v) for v in (text or "").split()]
+    return values + [math.nan] * (count - len(values))
+
+def _description(code: float) -> str | None:
+    if math.isnan(code):
+        return None
+    return _WW_DESCRIPTIONS.get(int(code))
+
+def _series(timestamps: list[int], texts: dict[str, str], now_ts: float | None) -> ForecastSeries:
+    n = len(timestamps)
+    temp = _values(texts.get("TTT"), n)
+    wind = _values(texts.get("FF"), n)
+    rain = _values(texts.get("RR1c"), n)
+    ww = _values(texts.get("ww"), n)
+    rows = [
+        (dt, temp[i] - 273.15, wind[i],
+         0.0 if math.isnan(rain[i]) else rain_to_reference(rain[i], HOURLY_SECONDS), _description(ww[i]))
+        for i, dt in enumerate(timestamps)
+        if now_ts is None or dt > now_ts - HOURLY_SECONDS
+    ]
+    return ForecastSeries.from_rows(rows, HOURLY_SECONDS)
+
+
+def current_from_series(series: ForecastSeries, now_ts: float) -> dict[str, Any] | None:
+    """MOSMIX has no observations: "current" is the forecast for now.
+
+    A run starts one hour after it is issued, so right after a download
+    now can lie just before the first step; that step is used then.
+    """
+    vals = series.timeline().at(now_ts)
+    if vals is None:
+        vals = series.closest_block(now_ts)
+        if vals is None or abs(vals.dt - now_ts) > series.step:
+            return None
+    return {
+        "dt": int(now_ts),
+        "temp": vals.temp,
+        "wind_ms": vals.wind_ms,
+        # The series holds mm per 3 h (see forecast.rain_to_reference)
+        "rain_1h": vals.rain * HOURLY_SECONDS / RAIN_REFERENCE_SECONDS,
+        "desc": vals.desc,
+    }
+
+
+class DwdMosmixProvider(WeatherProvider):
+    """One download per hour for the entry location and all waypoints."""
+
+    name = "DWD MOSMIX"
+    url = MOSMIX_S_URL
+    legs = {
+        "mosmix": Leg(("current", "forecast"), DWD_MOSMIX_MIN_AGE),
+    }
+    forecast_min_age = DWD_MOSMIX_MIN_AGE
+    forecast_step = HOURLY_SECONDS
+    request_timeout = DWD_REQUEST_TIMEOUT
+    refresh_timeout = DWD_REFRESH_TIMEOUT
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._home: Point = (float(self.entry_data[CONF_LAT]), float(self.entry_data[CONF_LON]))
+        self._targets: tuple[Point, ...] = (self._home, *self.route)
+        self._store: Store = Store(self.hass, STATIONS_STORAGE_VERSION, f"{DOMAIN}.mosmix_stations")
+        self._index: StationIndex | None = None
+        self._index_loaded = False
+        # Target point -> station id, from the index
+        self._station_of: dict[Point, str] = {}
+        # Route legs run next to the main leg; they share its download
+        self._lock = asyncio.Lock()
+        self._last: tuple[float, dict[str, ForecastSeries]] | None = None
+
+    def _use_index(self, index: StationIndex) -> None:
+        self._index = index
+        self._station_of = {}
+        for point in self._targets:
+            found = index.nearest(*point)
+            if found is not None:
+                station, km = found
+                self._station_of[point] = station.id
+                _LOGGER.debug("MOSMIX station for %s: %s %s (%.1f km)", point, station.id, station.name, km)
+
+    async def _async_series(self, endpoint: str) -> dict[str, ForecastSeries]:
+        async with self._lock:
+            now_ts = dt_util.utcnow().timestamp()
+            if self._last is not None and now_ts - self._last[0] < self.forecast_min_age.total_seconds():
+                return self._last[1]
+            if not self._index_loaded:
+                self._index_loaded = True
+                stored = await self._store.async_load()
+                if stored:
+                    self._use_index(StationIndex.from_list(stored))
+            raw = await self._request(self.url, {}, endpoint)
+            station_ids = set(self._station_of.values()) if self._index is not None else None
+            doc: MosmixDocument = await self._async_decode(
+                endpoint, parse_kmz, raw, station_ids, self._targets, now_ts
+            )
+            if doc.stations is not None:
+                index = StationIndex(doc.stations)
+                self._use_index(index)
+                self._store.async_delay_save(index.as_list, 10)
+            self._last = (now_ts, doc.series)
+            return doc.series
+
+    def _series_for(self, series: dict[str, ForecastSeries], point: Point) -> ForecastSeries:
+        station_id = self._station_of.get(point)
+        if station_id is None or station_id not in series:
+            # Station dropped from MOSMIX: rebuild the index on the next parse
+            self._index = None
+            self._station_of = {}
+            self._last = None
+            raise UpdateFailed(f"{self.name}: no station for {point}")
+        return series[station_id]
+
+    async def async_fetch(self, leg: str) -> ProviderResult:
+        forecast = self._series_for(await self._async_series(leg), self._home)
+        return ProviderResult(
+            current=current_from_series(forecast, dt_util.utcnow().timestamp()),
+            forecast=forecast,
+        )
+
+    async def async_fetch_forecast(self, point, endpoint: str) -> ForecastSeries:
+        return self._series_for(await self._async_series(endpoint), point)
@@ -0,0 +1,49 @@
+"""OpenWeatherMap 2.5: current weather and the 5 day / 3 hour forecast."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
+
+from ..const import CONF_API_KEY, CONF_LAT, CONF_LON, OWM_CURRENT_MIN_AGE, OWM_FORECAST_MIN_AGE
+from ..forecast import ForecastSeries, project_current
+from . import Leg, ProviderResult, WeatherProvider
+
+
+class OwmProvider(WeatherProvider):
+    """Two requests per full refresh, forecast in 3h blocks."""
+
+    name = "OWM"
+    current_url = "https://api.openweathermap.org/data/2.5/weather"
+    forecast_url = "https://api.openweathermap.org/data/2.5/forecast"
+    legs = {
+        "current": Leg(("current",), OWM_CURRENT_MIN_AGE),
+        "forecast": Leg(("forecast",), OWM_FORECAST_MIN_AGE),
+    }
+    forecast_min_age = OWM_FORECAST_MIN_AGE
+
+    def _params(self, lat: Any, lon: Any) -> dict[str, Any]:
+        return {
+            "lat": lat,
+            "lon": lon,
+            "appid": self.entry_data[CONF_API_KEY],
+            "units": "metric",
+            "lang": "de",
+        }
+
+    def _parse_forecast(self, raw: bytes) -> ForecastSeries:
+        return ForecastSeries.from_owm_payload(json_loads(raw), dt_util.utcnow().timestamp())
+
+    async def async_fetch(self, leg: str) -> ProviderResult:
+        params = self._params(self.entry_data[CONF_LAT], self.entry_data[CONF_LON])
+        if leg == "current":
+            raw = await self._request(self.current_url, params, leg)
+            # orjson on the raw bytes, then keep only the fields we read
+            return ProviderResult(current=self._decode(leg, lambda b: project_current(json_loads(b)), raw))
+        raw = await self._request(self.forecast_url, params, leg)
+        return ProviderResult(forecast=self._decode(leg, self._parse_forecast, raw))
+
+    async def async_fetch_forecast(self, point, endpoint: str) -> ForecastSeries:
+        raw = await self._request(self.forecast_url, self._params(*point), endpoint)
+        return self._decode(endpoint, self._parse_forecast, raw)
@@ -0,0 +1,57 @@
+"""OpenWeatherMap One Call 3.0: current and hourly forecast in one request."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
+
+from ..const import CONF_API_KEY, CONF_LAT, CONF_LON, OWM_CURRENT_MIN_AGE, OWM_FORECAST_MIN_AGE
+from ..forecast import HOURLY_SECONDS, ForecastSeries, project_onecall_current
+from . import Leg, ProviderResult, WeatherProvider
+
+
+class OwmOneCallProvider(WeatherProvider):
+    """One request per refresh, forecast in 1h steps for 48 hours.
+
+    minutely/daily/alerts are excluded: nothing reads them, and they are
+    most of the payload.
+    """
+
+    name = "OWM One Call"
+    url = "https://api.openweathermap.org/data/3.0/onecall"
+    legs = {
+        "onecall": Leg(("current", "forecast"), OWM_CURRENT_MIN_AGE),
+    }
+    forecast_min_age = OWM_FORECAST_MIN_AGE
+    forecast_step = HOURLY_SECONDS
+
+    def _params(self, lat: Any, lon: Any, exclude: str) -> dict[str, Any]:
+        return {
+            "lat": lat,
+            "lon": lon,
+            "appid": self.entry_data[CONF_API_KEY],
+            "units": "metric",
+            "lang": "de",
+            "exclude": exclude,
+        }
+
+    def _parse(self, raw: bytes) -> ProviderResult:
+        payload = json_loads(raw)
+        return ProviderResult(
+            current=project_onecall_current(payload),
+            forecast=ForecastSeries.from_onecall_payload(payload, dt_util.utcnow().timestamp()),
+        )
+
+    async def async_fetch(self, leg: str) -> ProviderResult:
+        params = self._params(self.entry_data[CONF_LAT], self.entry_data[CONF_LON], "minutely,daily,alerts")
+        raw = await self._request(self.url, params, leg)
+        return self._decode(leg, self._parse, raw)
+
+    async def async_fetch_forecast(self, point, endpoint: str) -> ForecastSeries:
+        raw = await self._request(self.url, self._params(*point, "current,minutely,daily,alerts"), endpoint)
+        return self._decode(
+            endpoint,
+            lambda b: ForecastSeries.from_onecall_payload(json_loads(b), dt_util.utcnow().timestamp()),
+            raw,
+        )
@@ -0,0 +1,108 @@
+"""OWM API quota handling, shared by all entries using the same API key."""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import random
+
+from homeassistant.core import HomeAssistant
+
+from .const import DATA_QUOTAS
+
+BACKOFF_BASE_SECONDS = 60.0
+BACKOFF_MAX_SECONDS = 3600.0
+
+
+class ApiQuota:
+    """Token bucket (calls/minute) + daily budget + backoff for one API key.
+
+    Each entry registers its configured budget; the most restrictive one
+    applies, since they all draw from the same key at OWM.
+    """
+
+    def __init__(self) -> None:
+        self._budgets: dict[str, tuple[int, int]] = {}
+        self.per_minute = 60
+        self.per_day = 1000
+        self._tokens = float(self.per_minute)
+        self._last_refill: float | None = None
+        self._day: str | None = None
+        self._calls = 0
+        self._failures = 0
+        self._blocked_until = 0.0
+
+    def register(self, entry_id: str, per_minute: int, per_day: int) -> None:
+        self._budgets[entry_id] = (max(1, int(per_minute)), max(1, int(per_day)))
+        self._apply_budgets()
+
+    def unregister(self, entry_id: str) -> None:
+        self._budgets.pop(entry_id, None)
+        self._apply_budgets()
+
+    def _apply_budgets(self) -> None:
+        if not self._budgets:
+            return
+        self.per_minute = min(b[0] for b in self._budgets.values())
+        self.per_day = min(b[1] for b in self._budgets.values())
+        self._tokens = min(self._tokens, float(self.per_minute))
+
+    def backoff_remaining(self, now: float) -> float:
+        return max(0.0, self._blocked_until - now)
+
+    def _roll_day(self, now: float) -> None:
+        day = datetime.fromtimestamp(now, timezone.utc).date().isoformat()
+        if day != self._day:
+            self._day = day
+            self._calls = 0
+
+    def calls_today(self, now: float) -> int:
+        """Calls made on now's (UTC) day; 0 after midnight until the next one."""
+        self._roll_day(now)
+        return self._calls
+
+    def try_acquire(self, now: float) -> bool:
+        """Take one call from the budget; False if the call must be skipped."""
+        if self.backoff_remaining(now) > 0:
+            return False
+
+        if self.calls_today(now) >= self.per_day:
+            return False
+
+        if self._last_refill is not None:
+            self._tokens = min(
+                float(self.per_minute),
+                self._tokens + (now - self._last_refill) * self.per_minute / 60.0,
+            )
+        self._last_refill = now
+        if self._tokens < 1.0:
+            return False
+
+        self._tokens -= 1.0
+        self._calls += 1
+        return True
+
+    def record_success(self) -> None:
+        self._failures = 0
+
+    def record_failure(self, now: float) -> None:
+        """Exponential backoff with jitter after a failed call."""
+        self._failures += 1
+        delay = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** (self._failures - 1))
+        delay = delay / 2 + random.uniform(0, delay / 2)
+        self._blocked_until = max(self._blocked_until, now + delay)
+
+    def record_rate_limited(self, now: float, retry_after: float | None) -> None:
+        """HTTP 429: honour Retry-After, otherwise back off exponentially."""
+        if retry_after is None:
+            self.record_failure(now)
+            return
+        self._failures += 1
+        self._blocked_until = max(self._blocked_until, now + retry_after)
+
+
+def async_get_quota(hass: HomeAssistant, api_key: str) -> ApiQuota:
+    # Kept for the lifetime of HA, so reloading an entry does not reset the
+    # daily call count or an active backoff.
+    quotas: dict[str, ApiQuota] = hass.data.setdefault(DATA_QUOTAS, {})
+    if api_key not in quotas:
+        quotas[api_key] = ApiQuota()
+    return quotas[api_key]
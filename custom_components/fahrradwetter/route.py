@@ -0,0 +1,82 @@
+"""Route waypoints and worst-case aggregation for Fahrradwetter."""
+from __future__ import annotations
+
+from bisect import bisect_left
+import math
+from typing import Any
+
+from .forecast import ForecastSeries, Point, grid_key
+
+
+def parse_waypoints(value: Any) -> list[Point]:
+    """Waypoints from the config entry: "lat,lon" per line or list item.
+
+    Raises ValueError on anything that is not a valid coordinate pair.
+    """
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = [line for line in value.replace(";", "\n").splitlines() if line.strip()]
+    points: list[Point] = []
+    for item in value:
+        if isinstance(item, str):
+            parts = item.split(",")
+        elif isinstance(item, (list, tuple)):
+            parts = list(item)
+        else:
+            raise ValueError(f"invalid waypoint: {item!r}")
+        if len(parts) != 2:
+            raise ValueError(f"invalid waypoint: {item!r}")
+        lat, lon = float(parts[0]), float(parts[1])
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            raise ValueError(f"waypoint out of range: {item!r}")
+        points.append((lat, lon))
+    return points
+
+def route_points(lat: float, lon: float, waypoints: list[Point]) -> list[Point]:
+    """Extra points to fetch besides the entry location, one per grid cell."""
+    seen = {grid_key(lat, lon)}
+    points: list[Point] = []
+    for p_lat, p_lon in waypoints:
+        key = grid_key(p_lat, p_lon)
+        if key not in seen:
+            seen.add(key)
+            points.append(key)
+    return points
+
+
+def _worst(values: list[float], pick) -> float:
+    values = [v for v in values if not math.isnan(v)]
+    return pick(values) if values else float("nan")
+
+def worst_case_series(series: list[ForecastSeries]) -> ForecastSeries:
+    """Per block the worst value along the route.
+
+    Lowest temperature, strongest wind and most rain over all points that
+    have the block; the description comes from the wettest point. The
+    first series (the entry location) defines the blocks.
+    """
+    base = series[0]
+    if len(series) == 1:
+        return base
+    merged = ForecastSeries(base.step)
+    descriptions: dict[str, int] = {}
+    for i, ts in enumerate(base.timestamps):
+        rows = [(base, i)]
+        for other in series[1:]:
+            j = bisect_left(other.timestamps, ts)
+            if j < len(other.timestamps) and other.timestamps[j] == ts:
+                rows.append((other, j))
+        wettest, wi = max(rows, key=lambda r: r[0].rain[r[1]])
+        desc_i = wettest.desc_idx[wi]
+        merged.timestamps.append(ts)
+        merged.temp.append(_worst([s.temp[k] for s, k in rows], min))
+        merged.wind_ms.append(_worst([s.wind_ms[k] for s, k in rows], max))
+        merged.rain.append(wettest.rain[wi])
+        if desc_i < 0:
+            merged.desc_idx.append(-1)
+        else:
+            desc = wettest.descriptions[desc_i]
+            merged.desc_idx.append(descriptions.setdefault(desc, len(descriptions)))
+    merged.descriptions = tuple(descriptions)
+    return merged
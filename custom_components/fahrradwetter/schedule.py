@@ -0,0 +1,174 @@
+"""Weekly ride schedule for Fahrradwetter.
+
+One slot per weekday and time, optionally with its own thresholds and
+pinned to get a binary sensor of its own. Every slot's next occurrence is
+evaluated once per refresh into a single schedule slot state.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+import re
+from types import MappingProxyType
+from typing import Any
+
+from .evaluation import SlotState, Thresholds, ms_to_kmh, schedule_slot
+from .forecast import ForecastTimeline
+
+WEEKDAYS = ("mo", "di", "mi", "do", "fr", "sa", "so")
+_WEEKDAY_ALIASES = {
+    **{name: i for i, name in enumerate(WEEKDAYS)},
+    **{name: i for i, name in enumerate(("mon", "tue", "wed", "thu", "fri", "sat", "sun"))},
+    "tu": 1, "we": 2, "th": 3, "su": 6,
+}
+_EVERY_DAY = ("täglich", "taeglich", "*")
+_TIME = re.compile(r"^([01]?\d|2[0-3]):([0-5]\d)$")
+# Threshold overrides (min_temp=8 max_wind_kmh=20 max_rain=0.2), named
+# like the config options; max_wind is kept as an alias. Value: the
+# Thresholds field
+_OVERRIDES = {
+    "min_temp": "min_temp",
+    "max_wind_kmh": "max_wind",
+    "max_wind": "max_wind",
+    "max_rain": "max_rain",
+}
+PIN = "pin"
+
+
+@dataclass(frozen=True, slots=True)
+class ScheduleSlot:
+    weekday: int  # 0 = Monday
+    time: str  # "HH:MM"
+    # Only the overridden thresholds; the entry's apply otherwise
+    overrides: tuple[tuple[str, float], ...] = ()
+    pinned: bool = False
+
+    @property
+    def key(self) -> str:
+        return f"{WEEKDAYS[self.weekday]}_{self.time.replace(':', '')}"
+
+    @property
+    def label(self) -> str:
+        return f"{WEEKDAYS[self.weekday].capitalize()} {self.time}"
+
+    def thresholds(self, default: Thresholds) -> Thresholds:
+        return replace(default, **dict(self.overrides)) if self.overrides else default
+
+    def next_at(self, local_now: datetime) -> datetime:
+        """Next start of this slot after local_now (same wall-clock time)."""
+        hh, mm = (int(x) for x in self.time.split(":"))
+        days = (self.weekday - local_now.weekday()) % 7
+        at = (local_now + timedelta(days=days)).replace(hour=hh, minute=mm, second=0, microsecond=0)
+        if at <= local_now:
+            at = (local_now + timedelta(days=days + 7)).replace(hour=hh, minute=mm, second=0, microsecond=0)
+        return at
+
+
+def _parse_days(token: str) -> list[int]:
+    token = token.lower()
+    if token in _EVERY_DAY:
+        return list(range(7))
+    days: list[int] = []
+    for part in token.split(","):
+        if "-" in part:
+            first, last = (_WEEKDAY_ALIASES[p] for p in part.split("-", 1))
+            span = (last - first) % 7
+            days.extend((first + i) % 7 for i in range(span + 1))
+        else:
+            days.append(_WEEKDAY_ALIASES[part])
+    return days
+
+def parse_schedule(value: Any) -> list[ScheduleSlot]:
+    """Schedule from the config entry, one rule per line (or ";"):
+
+        Mo-Fr 06:30 16:45
+        Sa,So 10:00 min_temp=10 pin
+
+    Days are German or English abbreviations, ranges or "täglich"; every
+    time on the line gets the line's overrides and pin flag. Raises
+    ValueError on anything it cannot read.
+    """
+    if not value:
+        return []
+    # ";" separates rules like a line break, as for the waypoints
+    lines = value.replace(";", "\n").splitlines() if isinstance(value, str) else list(value)
+    slots: dict[tuple[int, str], ScheduleSlot] = {}
+    for line in lines:
+        tokens = str(line).split()
+        if not tokens:
+            continue
+        try:
+            days = _parse_days(tokens[0])
+        except KeyError:
+            raise ValueError(f"invalid weekday in {line!r}") from None
+        times: list[str] = []
+        overrides: dict[str, float] = {}
+        pinned = False
+        for token in tokens[1:]:
+            if token.lower() == PIN:
+                pinned = True
+            elif "=" in token:
+                name, _, raw = token.partition("=")
+                if name not in _OVERRIDES:
+                    raise ValueError(f"unknown threshold {name!r} in {line!r}")
+                try:
+                    overrides[_OVERRIDES[name]] = float(raw)
+                except ValueError:
+                    raise ValueError(f"invalid value for {name!r} in {line!r}") from None
+            elif (m := _TIME.match(token)) is not None:
+                times.append(f"{int(m[1]):02d}:{m[2]}")
+            else:
+                raise ValueError(f"invalid token {token!r} in {line!r}")
+        if not times:
+            raise ValueError(f"no time in {line!r}")
+        for day in days:
+            for t in times:
+                # A later line for the same weekday and time wins
+                slots[(day, t)] = ScheduleSlot(day, t, tuple(sorted(overrides.items())), pinned)
+    return [slots[k] for k in sorted(slots)]
+
+
+def evaluate_schedule(slots: list[ScheduleSlot], timeline: ForecastTimeline,
+                      thresholds: Thresholds, local_now: datetime) -> tuple[SlotState, dict[str, SlotState]]:
+    """Every slot's next occurrence in one pass over the schedule.
+
+    Returns the consolidated state (next scheduled ride as value, one
+    compact entry per slot, in time order) and the states of the pinned
+    slots by coordinator slot. Occurrences beyond the forecast horizon
+    have ok None.
+    """
+    entries: list[tuple[datetime, ScheduleSlot, dict[str, Any]]] = []
+    pinned: dict[str, SlotState] = {}
+    for slot in slots:
+        at = slot.next_at(local_now)
+        th = slot.thresholds(thresholds)
+        vals = timeline.at(at.timestamp())
+        entry: dict[str, Any] = {"slot": slot.key, "at": at.isoformat(), "ok": None}
+        if vals is not None:
+            wind_kmh = ms_to_kmh(vals.wind_ms)
+            entry.update(
+                ok=th.ok(vals.temp, wind_kmh, vals.rain),
+                temp=_round(vals.temp),
+                wind_kmh=_round(wind_kmh),
+                rain=_round(vals.rain),
+            )
+        entries.append((at, slot, entry))
+        if slot.pinned:
+            pinned[schedule_slot(slot.key)] = SlotState(entry.get("temp"), bool(entry["ok"]), MappingProxyType({
+                **entry,
+                "wetter": vals.desc if vals is not None else None,
+            }))
+    if not entries:
+        return SlotState(None, False, MappingProxyType({"ok": False, "slots": []})), pinned
+    entries.sort(key=lambda e: e[0])
+    next_at, _slot, next_entry = entries[0]
+    return SlotState(next_at, bool(next_entry["ok"]), MappingProxyType({
+        "next_slot": next_entry["slot"],
+        "ok": next_entry["ok"],
+        "ok_count": sum(1 for *_rest, e in entries if e["ok"]),
+        "slots": [e for *_rest, e in entries],
+    })), pinned
+
+
+def _round(value: float | None) -> float | None:
+    return round(value, 1) if value is not None else None
@@ -0,0 +1,56 @@
+"""Adaptive refresh scheduling for Fahrradwetter."""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+
+# Poll densely in this window before each ride time ...
+RIDE_WINDOW = timedelta(hours=2)
+RIDE_WINDOW_DIVISOR = 3
+# ... and back off overnight (local time, no ride window active)
+NIGHT_START_HOUR = 22
+NIGHT_END_HOUR = 5
+NIGHT_FACTOR = 4
+
+MIN_INTERVAL = timedelta(minutes=5)
+MAX_INTERVAL = timedelta(hours=3)
+
+
+def _next_ride(now: datetime, ride_times: list[str], rides: Iterable[datetime]) -> datetime | None:
+    best = min((ride for ride in rides if ride > now), default=None)
+    for t in ride_times:
+        hh, mm = [int(x) for x in t.split(":")]
+        ride = now.replace(hour=hh, minute=mm, second=0, microsecond=0)
+        if ride <= now:
+            ride += timedelta(days=1)
+        if best is None or ride < best:
+            best = ride
+    return best
+
+
+def adaptive_interval(now: datetime, ride_times: list[str], base: timedelta,
+                      rides: Iterable[datetime] = ()) -> timedelta:
+    """Interval until the next poll, given the configured baseline.
+
+    `now` is local time. `ride_times` are the daily "HH:MM" ride times,
+    `rides` further upcoming rides (the next occurrence of every weekly
+    schedule slot). Inside the window before a ride the interval shrinks;
+    at night it grows, but never so far that the next ride window would
+    start without a poll.
+    """
+    interval = base
+    ride = _next_ride(now, ride_times, rides)
+    until_window = None
+    if ride is not None:
+        until_window = ride - RIDE_WINDOW - now
+        if until_window <= timedelta(0):
+            interval = max(MIN_INTERVAL, base / RIDE_WINDOW_DIVISOR)
+            # one more poll right before the ride, then back to normal
+            return min(interval, max(MIN_INTERVAL, ride - now))
+
+    if now.hour >= NIGHT_START_HOUR or now.hour < NIGHT_END_HOUR:
+        interval = min(MAX_INTERVAL, base * NIGHT_FACTOR)
+
+    if until_window is not None:
+        interval = min(interval, max(MIN_INTERVAL, until_window))
+    return max(MIN_INTERVAL, interval)
@@ -1,274 +1,261 @@
 from __future__ import annotations
 
-from datetime import timedelta, datetime
 from typing import Any
 
-from homeassistant.components.sensor import SensorEntity
-from homeassistant.components.binary_sensor import BinarySensorEntity
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfPrecipitationDepth, UnitOfSpeed, UnitOfTime
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import dt as dt_util
 
-from .const import (
-    CONF_TIMES,
-    CONF_MIN_TEMP,
-    CONF_MAX_WIND_KMH,
-    CONF_MAX_RAIN,
-    DEFAULT_TIMES,
-    DEFAULT_MIN_TEMP,
-    DEFAULT_MAX_WIND_KMH,
-    DEFAULT_MAX_RAIN,
-)
+from .const import DOMAIN, SLOT_NOW, SLOT_NEXT_BLOCK, SLOT_RIDE_WINDOW, SLOT_SCHEDULE
 from .coordinator import FahrradwetterCoordinator
+from .evaluation import SlotState, tomorrow_slot
+from .forecast import BLOCK_SECONDS
 
-def ms_to_kmh(ms: float | None) -> float | None:
-    if ms is None:
-        return None
-    try:
-        return float(ms) * 3.6
-    except Exception:
-        return None
-
-def _safe_float(v: Any) -> float | None:
-    try:
-        if v is None:
-            return None
-        return float(v)
-    except Exception:
-        return None
-
-def _block_values(block: dict[str, Any]) -> dict[str, Any]:
-    temp = _safe_float((block.get("main") or {}).get("temp"))
-    wind_ms = _safe_float((block.get("wind") or {}).get("speed"))
-    rain = 0.0
-    r = block.get("rain") or {}
-    if isinstance(r, dict) and "3h" in r:
-        rain = _safe_float(r.get("3h")) or 0.0
-    weather = block.get("weather") or []
-    desc = None
-    if isinstance(weather, list) and weather:
-        desc = (weather[0] or {}).get("description")
-    return {"temp": temp, "wind_ms": wind_ms, "rain_3h": rain, "desc": desc, "dt": block.get("dt")}
-
-def find_next_block(forecast_list: list[dict[str, Any]], now_ts: float) -> dict[str, Any] | None:
-    blocks = [b for b in forecast_list if isinstance(b, dict) and "dt" in b]
-    blocks.sort(key=lambda x: x.get("dt", 0))
-    for b in blocks:
-        try:
-            if float(b["dt"]) > now_ts:
-                return b
-        except Exception:
-            continue
-    return None
-
-def find_closest_block(forecast_list: list[dict[str, Any]], target: datetime) -> dict[str, Any] | None:
-    blocks = [b for b in forecast_list if isinstance(b, dict) and "dt" in b]
-    if not blocks:
-        return None
-    target_ts = target.timestamp()
-    best = None
-    best_dist = None
-    for b in blocks:
-        try:
-            dist = abs(float(b["dt"]) - target_ts)
-        except Exception:
-            continue
-        if best is None or dist < best_dist:
-            best = b
-            best_dist = dist
-    return best
-
-def ok_eval(temp: float | None, wind_kmh: float | None, rain: float | None,
-            min_temp: float, max_wind: float, max_rain: float) -> bool:
-    if temp is None or wind_kmh is None or rain is None:
-        return False
-    return (temp > min_temp) and (wind_kmh < max_wind) and (rain <= max_rain)
+_LATENCY_NAMES = {"current": "Aktuell", "forecast": "Forecast", "onecall": "One Call"}
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
-    coordinator = FahrradwetterCoordinator(hass, entry)
-    await coordinator.async_config_entry_first_refresh()
-
-    times = entry.options.get(CONF_TIMES, entry.data.get(CONF_TIMES, DEFAULT_TIMES)) or DEFAULT_TIMES
-    min_temp = float(entry.options.get(CONF_MIN_TEMP, DEFAULT_MIN_TEMP))
-    max_wind = float(entry.options.get(CONF_MAX_WIND_KMH, DEFAULT_MAX_WIND_KMH))
-    max_rain = float(entry.options.get(CONF_MAX_RAIN, DEFAULT_MAX_RAIN))
+    coordinator: FahrradwetterCoordinator = hass.data[DOMAIN][entry.entry_id]
 
     entities: list = [
-        FahrradwetterNow(coordinator, entry, min_temp, max_wind, max_rain),
-        FahrradwetterNextBlock(coordinator, entry, min_temp, max_wind, max_rain),
-        FahrradwetterOkNow(coordinator, entry, min_temp, max_wind, max_rain),
+        FahrradwetterNow(coordinator, entry),
+        FahrradwetterNextBlock(coordinator, entry),
+        FahrradwetterRideWindow(coordinator, entry),
+        # Numeric "now" values with long-term statistics, disabled by default
+        FahrradwetterNowWind(coordinator, entry),
+        FahrradwetterNowRain(coordinator, entry),
     ]
 
-    for t in times:
-        if isinstance(t, str) and len(t) == 5 and ":" in t:
-            entities.append(FahrradwetterTomorrowAt(coordinator, entry, t, min_temp, max_wind, max_rain))
-            entities.append(FahrradwetterOkTomorrowAt(coordinator, entry, t, min_temp, max_wind, max_rain))
+    for t in coordinator.times:
+        entities.append(FahrradwetterTomorrowAt(coordinator, entry, t))
+    if coordinator.schedule:
+        entities.append(FahrradwetterSchedule(coordinator, entry))
+
+    # Diagnostic sensors, disabled by default
+    entities.append(FahrradwetterDataAge(coordinator, entry))
+    if coordinator.provider is not None:
+        for endpoint in coordinator.provider.legs:
+            name = _LATENCY_NAMES.get(endpoint, endpoint)
+            entities.append(FahrradwetterFetchLatency(coordinator, entry, endpoint, f"Abrufdauer {name}"))
+    if coordinator.quota is not None:
+        entities.append(FahrradwetterApiCalls(coordinator, entry))
 
     async_add_entities(entities)
 
 
 class FahrradwetterBase(CoordinatorEntity[FahrradwetterCoordinator], SensorEntity):
+    """Reads one evaluated slot from the coordinator snapshot."""
+
     _attr_should_poll = False
     _attr_unit_of_measurement = "Â°C"
-
-    def __init__(self, coordinator, entry: ConfigEntry, unique_suffix: str, name_suffix: str,
-                 min_temp: float, max_wind: float, max_rain: float):
-        super().__init__(coordinator)
+    # Payload whose age decides availability
+    _data_kind = "forecast"
+    # Details for the frontend, kept out of the recorder: they change with
+    # every block or reading, and wind/rain have sensors of their own
+    _unrecorded_attributes = frozenset({
+        "dt", "target", "source", "wind", "wind_kmh", "rain", "wetter", "route",
+    })
+
+    def __init__(self, coordinator, entry: ConfigEntry, slot: str, unique_suffix: str, name_suffix: str):
+        # The slot is the listener context: the coordinator only calls
+        # back when this slot's evaluated state changed.
+        super().__init__(coordinator, context=slot)
         self.entry = entry
+        self.slot_key = slot
         self._attr_unique_id = f"{entry.entry_id}_{unique_suffix}"
         self._attr_name = f"{entry.title} {name_suffix}"
-        self.min_temp = min_temp
-        self.max_wind = max_wind
-        self.max_rain = max_rain
 
     @property
     def available(self) -> bool:
-        return self.coordinator.last_update_success
+        return self.coordinator.data_fresh(self._data_kind)
+
+    @property
+    def _slot(self) -> SlotState:
+        return self.coordinator.data.slot(self.slot_key)
+
+    @property
+    def native_value(self):
+        return self._slot.value
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        return dict(self._slot.attributes)
 
 
 class FahrradwetterNow(FahrradwetterBase):
-    def __init__(self, coordinator, entry, min_temp, max_wind, max_rain):
-        super().__init__(coordinator, entry, "now", "Jetzt", min_temp, max_wind, max_rain)
+    _data_kind = "current"
+
+    def __init__(self, coordinator, entry):
+        super().__init__(coordinator, entry, SLOT_NOW, "now", "Jetzt")
+
+
+class FahrradwetterNowWind(FahrradwetterBase):
+    _attr_unit_of_measurement = None
+    _attr_device_class = SensorDeviceClass.WIND_SPEED
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfSpeed.KILOMETERS_PER_HOUR
+    _attr_entity_registry_enabled_default = False
+    _data_kind = "current"
+
+    def __init__(self, coordinator, entry):
+        super().__init__(coordinator, entry, SLOT_NOW, "now_wind", "Jetzt Wind")
 
     @property
     def native_value(self):
-        return _safe_float((self.coordinator.data.get("current") or {}).get("temp"))
+        wind = self.coordinator.data.now_wind_kmh
+        return round(wind, 1) if wind is not None else None
 
     @property
-    def extra_state_attributes(self):
-        cur = self.coordinator.data.get("current") or {}
-        temp = _safe_float(cur.get("temp"))
-        wind_ms = _safe_float(cur.get("wind_ms"))
-        wind_kmh = ms_to_kmh(wind_ms)
-        rain = _safe_float(cur.get("rain_1h")) or 0.0
-        desc = cur.get("desc")
-        return {
-            "source": self.coordinator.data.get("source"),
-            "wind": wind_ms,
-            "wind_kmh": wind_kmh,
-            "rain": rain,
-            "wetter": desc,
-            "ok": ok_eval(temp, wind_kmh, rain, self.min_temp, self.max_wind, self.max_rain),
-            "fetched_at": self.coordinator.data.get("fetched_at"),
-        }
+    def extra_state_attributes(self) -> None:
+        return None
 
 
-class FahrradwetterNextBlock(FahrradwetterBase):
-    def __init__(self, coordinator, entry, min_temp, max_wind, max_rain):
-        super().__init__(coordinator, entry, "next_block", "NÃ¤chster Block (3h)", min_temp, max_wind, max_rain)
+class FahrradwetterNowRain(FahrradwetterBase):
+    """Rain of the last hour (OWM/DWD) or the local rain sensor's value."""
+
+    _attr_unit_of_measurement = None
+    _attr_device_class = SensorDeviceClass.PRECIPITATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfPrecipitationDepth.MILLIMETERS
+    _attr_entity_registry_enabled_default = False
+    _data_kind = "current"
+
+    def __init__(self, coordinator, entry):
+        super().__init__(coordinator, entry, SLOT_NOW, "now_rain", "Jetzt Regen")
 
     @property
     def native_value(self):
-        fl = self.coordinator.data.get("forecast_list") or []
-        b = find_next_block(fl, dt_util.now().timestamp())
-        if not b:
-            return None
-        return _block_values(b)["temp"]
+        return self.coordinator.data.now_rain
 
     @property
-    def extra_state_attributes(self):
-        fl = self.coordinator.data.get("forecast_list") or []
-        b = find_next_block(fl, dt_util.now().timestamp())
-        if not b:
-            return {"ok": False}
-        vals = _block_values(b)
-        wind_kmh = ms_to_kmh(vals["wind_ms"])
-        return {
-            "dt": vals["dt"],
-            "wind": vals["wind_ms"],
-            "wind_kmh": wind_kmh,
-            "rain": vals["rain_3h"],
-            "wetter": vals["desc"],
-            "ok": ok_eval(vals["temp"], wind_kmh, vals["rain_3h"], self.min_temp, self.max_wind, self.max_rain),
-        }
+    def extra_state_attributes(self) -> None:
+        return None
+
+
+class FahrradwetterNextBlock(FahrradwetterBase):
+    def __init__(self, coordinator, entry):
+        # Named after the provider's block length; local mode has no
+        # provider (and no forecast), the name keeps the 3 h default
+        step = coordinator.provider.forecast_step if coordinator.provider else BLOCK_SECONDS
+        super().__init__(coordinator, entry, SLOT_NEXT_BLOCK, "next_block", f"Nächster Block ({step // 3600}h)")
+
+
+class FahrradwetterRideWindow(FahrradwetterBase):
+    """Start of the next window in the forecast horizon that is OK to ride."""
+
+    _attr_unit_of_measurement = None
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _unrecorded_attributes = FahrradwetterBase._unrecorded_attributes | {"windows"}
+
+    def __init__(self, coordinator, entry):
+        super().__init__(coordinator, entry, SLOT_RIDE_WINDOW, "ride_window", "Nächstes Fahrfenster")
 
 
 class FahrradwetterTomorrowAt(FahrradwetterBase):
-    def __init__(self, coordinator, entry, time_str: str, min_temp, max_wind, max_rain):
+    def __init__(self, coordinator, entry, time_str: str):
         self.time_str = time_str
         key = time_str.replace(":", "")
-        super().__init__(coordinator, entry, f"tomorrow_{key}", f"Morgen {time_str}", min_temp, max_wind, max_rain)
+        super().__init__(coordinator, entry, tomorrow_slot(time_str), f"tomorrow_{key}", f"Morgen {time_str}")
 
-    @property
-    def native_value(self):
-        fl = self.coordinator.data.get("forecast_list") or []
-        hh, mm = [int(x) for x in self.time_str.split(":")]
-        target = dt_util.now() + timedelta(days=1)
-        target = target.replace(hour=hh, minute=mm, second=0, microsecond=0)
-        b = find_closest_block(fl, target)
-        if not b:
-            return None
-        return _block_values(b)["temp"]
 
-    @property
-    def extra_state_attributes(self):
-        fl = self.coordinator.data.get("forecast_list") or []
-        hh, mm = [int(x) for x in self.time_str.split(":")]
-        target = dt_util.now() + timedelta(days=1)
-        target = target.replace(hour=hh, minute=mm, second=0, microsecond=0)
-        b = find_closest_block(fl, target)
-        if not b:
-            return {"ok": False}
-        vals = _block_values(b)
-        wind_kmh = ms_to_kmh(vals["wind_ms"])
-        return {
-            "target": target.isoformat(),
-            "dt": vals["dt"],
-            "wind": vals["wind_ms"],
-            "wind_kmh": wind_kmh,
-            "rain": vals["rain_3h"],
-            "wetter": vals["desc"],
-            "ok": ok_eval(vals["temp"], wind_kmh, vals["rain_3h"], self.min_temp, self.max_wind, self.max_rain),
-        }
+class FahrradwetterSchedule(FahrradwetterBase):
+    """Next ride of the weekly schedule; every slot's evaluation as attributes."""
+
+    _attr_unit_of_measurement = None
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _unrecorded_attributes = FahrradwetterBase._unrecorded_attributes | {"slots"}
 
+    def __init__(self, coordinator, entry):
+        super().__init__(coordinator, entry, SLOT_SCHEDULE, "schedule", "Fahrplan")
+
+
+class FahrradwetterDiagnosticBase(CoordinatorEntity[FahrradwetterCoordinator], SensorEntity):
+    """Runtime metrics of the coordinator; stays available while OWM fails."""
 
-class FahrradwetterOkBase(CoordinatorEntity[FahrradwetterCoordinator], BinarySensorEntity):
     _attr_should_poll = False
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
 
-    def __init__(self, coordinator, entry: ConfigEntry, unique_suffix: str, name_suffix: str,
-                 min_temp: float, max_wind: float, max_rain: float):
+    def __init__(self, coordinator, entry: ConfigEntry, unique_suffix: str, name_suffix: str):
         super().__init__(coordinator)
         self.entry = entry
         self._attr_unique_id = f"{entry.entry_id}_{unique_suffix}"
         self._attr_name = f"{entry.title} {name_suffix}"
-        self.min_temp = min_temp
-        self.max_wind = max_wind
-        self.max_rain = max_rain
 
     @property
     def available(self) -> bool:
-        return self.coordinator.last_update_success
+        # CoordinatorEntity goes unavailable on a failed refresh; the
+        # metrics (latency, errors, data age) matter most exactly then
+        return self.coordinator.data is not None
+
 
+class FahrradwetterFetchLatency(FahrradwetterDiagnosticBase):
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
 
-class FahrradwetterOkNow(FahrradwetterOkBase):
-    def __init__(self, coordinator, entry, min_temp, max_wind, max_rain):
-        super().__init__(coordinator, entry, "ok_now", "OK Jetzt", min_temp, max_wind, max_rain)
+    def __init__(self, coordinator, entry, endpoint: str, name_suffix: str):
+        self.endpoint = endpoint
+        super().__init__(coordinator, entry, f"fetch_latency_{endpoint}", name_suffix)
 
     @property
-    def is_on(self):
-        cur = self.coordinator.data.get("current") or {}
-        temp = _safe_float(cur.get("temp"))
-        wind_kmh = ms_to_kmh(_safe_float(cur.get("wind_ms")))
-        rain = _safe_float(cur.get("rain_1h")) or 0.0
-        return ok_eval(temp, wind_kmh, rain, self.min_temp, self.max_wind, self.max_rain)
+    def native_value(self):
+        latency = self.coordinator.metrics.endpoints[self.endpoint].latency_ms
+        return round(latency, 1) if latency is not None else None
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        m = self.coordinator.metrics.endpoints[self.endpoint]
+        return {
+            "decode_ms": round(m.decode_ms, 2) if m.decode_ms is not None else None,
+            "bytes": m.bytes_last,
+            "bytes_total": m.bytes_total,
+            "requests": m.requests,
+            "errors": m.errors,
+        }
 
-class FahrradwetterOkTomorrowAt(FahrradwetterOkBase):
-    def __init__(self, coordinator, entry, time_str: str, min_temp, max_wind, max_rain):
-        self.time_str = time_str
-        key = time_str.replace(":", "")
-        super().__init__(coordinator, entry, f"ok_tomorrow_{key}", f"OK Morgen {time_str}", min_temp, max_wind, max_rain)
+
+class FahrradwetterApiCalls(FahrradwetterDiagnosticBase):
+    _attr_native_unit_of_measurement = "calls"
+
+    def __init__(self, coordinator, entry):
+        super().__init__(coordinator, entry, "api_calls_today", "API-Aufrufe heute")
+
+    @property
+    def native_value(self):
+        # Read with the current time, so the count restarts at midnight
+        # instead of showing yesterday's until the next call
+        return self.coordinator.quota.calls_today(dt_util.utcnow().timestamp())
 
     @property
-    def is_on(self):
-        fl = self.coordinator.data.get("forecast_list") or []
-        hh, mm = [int(x) for x in self.time_str.split(":")]
-        target = dt_util.now() + timedelta(days=1)
-        target = target.replace(hour=hh, minute=mm, second=0, microsecond=0)
-        b = find_closest_block(fl, target)
-        if not b:
-            return False
-        vals = _block_values(b)
-        wind_kmh = ms_to_kmh(vals["wind_ms"])
-        return ok_eval(vals["temp"], wind_kmh, vals["rain_3h"], self.min_temp, self.max_wind, self.max_rain)
\ No newline at end of file
+    def extra_state_attributes(self) -> dict[str, Any]:
+        metrics = self.coordinator.metrics
+        return {
+            "cache_hits": metrics.cache_hits,
+            "cache_misses": metrics.cache_misses,
+            "shared_hits": metrics.shared_hits,
+            "per_day": self.coordinator.quota.per_day,
+        }
+
+
+class FahrradwetterDataAge(FahrradwetterDiagnosticBase):
+    _attr_native_unit_of_measurement = UnitOfTime.MINUTES
+
+    def __init__(self, coordinator, entry):
+        super().__init__(coordinator, entry, "data_age", "Datenalter")
+
+    @property
+    def native_value(self):
+        age = self.coordinator.data_age("forecast")
+        if age is None:
+            age = self.coordinator.data_age("current")
+        return round(age.total_seconds() / 60, 1) if age is not None else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        current = self.coordinator.data_age("current")
+        evaluation = self.coordinator.metrics.evaluation_ms
+        return {
+            "current_age_min": round(current.total_seconds() / 60, 1) if current is not None else None,
+            "evaluation_ms": round(evaluation, 2) if evaluation is not None else None,
+        }
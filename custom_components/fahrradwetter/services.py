@@ -0,0 +1,120 @@
+"""Service fahrradwetter.evaluate: ad-hoc questions over the cached forecast."""
+from __future__ import annotations
+
+from dataclasses import replace
+from datetime import datetime
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
+from homeassistant.exceptions import ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_END,
+    ATTR_QUERIES,
+    ATTR_START,
+    CONF_MAX_RAIN,
+    CONF_MAX_WIND_KMH,
+    CONF_MIN_TEMP,
+    DOMAIN,
+    EVALUATE_MAX_QUERIES,
+    SERVICE_EVALUATE,
+)
+from .coordinator import FahrradwetterCoordinator
+from .evaluation import Thresholds, evaluate_range
+
+# Service fields use the names of the config options
+_THRESHOLDS = {
+    vol.Optional(CONF_MIN_TEMP): vol.Coerce(float),
+    vol.Optional(CONF_MAX_WIND_KMH): vol.Coerce(float),
+    vol.Optional(CONF_MAX_RAIN): vol.Coerce(float),
+}
+_QUERY_SCHEMA = vol.Schema({
+    vol.Required(ATTR_START): cv.datetime,
+    vol.Optional(ATTR_END): cv.datetime,
+    **_THRESHOLDS,
+})
+EVALUATE_SCHEMA = vol.Schema({
+    vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+    vol.Required(ATTR_QUERIES): vol.All(
+        cv.ensure_list, vol.Length(min=1, max=EVALUATE_MAX_QUERIES), [_QUERY_SCHEMA]
+    ),
+    **_THRESHOLDS,
+})
+
+
+def _thresholds(base: Thresholds, data: dict[str, Any]) -> Thresholds:
+    overrides = {
+        field: data[key]
+        for key, field in (
+            (CONF_MIN_TEMP, "min_temp"),
+            (CONF_MAX_WIND_KMH, "max_wind"),
+            (CONF_MAX_RAIN, "max_rain"),
+        )
+        if key in data
+    }
+    return replace(base, **overrides) if overrides else base
+
+def _aware(value: datetime) -> datetime:
+    # Times without an offset are local time, like everywhere in HA
+    return value if value.tzinfo is not None else value.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
+
+def _coordinator(hass: HomeAssistant, entry_id: str | None) -> FahrradwetterCoordinator:
+    coordinators: dict[str, FahrradwetterCoordinator] = hass.data.get(DOMAIN, {})
+    if entry_id is not None:
+        if entry_id not in coordinators:
+            raise ServiceValidationError(f"Unknown or not loaded Fahrradwetter entry: {entry_id}")
+        return coordinators[entry_id]
+    if len(coordinators) != 1:
+        raise ServiceValidationError(
+            f"{len(coordinators)} Fahrradwetter entries loaded, set {ATTR_CONFIG_ENTRY_ID}"
+        )
+    return next(iter(coordinators.values()))
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register fahrradwetter.evaluate.
+
+    Queries read the coordinator's current snapshot (route worst case and
+    bias correction included); no call ever triggers a provider request.
+    """
+
+    @callback
+    def _evaluate(call: ServiceCall) -> ServiceResponse:
+        coordinator = _coordinator(hass, call.data.get(ATTR_CONFIG_ENTRY_ID))
+        data = coordinator.data
+        if data is None:
+            raise ServiceValidationError("No forecast data yet")
+        base = _thresholds(coordinator.thresholds, call.data)
+        timeline = data.forecast.timeline()
+        results = []
+        for query in call.data[ATTR_QUERIES]:
+            start = _aware(query[ATTR_START])
+            end = _aware(query.get(ATTR_END, start))
+            if end < start:
+                raise ServiceValidationError(f"{ATTR_END} {end.isoformat()} is before {ATTR_START}")
+            th = _thresholds(base, query)
+            results.append({
+                ATTR_START: start.isoformat(),
+                ATTR_END: end.isoformat(),
+                **evaluate_range(timeline, th, start.timestamp(), end.timestamp()),
+                "thresholds": {
+                    CONF_MIN_TEMP: th.min_temp,
+                    CONF_MAX_WIND_KMH: th.max_wind,
+                    CONF_MAX_RAIN: th.max_rain,
+                },
+            })
+        return {
+            "fetched_at": data.fetched_at.isoformat() if data.fetched_at else None,
+            "results": results,
+        }
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_EVALUATE, _evaluate, schema=EVALUATE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
@@ -0,0 +1,62 @@
+"""Running residual statistics of the bias model stay exact under eviction."""
+from __future__ import annotations
+
+import random
+import statistics
+
+import pytest
+
+from custom_components.fahrradwetter.bias import BiasBucket, BiasModel, Pair, RunningStats
+
+
+def test_running_stats_add_remove_matches_recomputation():
+    rng = random.Random(7)
+    values = [rng.uniform(-5, 5) for _ in range(50)]
+    stats = RunningStats()
+    for x in values:
+        stats.add(x)
+    for x in values[:45]:
+        stats.remove(x)
+    window = values[45:]
+    assert stats.count == 5
+    assert stats.mean == pytest.approx(statistics.fmean(window))
+    assert stats.stdev == pytest.approx(statistics.stdev(window))
+
+
+def test_running_stats_remove_to_empty():
+    stats = RunningStats()
+    stats.add(2.0)
+    stats.remove(2.0)
+    assert (stats.count, stats.mean, stats.stdev) == (0, 0.0, None)
+
+
+@pytest.mark.parametrize("size", [1, 3, 30])
+def test_bucket_eviction_matches_window(size):
+    rng = random.Random(size)
+    bucket = BiasBucket(size)
+    pairs = [Pair(day, rng.uniform(0, 20), rng.uniform(0, 20)) for day in range(100)]
+    for i, pair in enumerate(pairs):
+        assert bucket.add(pair)
+        window = [p.observed - p.forecast for p in pairs[max(0, i + 1 - size):i + 1]]
+        assert bucket.stats.count == len(window)
+        assert bucket.stats.mean == pytest.approx(statistics.fmean(window))
+        if len(window) > 1:
+            assert bucket.stats.stdev == pytest.approx(statistics.stdev(window))
+
+
+def test_bucket_keeps_one_pair_per_day():
+    bucket = BiasBucket(5)
+    assert bucket.add(Pair(10, 1.0, 2.0))
+    assert not bucket.add(Pair(10, 1.0, 5.0))
+    assert not bucket.add(Pair(9, 1.0, 5.0))
+    assert bucket.stats.mean == pytest.approx(1.0)
+
+
+def test_model_correction_and_roundtrip():
+    model = BiasModel(size=4, min_samples=3)
+    for day in range(6):
+        model.observe("temp", 6, day, 10.0, 8.0 + day % 2)
+    assert model.correction("temp", 6) == pytest.approx(statistics.fmean([-2.0, -1.0, -2.0, -1.0]))
+    assert model.correction("temp", 7) is None
+    restored = BiasModel.from_dict(model.as_dict(), size=4, min_samples=3)
+    assert restored.correction("temp", 6) == pytest.approx(model.correction("temp", 6))
@@ -0,0 +1,93 @@
+"""CircuitBreaker state machine: closed, open, half-open."""
+from __future__ import annotations
+
+from custom_components.fahrradwetter.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+COOLDOWN = 60.0
+
+
+def _open_breaker(now: float = 0.0) -> CircuitBreaker:
+    breaker = CircuitBreaker(threshold=3, cooldown=COOLDOWN, max_cooldown=200.0)
+    for _ in range(3):
+        breaker.record_failure(now)
+    return breaker
+
+
+def test_opens_after_the_failure_threshold():
+    breaker = CircuitBreaker(threshold=3, cooldown=COOLDOWN)
+    for _ in range(2):
+        breaker.record_failure(0.0)
+        assert breaker.state == CLOSED and breaker.allowed_calls(0.0) is None
+    breaker.record_failure(0.0)
+    assert breaker.state == OPEN and breaker.opened == 1
+    assert breaker.allowed_calls(1.0) == 0
+    assert breaker.retry_in(1.0) == COOLDOWN - 1
+
+
+def test_success_resets_the_failure_count():
+    breaker = CircuitBreaker(threshold=3, cooldown=COOLDOWN)
+    breaker.record_failure(0.0)
+    breaker.record_failure(0.0)
+    breaker.record_success()
+    breaker.record_failure(0.0)
+    assert breaker.state == CLOSED and breaker.failures == 1
+
+
+def test_half_open_after_cooldown_admits_one_probe():
+    breaker = _open_breaker()
+    assert breaker.allowed_calls(COOLDOWN - 1) == 0
+    assert breaker.allowed_calls(COOLDOWN) == 1
+    assert breaker.state == HALF_OPEN
+    assert breaker.retry_in(COOLDOWN) == 0.0
+
+
+def test_probe_success_closes():
+    breaker = _open_breaker()
+    breaker.allowed_calls(COOLDOWN)
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.failures == 0
+    assert breaker.cooldown == COOLDOWN
+    assert breaker.allowed_calls(COOLDOWN) is None
+
+
+def test_probe_failure_reopens_with_doubled_cooldown():
+    breaker = _open_breaker()
+    breaker.allowed_calls(COOLDOWN)
+    breaker.record_failure(COOLDOWN)
+    assert breaker.state == OPEN and breaker.opened == 2
+    assert breaker.cooldown == 2 * COOLDOWN
+    assert breaker.allowed_calls(COOLDOWN + 2 * COOLDOWN - 1) == 0
+    assert breaker.allowed_calls(COOLDOWN + 2 * COOLDOWN) == 1
+    # Capped at max_cooldown
+    breaker.record_failure(3 * COOLDOWN)
+    assert breaker.cooldown == 200.0
+    # A success afterwards starts over from the base cooldown
+    breaker.allowed_calls(3 * COOLDOWN + 200.0)
+    breaker.record_success()
+    assert breaker.cooldown == COOLDOWN
+
+
+def test_probe_not_sent_is_released():
+    # The probe was granted but not sent (quota) or cancelled: the next
+    # refresh probes again instead of waiting in half-open forever
+    breaker = _open_breaker()
+    assert breaker.allowed_calls(COOLDOWN) == 1
+    breaker.release_probe()
+    assert breaker.state == OPEN
+    assert breaker.cooldown == COOLDOWN
+    assert breaker.allowed_calls(COOLDOWN + 1) == 1
+    assert breaker.state == HALF_OPEN
+
+
+def test_cancelled_probe_is_probed_again():
+    # Neither success nor failure recorded: still half-open, one probe again
+    breaker = _open_breaker()
+    assert breaker.allowed_calls(COOLDOWN) == 1
+    assert breaker.allowed_calls(COOLDOWN + 1) == 1
+    assert breaker.opened == 1
+
+
+def test_release_probe_when_closed_is_a_no_op():
+    breaker = CircuitBreaker()
+    breaker.release_probe()
+    assert breaker.state == CLOSED
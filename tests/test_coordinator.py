@@ -0,0 +1,74 @@
+"""Listener notification: only entities whose slot changed are written."""
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+from types import SimpleNamespace
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.fahrradwetter.const import (
+    CONF_API_KEY,
+    CONF_LAT,
+    CONF_LON,
+    CONF_MODE,
+    MODE_OWM,
+    SLOT_NEXT_BLOCK,
+    SLOT_NOW,
+)
+from custom_components.fahrradwetter.coordinator import FahrradwetterCoordinator
+from custom_components.fahrradwetter.forecast import BLOCK_SECONDS, ForecastSeries
+
+
+def test_listeners_notified_only_on_change(tmp_path):
+    async def run():
+        hass = HomeAssistant(str(tmp_path))
+        entry = SimpleNamespace(entry_id="e1", title="Rad", options={}, data={
+            CONF_MODE: MODE_OWM, CONF_API_KEY: "key", CONF_LAT: 52.52, CONF_LON: 13.40,
+        })
+        coordinator = FahrradwetterCoordinator(hass, entry)
+        now_ts = dt_util.utcnow().timestamp()
+        current = {"temp": 15.0, "wind_ms": 2.0, "rain_1h": 0.0, "desc": "klar"}
+        forecast = ForecastSeries.from_rows([
+            (int(now_ts) + i * BLOCK_SECONDS, 15.0, 2.0, 0.0, "klar") for i in range(1, 5)
+        ])
+
+        async def fetch():
+            coordinator._current = dict(current)
+            coordinator._forecast = forecast
+            coordinator._fetched_at.update(current=now_ts, forecast=now_ts)
+
+        coordinator._fetch_provider = fetch
+        calls: dict[str | None, int] = {SLOT_NOW: 0, SLOT_NEXT_BLOCK: 0, None: 0}
+
+        def listener(slot):
+            def update():
+                calls[slot] += 1
+            return update
+
+        for slot in calls:
+            coordinator.async_add_listener(listener(slot), slot)
+
+        await coordinator.async_refresh()
+        assert calls == {SLOT_NOW: 1, SLOT_NEXT_BLOCK: 1, None: 1}
+        # Same data again: only the listener without a slot is written
+        await coordinator.async_refresh()
+        assert calls == {SLOT_NOW: 1, SLOT_NEXT_BLOCK: 1, None: 2}
+        # Another temperature now: the "now" entities only
+        current["temp"] = 3.0
+        await coordinator.async_refresh()
+        assert calls == {SLOT_NOW: 2, SLOT_NEXT_BLOCK: 1, None: 3}
+        # Same values, but "current" went stale: availability flips for all
+        async def stale_fetch():
+            coordinator._fetched_at["current"] = now_ts - timedelta(days=2).total_seconds()
+
+        coordinator._fetch_provider = stale_fetch
+        await coordinator.async_refresh()
+        assert calls == {SLOT_NOW: 3, SLOT_NEXT_BLOCK: 2, None: 4}
+        await coordinator.async_refresh()
+        assert calls == {SLOT_NOW: 3, SLOT_NEXT_BLOCK: 2, None: 5}
+        await coordinator.async_shutdown()
+        await hass.async_stop(force=True)
+
+    asyncio.run(run())
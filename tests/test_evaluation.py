@@ -0,0 +1,71 @@
+"""Ride windows, ride times and the evaluate service share one convention."""
+from __future__ import annotations
+
+from custom_components.fahrradwetter.evaluation import (
+    RideWindow,
+    Thresholds,
+    evaluate_range,
+    find_ride_windows,
+)
+from custom_components.fahrradwetter.forecast import BLOCK_SECONDS, ForecastSeries
+
+H = 3600
+TH = Thresholds(min_temp=5.0, max_wind=30.0, max_rain=0.5)
+
+
+def _series(rains: list[float]) -> ForecastSeries:
+    return ForecastSeries.from_rows(
+        [(i * BLOCK_SECONDS, 15.0, 2.0, rain, None) for i, rain in enumerate(rains)]
+    )
+
+
+def test_rain_belongs_to_the_hours_before_its_block():
+    # OWM rain.3h at 03:00 fell between 00:00 and 03:00
+    timeline = _series([0.0, 3.0, 0.0, 0.0]).timeline()
+    assert timeline.at(0.5 * H).rain == 3.0
+    assert timeline.at(4 * H).rain == 0.0
+    assert evaluate_range(timeline, TH, 0.5 * H, 2.5 * H)["ok"] is False
+    assert evaluate_range(timeline, TH, 3.5 * H, 9 * H)["ok"] is True
+
+
+def test_ride_windows_agree_with_range_evaluation():
+    timeline = _series([0.0, 3.0, 0.0, 0.0]).timeline()
+    windows = find_ride_windows(timeline, TH, 0)
+    # Nothing rideable while it rains, (00:00, 03:00]; the horizon ends at the last block
+    assert [(w.start, w.end) for w in windows] == [(3 * H, 9 * H)]
+    assert all(w.end <= 0 or w.start >= 3 * H for w in windows)
+    assert windows[-1].end == 9 * H
+    for w in windows:
+        assert evaluate_range(timeline, TH, w.start, w.end)["ok"] is True
+        # One step more on either side is not OK (or outside the horizon)
+        assert not evaluate_range(timeline, TH, w.start - timeline.step, w.end)["ok"]
+        assert not evaluate_range(timeline, TH, w.start, w.end + timeline.step)["ok"]
+
+
+def test_point_on_block_boundary_reads_the_following_block():
+    # Blocks at 03/06/09 h, 4 mm between 06:00 and 09:00
+    timeline = ForecastSeries.from_rows(
+        [(h * H, 15.0, 2.0, rain, None) for h, rain in ((3, 0.0), (6, 0.0), (9, 4.0))]
+    ).timeline()
+    assert timeline.at(6 * H).rain == 4.0
+    assert timeline.at(6 * H + 8 * 60).rain == 4.0
+    assert timeline.at(6 * H - 1).rain == 0.0
+    assert timeline.at(9 * H) is None
+    assert evaluate_range(timeline, TH, 6 * H, 6 * H)["ok"] is False
+    assert find_ride_windows(timeline, TH, 0) == [RideWindow(3 * H, 6 * H)]
+
+
+def test_ride_windows_skip_steps_that_ended():
+    timeline = _series([0.0, 0.0, 0.0]).timeline()
+    (window,) = find_ride_windows(timeline, TH, 4 * H + 60)
+    assert window.start == 4 * H
+    assert find_ride_windows(timeline, TH, 7 * H) == []
+
+
+def test_range_outside_horizon_is_not_covered():
+    timeline = _series([0.0, 0.0]).timeline()
+    assert evaluate_range(timeline, TH, 10 * H, 12 * H) == {"ok": None, "covered": False, "steps": 0}
+    partial = evaluate_range(timeline, TH, 2 * H, 5 * H)
+    assert partial["covered"] is False and partial["ok"] is False
+    point = evaluate_range(timeline, TH, 1 * H + 60, 1 * H + 60)
+    assert point["steps"] == 1 and point["ok"] is True
@@ -0,0 +1,50 @@
+"""Forecast rain is mm per 3 h whichever provider delivered it."""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.fahrradwetter.evaluation import Thresholds
+from custom_components.fahrradwetter.forecast import (
+    BLOCK_SECONDS,
+    HOURLY_SECONDS,
+    ForecastSeries,
+    rain_to_reference,
+)
+from custom_components.fahrradwetter.providers.dwd_mosmix import current_from_series
+
+TH = Thresholds(min_temp=0.0, max_wind=50.0, max_rain=0.5)
+
+
+def test_rain_to_reference():
+    assert rain_to_reference(0.2, HOURLY_SECONDS) == pytest.approx(0.6)
+    assert rain_to_reference(0.6, BLOCK_SECONDS) == 0.6
+
+
+def test_onecall_rain_matches_owm25_rate():
+    # 0.2 mm every hour is the same rain as 0.6 mm per 3h block
+    onecall = ForecastSeries.from_onecall_payload({"hourly": [
+        {"dt": h * HOURLY_SECONDS, "temp": 10, "wind_speed": 1, "rain": {"1h": 0.2}} for h in range(1, 4)
+    ]})
+    owm25 = ForecastSeries.from_owm([
+        {"dt": BLOCK_SECONDS, "main": {"temp": 10}, "wind": {"speed": 1}, "rain": {"3h": 0.6}}
+    ])
+    hourly = onecall.values(0)
+    block = owm25.values(0)
+    assert hourly.rain == pytest.approx(block.rain)
+    assert TH.ok(hourly.temp, 3.6, hourly.rain) is TH.ok(block.temp, 3.6, block.rain) is False
+
+
+def test_series_roundtrip_keeps_reference_unit():
+    series = ForecastSeries.from_onecall_payload({"hourly": [
+        {"dt": HOURLY_SECONDS, "temp": 10, "wind_speed": 1, "rain": {"1h": 0.1}}
+    ]})
+    assert ForecastSeries.from_dict(series.as_dict()).values(0).rain == series.values(0).rain
+
+
+def test_mosmix_current_reports_hourly_rain():
+    series = ForecastSeries.from_rows(
+        [(h * HOURLY_SECONDS, 10.0, 1.0, rain_to_reference(0.4, HOURLY_SECONDS), None) for h in range(3)],
+        HOURLY_SECONDS,
+    )
+    current = current_from_series(series, HOURLY_SECONDS)
+    assert current["rain_1h"] == pytest.approx(0.4)
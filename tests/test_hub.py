@@ -0,0 +1,123 @@
+"""ForecastHub: shared results, in-flight collapse, refcounts and eviction."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.fahrradwetter.hub import ForecastHub, hub_key
+
+KEY = hub_key("owm_25", "key", "forecast", 52.5201, 13.4004)
+
+
+def test_key_uses_grid_cell():
+    assert hub_key("owm_25", "key", "forecast", 52.5203, 13.3999) == KEY
+    assert hub_key("owm_25", "other", "forecast", 52.52, 13.40) != KEY
+    assert hub_key("owm_25", "key", "route", 52.52, 13.40) != KEY
+
+
+def test_concurrent_fetches_collapse_into_one_request():
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "series"
+
+    async def run():
+        hub = ForecastHub()
+        first = hub.fetch(KEY, fetch, 1000.0)
+        assert hub.in_flight(KEY) is first
+        second = hub.fetch(KEY, fetch, 1000.0)
+        assert second is first
+        results = await asyncio.gather(asyncio.shield(first), asyncio.shield(second))
+        return hub, results
+
+    hub, results = asyncio.run(run())
+    assert calls == 1
+    assert results == ["series", "series"]
+    assert hub.in_flight(KEY) is None
+    assert hub.fresh(KEY, 600, 1100.0) == ("series", 1000.0)
+    assert hub.fresh(KEY, 600, 1600.0) is None
+
+
+def test_shield_keeps_request_alive_when_one_entry_gives_up():
+    async def run():
+        gate = asyncio.Event()
+
+        async def fetch():
+            await gate.wait()
+            return "series"
+
+        hub = ForecastHub()
+        fut = hub.fetch(KEY, fetch, 1000.0)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(asyncio.shield(fut), timeout=0.01)
+        assert not fut.cancelled()
+        waiter = asyncio.ensure_future(asyncio.shield(hub.in_flight(KEY)))
+        gate.set()
+        return hub, await waiter
+
+    hub, result = asyncio.run(run())
+    assert result == "series"
+    assert hub.fresh(KEY, 600, 1000.0) == ("series", 1000.0)
+
+
+def test_failed_fetch_is_not_stored():
+    async def fetch():
+        raise RuntimeError("HTTP 500")
+
+    async def run():
+        hub = ForecastHub()
+        fut = hub.fetch(KEY, fetch, 1000.0)
+        with pytest.raises(RuntimeError):
+            await asyncio.shield(fut)
+        return hub
+
+    hub = asyncio.run(run())
+    assert hub.in_flight(KEY) is None
+    assert hub.fresh(KEY, 600, 1000.0) is None
+
+
+def test_users_are_counted_by_entry_id_and_idle_keys_expire():
+    hub = ForecastHub(ttl=3600)
+    hub.acquire("a", [KEY])
+    hub.acquire("a", [KEY])  # setup retry of the same entry
+    hub.acquire("b", [KEY])
+    assert hub.users(KEY) == 2
+    hub.release("a", [KEY], 0.0)
+    assert hub.users(KEY) == 1
+    hub.release("b", [KEY], 0.0)
+    assert len(hub) == 1
+    # Every release() also evicts idle keys past the TTL
+    hub.release("b", [], 3599.0)
+    assert len(hub) == 1
+    # Re-acquired before the TTL: kept
+    hub.acquire("a", [KEY])
+    hub.release("x", [], 10_000.0)
+    assert len(hub) == 1
+    hub.release("a", [KEY], 10_000.0)
+    hub.release("a", [], 13_600.0)
+    assert len(hub) == 0
+
+
+def test_key_in_flight_is_not_evicted():
+    async def run():
+        hub = ForecastHub(ttl=0)
+        hub.acquire("a", [KEY])
+        gate = asyncio.Event()
+
+        async def fetch():
+            await gate.wait()
+            return "series"
+
+        fut = hub.fetch(KEY, fetch, 0.0)
+        hub.release("a", [KEY], 10.0)
+        assert len(hub) == 1
+        gate.set()
+        await fut
+        hub.release("a", [], 20.0)
+        return hub
+
+    assert len(asyncio.run(run())) == 0
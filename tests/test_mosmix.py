@@ -0,0 +1,151 @@
+"""DWD MOSMIX: KML parsing and the nearest-station index."""
+from __future__ import annotations
+
+from io import BytesIO
+import math
+import random
+import zipfile
+
+import pytest
+
+from custom_components.fahrradwetter.forecast import HOURLY_SECONDS
+from custom_components.fahrradwetter.providers.dwd_mosmix import (
+    Station,
+    StationIndex,
+    distance_km,
+    parse_kmz,
+    parse_mosmix,
+)
+
+T0 = 1715000400  # 2024-05-06T13:00:00Z
+
+KML = """<?xml version="1.0" encoding="ISO-8859-1" standalone="no"?>
+<kml:kml xmlns:dwd="https://opendata.dwd.de/weather/lib/pointforecast_dwd_extension_V1_0.xsd"
+         xmlns:kml="http://www.opengis.net/kml/2.2">
+<kml:Document><kml:ExtendedData><dwd:ProductDefinition>
+  <dwd:IssueTime>2024-05-06T12:00:00.000Z</dwd:IssueTime>
+  <dwd:ForecastTimeSteps>
+    <dwd:TimeStep>2024-05-06T13:00:00.000Z</dwd:TimeStep>
+    <dwd:TimeStep>2024-05-06T14:00:00.000Z</dwd:TimeStep>
+    <dwd:TimeStep>2024-05-06T15:00:00.000Z</dwd:TimeStep>
+  </dwd:ForecastTimeSteps>
+</dwd:ProductDefinition></kml:ExtendedData>
+<kml:Placemark><kml:name>10382</kml:name><kml:description>BERLIN-TEGEL</kml:description>
+  <kml:ExtendedData>
+    <dwd:Forecast dwd:elementName="PPPP"><dwd:value>101000.0 101100.0 101200.0</dwd:value></dwd:Forecast>
+    <dwd:Forecast dwd:elementName="TTT"><dwd:value>  288.15 - 290.65</dwd:value></dwd:Forecast>
+    <dwd:Forecast dwd:elementName="FF"><dwd:value>2.00 3.50 -</dwd:value></dwd:Forecast>
+    <dwd:Forecast dwd:elementName="RR1c"><dwd:value>0.00 0.40 -</dwd:value></dwd:Forecast>
+    <dwd:Forecast dwd:elementName="ww"><dwd:value>2.00 61.00 -</dwd:value></dwd:Forecast>
+  </kml:ExtendedData>
+  <kml:Point><kml:coordinates>13.32,52.57,36.0</kml:coordinates></kml:Point>
+</kml:Placemark>
+<kml:Placemark><kml:name>10865</kml:name><kml:description>MUENCHEN-STADT</kml:description>
+  <kml:ExtendedData>
+    <dwd:Forecast dwd:elementName="TTT"><dwd:value>280.15 281.15</dwd:value></dwd:Forecast>
+  </kml:ExtendedData>
+  <kml:Point><kml:coordinates>11.55,48.16,515.0</kml:coordinates></kml:Point>
+</kml:Placemark>
+<kml:Placemark><kml:name>10147</kml:name><kml:description>HAMBURG-FUHLSBUETTEL</kml:description>
+  <kml:ExtendedData/>
+  <kml:Point><kml:coordinates>10.00,53.63,11.0</kml:coordinates></kml:Point>
+</kml:Placemark>
+</kml:Document></kml:kml>
+""".encode("iso-8859-1")
+
+BERLIN = (52.52, 13.40)
+MUNICH = (48.14, 11.58)
+
+
+def test_parse_wanted_stations_with_units_and_placeholders():
+    doc = parse_mosmix(BytesIO(KML), {"10382"})
+    assert doc.issued == "2024-05-06T12:00:00.000Z"
+    assert doc.stations is None
+    assert list(doc.series) == ["10382"]
+    series = doc.series["10382"]
+    assert series.step == HOURLY_SECONDS
+    assert list(series.timestamps) == [T0, T0 + 3600, T0 + 7200]
+    rows = [series.values(i) for i in range(3)]
+    # Kelvin to °C, "-" is missing
+    assert rows[0].temp == pytest.approx(15.0)
+    assert rows[1].temp is None
+    assert rows[2].temp == pytest.approx(17.5)
+    assert [r.wind_ms for r in rows] == [2.0, 3.5, None]
+    # RR1c is mm per hour, kept as mm per 3 h; missing rain is dry
+    assert [r.rain for r in rows] == pytest.approx([0.0, 1.2, 0.0])
+    assert [r.desc for r in rows] == ["bewölkt", "leichter Regen", None]
+
+
+def test_short_value_lists_are_padded():
+    series = parse_mosmix(BytesIO(KML), {"10865"}).series["10865"]
+    assert len(series) == 3
+    assert series.values(2).temp is None and series.values(2).wind_ms is None
+
+
+def test_steps_that_ended_are_dropped():
+    # The step before now is kept to interpolate from
+    series = parse_mosmix(BytesIO(KML), {"10382"}, now_ts=T0 + 3600 + 60).series["10382"]
+    assert list(series.timestamps) == [T0 + 3600, T0 + 7200]
+
+
+def test_first_parse_collects_stations_and_keeps_the_nearest():
+    doc = parse_mosmix(BytesIO(KML), None, [BERLIN, MUNICH])
+    assert [s.id for s in doc.stations] == ["10382", "10865", "10147"]
+    assert doc.stations[0] == Station("10382", "BERLIN-TEGEL", 52.57, 13.32)
+    # Hamburg was never the nearest to a target, so it was not decoded
+    assert sorted(doc.series) == ["10382", "10865"]
+
+
+def test_first_parse_drops_stations_overtaken_by_a_closer_one():
+    # Near Hamburg: Berlin is kept first, Munich is further away, then
+    # Hamburg wins and Berlin is dropped again
+    doc = parse_mosmix(BytesIO(KML), None, [(53.55, 10.0)])
+    assert list(doc.series) == ["10147"]
+
+
+def test_parse_kmz():
+    raw = BytesIO()
+    with zipfile.ZipFile(raw, "w", zipfile.ZIP_DEFLATED) as kmz:
+        kmz.writestr("MOSMIX_S_2024050612_240.kml", KML)
+    assert list(parse_kmz(raw.getvalue(), {"10147"}).series) == ["10147"]
+    with pytest.raises(ValueError):
+        empty = BytesIO()
+        with zipfile.ZipFile(empty, "w") as kmz:
+            kmz.writestr("readme.txt", "")
+        parse_kmz(empty.getvalue(), None)
+
+
+def _brute_force(stations: list[Station], lat: float, lon: float) -> float:
+    return min(distance_km(lat, lon, s.lat, s.lon) for s in stations)
+
+
+def test_nearest_station():
+    index = StationIndex([
+        Station("10382", "BERLIN-TEGEL", 52.57, 13.32),
+        Station("10865", "MUENCHEN-STADT", 48.16, 11.55),
+        Station("10147", "HAMBURG-FUHLSBUETTEL", 53.63, 10.00),
+    ])
+    station, km = index.nearest(*BERLIN)
+    assert station.id == "10382" and km == pytest.approx(distance_km(*BERLIN, 52.57, 13.32))
+    assert index.nearest(*MUNICH)[0].id == "10865"
+    # Far from every station: the full scan still answers
+    assert index.nearest(-33.9, 18.4)[0].id == "10865"
+    assert StationIndex([]).nearest(*BERLIN) is None
+
+
+@pytest.mark.parametrize("lon_range", [(-180.0, 180.0), (170.0, 180.0), (-180.0, -170.0)])
+def test_nearest_matches_brute_force(lon_range):
+    rng = random.Random(19)
+    for _ in range(50):
+        stations = [
+            Station(str(i), "", rng.uniform(-70, 70), rng.choice((rng.uniform(*lon_range), rng.uniform(-180, 180))))
+            for i in range(40)
+        ]
+        index = StationIndex(stations)
+        for _ in range(10):
+            # Queries close to the antimeridian, where the 1° cells wrap
+            lat, lon = rng.uniform(-70, 70), rng.choice((rng.uniform(178, 180), rng.uniform(-180, -178),
+                                                          rng.uniform(-180, 180)))
+            _station, km = index.nearest(lat, lon)
+            assert km == pytest.approx(_brute_force(stations, lat, lon)), (lat, lon)
+            assert not math.isnan(km)
@@ -0,0 +1,36 @@
+"""ApiQuota: daily count, per-minute bucket and backoff."""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from custom_components.fahrradwetter.quota import ApiQuota
+
+DAY = datetime(2024, 5, 6, 23, 59, tzinfo=timezone.utc).timestamp()
+
+
+def test_calls_today_resets_on_read_after_midnight():
+    quota = ApiQuota()
+    assert quota.try_acquire(DAY) and quota.try_acquire(DAY + 1)
+    assert quota.calls_today(DAY + 2) == 2
+    # No call after midnight yet: the count must not show yesterday's
+    assert quota.calls_today(DAY + 120) == 0
+    assert quota.try_acquire(DAY + 121)
+    assert quota.calls_today(DAY + 122) == 1
+
+
+def test_daily_budget_most_restrictive_entry():
+    quota = ApiQuota()
+    quota.register("a", 60, 1000)
+    quota.register("b", 60, 2)
+    assert [quota.try_acquire(DAY - 100 + i) for i in range(3)] == [True, True, False]
+    quota.unregister("b")
+    assert quota.try_acquire(DAY - 90)
+    assert quota.try_acquire(DAY + 120) and quota.calls_today(DAY + 120) == 1
+
+
+def test_rate_limited_blocks_for_retry_after():
+    quota = ApiQuota()
+    quota.record_rate_limited(DAY, 30.0)
+    assert quota.backoff_remaining(DAY + 10) == 20.0
+    assert not quota.try_acquire(DAY + 10)
+    assert quota.try_acquire(DAY + 30)
@@ -0,0 +1,73 @@
+"""parse_schedule: days, ranges, aliases, overrides, pin and duplicates."""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.fahrradwetter.evaluation import Thresholds
+from custom_components.fahrradwetter.schedule import ScheduleSlot, parse_schedule
+
+DEFAULT = Thresholds(min_temp=10.0, max_wind=15.0, max_rain=0.0)
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("", []),
+        (None, []),
+        ("Mo 06:30", [ScheduleSlot(0, "06:30")]),
+        ("mo 6:30", [ScheduleSlot(0, "06:30")]),
+        # Ranges, lists, English names
+        ("Mo-Mi 07:00", [ScheduleSlot(d, "07:00") for d in (0, 1, 2)]),
+        ("Sa,So 10:00", [ScheduleSlot(5, "10:00"), ScheduleSlot(6, "10:00")]),
+        ("sat,sun 10:00", [ScheduleSlot(5, "10:00"), ScheduleSlot(6, "10:00")]),
+        ("tue 08:15", [ScheduleSlot(1, "08:15")]),
+        # Range across the week boundary
+        ("Fr-Mo 07:00", [ScheduleSlot(d, "07:00") for d in (0, 4, 5, 6)]),
+        ("täglich 12:00", [ScheduleSlot(d, "12:00") for d in range(7)]),
+        ("* 12:00", [ScheduleSlot(d, "12:00") for d in range(7)]),
+        # Several times per line
+        ("Mo 16:45 06:30", [ScheduleSlot(0, "06:30"), ScheduleSlot(0, "16:45")]),
+        # ";" separates rules like a line break (as for the waypoints)
+        ("Mo 06:30; Di 07:00", [ScheduleSlot(0, "06:30"), ScheduleSlot(1, "07:00")]),
+        ("Sa 10:00 pin;So 11:00", [ScheduleSlot(5, "10:00", (), True), ScheduleSlot(6, "11:00")]),
+        # Overrides (config option names and the max_wind alias) and pin
+        ("Sa 10:00 min_temp=12 pin", [ScheduleSlot(5, "10:00", (("min_temp", 12.0),), True)]),
+        ("Sa 10:00 max_wind_kmh=20", [ScheduleSlot(5, "10:00", (("max_wind", 20.0),))]),
+        ("Sa 10:00 max_wind=20", [ScheduleSlot(5, "10:00", (("max_wind", 20.0),))]),
+        ("Sa 10:00 PIN max_rain=0.2", [ScheduleSlot(5, "10:00", (("max_rain", 0.2),), True)]),
+        # A later line for the same weekday and time wins
+        ("Mo-Fr 07:00\nMo 07:00 pin", [ScheduleSlot(0, "07:00", (), True)]
+         + [ScheduleSlot(d, "07:00") for d in (1, 2, 3, 4)]),
+        ("\n\nMo 07:00\n", [ScheduleSlot(0, "07:00")]),
+        (["Mo 07:00", "Di 07:00"], [ScheduleSlot(0, "07:00"), ScheduleSlot(1, "07:00")]),
+    ],
+)
+def test_parse_schedule(value, expected):
+    assert parse_schedule(value) == expected
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "Xy 06:30",
+        "Mo 25:00",
+        "Mo 06:60",
+        "Mo",
+        "Mo pin",
+        "Mo 06:30 foo=1",
+        "Mo 06:30 min_temp=warm",
+        "Mo 06:30 later",
+        "Mo-Xy 06:30",
+    ],
+)
+def test_parse_schedule_rejects(value):
+    with pytest.raises(ValueError):
+        parse_schedule(value)
+
+
+def test_slot_thresholds_override_only_given_fields():
+    (slot,) = parse_schedule("Sa 10:00 max_wind_kmh=25")
+    assert slot.thresholds(DEFAULT) == Thresholds(min_temp=10.0, max_wind=25.0, max_rain=0.0)
+    (plain,) = parse_schedule("Sa 10:00")
+    assert plain.thresholds(DEFAULT) is DEFAULT
+    assert (slot.key, slot.label) == ("sa_1000", "Sa 10:00")
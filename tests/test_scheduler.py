@@ -0,0 +1,55 @@
+"""adaptive_interval: ride times and weekly schedule slots shorten the poll interval."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from custom_components.fahrradwetter.schedule import parse_schedule
+from custom_components.fahrradwetter.scheduler import (
+    MIN_INTERVAL,
+    RIDE_WINDOW,
+    RIDE_WINDOW_DIVISOR,
+    adaptive_interval,
+)
+
+BASE = timedelta(minutes=30)
+# Saturday, 09:00 local
+NOW = datetime(2024, 5, 4, 9, 0, tzinfo=timezone(timedelta(hours=2)))
+
+
+def _rides(schedule: str) -> list[datetime]:
+    return [slot.next_at(NOW) for slot in parse_schedule(schedule)]
+
+
+@pytest.mark.parametrize(
+    ("ride_times", "schedule", "expected"),
+    [
+        # Nothing within reach: the baseline
+        ([], "", BASE),
+        ([], "Mo 07:00", BASE),
+        # Inside the window before a scheduled ride: dense polling
+        ([], "Sa 10:00", BASE / RIDE_WINDOW_DIVISOR),
+        # Poll again right before the ride
+        ([], "Sa 09:05", MIN_INTERVAL),
+        # Schedule-only users get the same as a daily ride time
+        (["10:00"], "", BASE / RIDE_WINDOW_DIVISOR),
+        # The earlier of ride time and schedule slot counts
+        (["18:00"], "Sa 10:00", BASE / RIDE_WINDOW_DIVISOR),
+        # Polled in time for the window before a slot
+        ([], "Sa 11:10", timedelta(minutes=10)),
+    ],
+)
+def test_schedule_slots_shorten_the_interval(ride_times, schedule, expected):
+    assert adaptive_interval(NOW, ride_times, BASE, _rides(schedule)) == expected
+
+
+def test_night_backoff_stops_before_a_scheduled_ride():
+    night = NOW.replace(hour=1)
+    (ride,) = [slot.next_at(night) for slot in parse_schedule("Sa 03:30")]
+    assert adaptive_interval(night, [], BASE) > BASE
+    assert adaptive_interval(night, [], BASE, [ride]) == ride - RIDE_WINDOW - night
+
+
+def test_past_rides_are_ignored():
+    assert adaptive_interval(NOW, [], BASE, [NOW - timedelta(hours=1)]) == BASE